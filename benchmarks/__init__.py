@@ -0,0 +1 @@
+"""Benchmarks for the alumni data pipelines."""
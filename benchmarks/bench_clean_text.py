@@ -0,0 +1,139 @@
+"""Benchmark profile text cleaning on large description/about fields.
+
+Usage: python benchmarks/bench_clean_text.py [--lines 100 400 1600 6400] [--profiles 2000] [--seed 0]
+
+For each field size it times the single-pass clean_text (scripts/profile_text.py)
+against the previous scraper implementation, which compared every date line
+with every line kept so far, and fits time ~ lines^k for both. The batch
+stage cleans the bio and descriptions of a synthetic set of scraped profiles
+with clean_profiles, where repeated fields are cleaned once.
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from profile_text import clean_text, clean_profiles  # noqa: E402
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+WORDS = ['built', 'led', 'shipped', 'platform', 'data', 'pipelines', 'team', 'customers', 'growth',
+         'analytics', 'infrastructure', 'launched', 'product', 'revenue', 'models', 'research']
+ROLES = ['Software Engineer', 'Analyst', 'Associate', 'Product Manager', 'Consultant', 'Founder']
+KINDS = ['Full-time', 'Part-time', 'Internship', 'Contract']
+
+
+def legacy_clean_text(text):
+    """clean_text as the scraper had it before profile_text.py, kept as the baseline."""
+    if not text:
+        return None
+    lines = text.split('\n')
+    seen = set()
+    unique_lines = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line in seen:
+            continue
+        is_duplicate_date = False
+        if '·' in line and any(char in line for char in ['-', 'to']):
+            parts = line.split('·')
+            if len(parts) == 2:
+                duration = parts[1].strip()
+                for seen_line in seen:
+                    if '·' in seen_line and duration in seen_line:
+                        is_duplicate_date = True
+                        break
+        if not is_duplicate_date:
+            seen.add(line)
+            unique_lines.append(line)
+    return '\n'.join(unique_lines)
+
+
+def date_line(rng: random.Random, separator: str) -> str:
+    start = rng.randint(2000, 2024)
+    end = rng.choice([f"{rng.choice(MONTHS)} {rng.randint(start, 2025)}", 'Present'])
+    # Mostly distinct durations, so the baseline keeps (and rescans) most date lines
+    return f"{rng.choice(MONTHS)} {start} {separator} {end} · {rng.randint(1, 11)} mos {rng.randint(0, 10 ** 6)}"
+
+
+def make_field(rng: random.Random, lines: int) -> str:
+    """A description with role/kind lines, date lines written two ways, prose and repeats."""
+    out = []
+    while len(out) < lines:
+        choice = rng.random()
+        if choice < 0.35:
+            line = date_line(rng, '-')
+            out.append(line)
+            if rng.random() < 0.3:
+                out.append(line.replace(' - ', ' to ', 1))
+        elif choice < 0.5:
+            out.append(rng.choice(ROLES))
+            out.append(rng.choice(KINDS))
+        elif choice < 0.6 and out:
+            out.append(rng.choice(out))
+        else:
+            out.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))))
+        if rng.random() < 0.1:
+            out.append('')
+    return '\n'.join(out[:lines])
+
+
+def make_profiles(rng: random.Random, count: int):
+    # Scraped fields repeat: the same company blurb shows up across alumni and runs
+    pool = [make_field(rng, rng.randint(3, 40)) for _ in range(max(1, count // 4))]
+    return [{'bio': rng.choice(pool),
+             'experiences': [{'description': rng.choice(pool)} for _ in range(rng.randint(1, 6))]}
+            for _ in range(count)]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def fit_exponent(sizes, seconds):
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(s, 1e-9)) for s in seconds]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    return (sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+            / sum((x - mean_x) ** 2 for x in xs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, nargs='+', default=[100, 400, 1600, 6400])
+    parser.add_argument('--profiles', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{'lines':>7}{'chars':>10}{'new':>11}{'legacy':>11}{'speedup':>9}{'kept':>7}")
+    new_times, legacy_times = [], []
+    for lines in args.lines:
+        field = make_field(rng, lines)
+        cleaned, new_seconds = timed(clean_text, field)
+        legacy, legacy_seconds = timed(legacy_clean_text, field)
+        new_times.append(new_seconds)
+        legacy_times.append(legacy_seconds)
+        kept = cleaned.count('\n') + 1
+        print(f"{lines:>7,}{len(field):>10,}{new_seconds * 1000:>9.2f}ms{legacy_seconds * 1000:>9.2f}ms"
+              f"{legacy_seconds / new_seconds if new_seconds else 0:>8.0f}x{kept:>7,}")
+    if len(args.lines) > 1:
+        print(f"\ntime ~ lines^k: new k={fit_exponent(args.lines, new_times):.2f}, "
+              f"legacy k={fit_exponent(args.lines, legacy_times):.2f}")
+
+    profiles = make_profiles(rng, args.profiles)
+    fields = sum(1 + len(p['experiences']) for p in profiles)
+    changed, seconds = timed(clean_profiles, profiles)
+    print(f"\nbatch: {args.profiles:,} profiles, {fields:,} fields in {seconds:.3f}s "
+          f"({fields / seconds:,.0f} fields/s), {changed:,} changed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark the blocked fuzzy dedupe engine and check that it scales near-linearly.
+
+Usage: python benchmarks/bench_dedupe.py [--sizes 1000 2000 4000 8000 16000 32000] [--seed 0]
+
+Each size is a synthetic table of distinct alumni, about 10% of whom appear a
+second time as a variant (nickname added or dropped, accents or case
+changed, middle initial dropped, or a new name spelling with the same email).
+For each size it prints the time, pairs scored and pairwise precision/recall
+against the injected duplicates, then fits time ~ n^k. A k close to 1 means
+the blocking keeps the work linear; all-pairs comparison would give k = 2.
+"""
+import argparse
+import math
+import random
+import sys
+import time
+import unicodedata
+from itertools import combinations
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from dedupe_engine import find_duplicate_clusters, cluster_labels  # noqa: E402
+
+ONSETS = ['b', 'br', 'c', 'ch', 'd', 'f', 'g', 'h', 'j', 'k', 'l', 'm', 'n', 'p', 'r', 's', 'sh',
+          't', 'v', 'w', 'y', 'z']
+VOWELS = ['a', 'e', 'i', 'o', 'u', 'ai', 'ei', 'ou', 'é', 'ü']
+CODAS = ['', '', 'n', 'r', 's', 'l', 'm', 'ng', 'th']
+NICKNAMES = ['Roy', 'AJ', 'Mike', 'Jen', 'Danny', 'Kev', 'Vicky', 'Sam', 'Max', 'Lou']
+
+
+def syllable_word(rng: random.Random, syllables: int) -> str:
+    return ''.join(rng.choice(ONSETS) + rng.choice(VOWELS) + rng.choice(CODAS)
+                   for _ in range(syllables)).capitalize()
+
+
+def strip_accents(text: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+
+def make_person(rng: random.Random, i: int) -> dict:
+    first, last = syllable_word(rng, rng.randint(1, 3)), syllable_word(rng, rng.randint(1, 3))
+    middle = f" {chr(rng.randint(65, 90))}." if rng.random() < 0.3 else ''
+    return {
+        'name': f"{first}{middle} {last}",
+        'emails': f"alum{i}@example.com" if rng.random() < 0.7 else None,
+        'phones': f"805{rng.randint(1000000, 9999999)}" if rng.random() < 0.5 else None,
+        'linkedin_url': f"https://www.linkedin.com/in/alum-{i}" if rng.random() < 0.5 else None,
+        'graduation_year': rng.choice([None, rng.randint(2005, 2025)]),
+    }
+
+
+def make_variant(rng: random.Random, person: dict, i: int) -> dict:
+    variant = dict(person)
+    first, *rest = person['name'].split(' ')
+    last = rest[-1]
+    kind = rng.choice(['nickname', 'accents', 'case', 'middle', 'email'])
+    if kind == 'nickname':
+        variant['name'] = f"{first} ({rng.choice(NICKNAMES)}) {last}"
+    elif kind == 'accents':
+        variant['name'] = strip_accents(person['name']) if strip_accents(person['name']) != person['name'] \
+            else person['name'].upper()
+    elif kind == 'case':
+        variant['name'] = person['name'].lower()
+    elif kind == 'middle':
+        variant['name'] = f"{first} {last}"
+    else:
+        # A different spelling of the first name, tied together by the email
+        variant['name'] = f"{first[:-1] or first}{rng.choice('aeiy')} {last}"
+        variant['emails'] = person['emails'] or f"alum{i}.alt@example.com"
+        person['emails'] = variant['emails']
+    # Contact details are often missing on the duplicate row
+    for field in ('phones', 'linkedin_url', 'graduation_year'):
+        if rng.random() < 0.5:
+            variant[field] = None
+    return variant
+
+
+def make_table(size: int, seed: int):
+    """Return the table and each row's true person id."""
+    rng = random.Random(seed)
+    rows, truth = [], []
+    people = int(size / 1.1)
+    for i in range(people):
+        person = make_person(rng, i)
+        rows.append(person)
+        truth.append(i)
+    while len(rows) < size:
+        i = rng.randrange(people)
+        rows.append(make_variant(rng, rows[i], i))
+        truth.append(i)
+    order = list(range(len(rows)))
+    rng.shuffle(order)
+    return pd.DataFrame([rows[i] for i in order]), [truth[i] for i in order]
+
+
+def pair_set(groups):
+    pairs = set()
+    for members in groups.values():
+        pairs.update(combinations(sorted(members), 2))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2000, 4000, 8000, 16000, 32000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'seconds':>10}{'us/row':>10}{'pairs':>12}{'clusters':>10}{'precision':>11}{'recall':>8}")
+    points = []
+    for size in args.sizes:
+        df, truth = make_table(size, args.seed)
+        stats = {}
+        start = time.perf_counter()
+        clusters = find_duplicate_clusters(df, stats=stats)
+        seconds = time.perf_counter() - start
+        points.append((size, seconds))
+
+        true_groups, found_groups = {}, {}
+        for position, (person, label) in enumerate(zip(truth, cluster_labels(df, clusters))):
+            true_groups.setdefault(person, []).append(position)
+            found_groups.setdefault(label, []).append(position)
+        expected, found = pair_set(true_groups), pair_set(found_groups)
+        precision = len(expected & found) / len(found) if found else 1.0
+        recall = len(expected & found) / len(expected) if expected else 1.0
+        print(f"{size:>8,}{seconds:>10.2f}{seconds / size * 1e6:>10.1f}{stats['pairs_scored']:>12,}"
+              f"{len(clusters):>10,}{precision:>11.3f}{recall:>8.3f}")
+
+    if len(points) > 1:
+        # Least-squares slope of log(time) against log(rows)
+        xs = [math.log(n) for n, _ in points]
+        ys = [math.log(t) for _, t in points]
+        mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+        slope = (sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+                 / sum((x - mean_x) ** 2 for x in xs))
+        print(f"\nScaling exponent: time ~ n^{slope:.2f} (1.0 is linear, 2.0 is all-pairs)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark the scalar vs column-level standardizers on a synthetic sheet.
+
+Usage: python benchmarks/bench_standardize.py [--rows 100000] [--seed 0]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data' / 'scripts'))
+
+from process_alumni_data import AlumniDataProcessor  # noqa: E402
+from standardize import (  # noqa: E402
+    INDUSTRY_CATEGORIES, standardize_industry_column, standardize_location_column, standardize_address_column,
+    standardize_email_column, standardize_phone_column
+)
+
+INDUSTRIES = ['Tech', 'software engineering', 'Investment Banking', 'Health', 'finance',
+              'Consulting firm', 'digital media', 'Unknown', None, 'Non-profit', 'Education',
+              'gov', 'Real Estate', 'MARKETING']
+CITIES = ['Santa Barbara', 'Goleta', 'Los Angeles', 'San Francisco', 'San Jose', 'New York',
+          'Boston', 'Austin', 'Seattle', 'Irvine', 'San Diego', 'Chicago', 'Denver']
+STATES = ['CA', 'ca', 'NY', 'MA', 'TX', 'WA', 'IL', 'CO', 'California']
+DOMAINS = ['gmail.com', 'ucsb.edu', 'umail.ucsb.edu', 'yahoo.com', 'outlook.com']
+
+
+def make_location(rng: random.Random) -> str:
+    city, state = rng.choice(CITIES), rng.choice(STATES)
+    return rng.choice([
+        f"{city}, {state}",
+        f"{city} {state}",
+        f"{city}, {state} {rng.randint(90001, 99999)}",
+        f"apt {rng.randint(1, 400)} {city}, {state}",
+        f"{city}, {state} unit {rng.randint(1, 40)}",
+        city,
+        'Unknown',
+    ])
+
+
+def make_email(rng: random.Random, i: int) -> str:
+    email = f"alum{i}.{rng.randint(0, 999)}@{rng.choice(DOMAINS)}"
+    return rng.choice([email, email.upper(), f"email: {email}", f"{email} (personal)",
+                       f" {email} ", email.replace('@', ' at ')])
+
+
+def make_phone(rng: random.Random) -> object:
+    a, b, c = rng.randint(200, 999), rng.randint(200, 999), rng.randint(0, 9999)
+    return rng.choice([
+        f"{a}-{b}-{c:04d}",
+        f"({a}) {b}-{c:04d}",
+        f"1 ({a}) {b} {c:04d}",
+        f"cell: +1 {a}.{b}.{c:04d} (home)",
+        int(f"{a}{b}{c:04d}"),
+        f"{b}-{c:04d}",
+    ])
+
+
+def make_sheet(rows: int, seed: int) -> pd.DataFrame:
+    """Build a synthetic mapped sheet with messy industry/location/email/phone values.
+
+    Roughly 1 in 10 cells is missing; emails and phones are nearly all distinct,
+    industries and locations repeat the way they do in real chapter sheets.
+    """
+    rng = random.Random(seed)
+
+    def maybe(value):
+        return None if rng.random() < 0.1 else value
+
+    return pd.DataFrame({
+        'current_industry': [maybe(rng.choice(INDUSTRIES)) for _ in range(rows)],
+        'current_location': [maybe(make_location(rng)) for _ in range(rows)],
+        'emails': [maybe(make_email(rng, i)) for i in range(rows)],
+        'phones': [maybe(make_phone(rng)) for _ in range(rows)],
+    })
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # The scalar methods don't touch the filesystem, so skip __init__
+    processor = AlumniDataProcessor.__new__(AlumniDataProcessor)
+    processor.industry_categories = list(INDUSTRY_CATEGORIES)
+    sheet = make_sheet(args.rows, args.seed)
+
+    cases = [
+        ('industry', 'current_industry', processor.standardize_industry, standardize_industry_column),
+        ('location', 'current_location', processor.standardize_location, standardize_location_column),
+        ('address', 'current_location', processor.standardize_address, standardize_address_column),
+        ('email', 'emails', processor.standardize_email, standardize_email_column),
+        ('phone', 'phones', processor.standardize_phone, standardize_phone_column),
+    ]
+
+    print(f"{args.rows} rows, seed {args.seed}")
+    print(f"{'field':<10}{'scalar rows/s':>16}{'vector rows/s':>16}{'speedup':>10}")
+    total_scalar = total_vector = 0.0
+    for label, column, scalar, vector in cases:
+        values = sheet[column]
+        expected, scalar_secs = timed(lambda: [scalar(v) for v in values])
+        actual, vector_secs = timed(lambda: vector(values))
+        if actual.tolist() != expected:
+            raise SystemExit(f"{label}: column-level result differs from scalar result")
+        total_scalar += scalar_secs
+        total_vector += vector_secs
+        print(f"{label:<10}{args.rows / scalar_secs:>16,.0f}{args.rows / vector_secs:>16,.0f}"
+              f"{scalar_secs / vector_secs:>9.1f}x")
+    print(f"{'total':<10}{args.rows / total_scalar:>16,.0f}{args.rows / total_vector:>16,.0f}"
+          f"{total_scalar / total_vector:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""Benchmark the Supabase upload, sync, delete and scraper write paths on a local SQLite backend.
+
+Usage: python benchmarks/bench_storage.py [--rows 10000] [--workers 4] [--path :memory:] [--seed 0]
+
+The table is created from data/scripts/schema.sql (see scripts/storage.py), so
+the same code that talks to Supabase runs offline. Stages:
+
+    upload        full insert of every row through the concurrent uploader
+    delete        delete_existing_data in in_() batches
+    sync initial  incremental sync into the empty table (all inserts)
+    sync no-op    sync again with nothing changed (manifest + hashing only)
+    sync changes  5% of rows edited, 1% added and 1% removed
+    scraper       one update per profile, shaped like the scraper's write-back
+    scraper bulk  the same writes through the scraper's buffered bulk write-back
+
+Each line prints wall time and rows per second, plus the stage's own counts.
+"""
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import update_supabase  # noqa: E402
+from storage import SQLiteBackend  # noqa: E402
+from writeback_buffer import WriteBackBuffer  # noqa: E402
+
+FIRST_NAMES = ['Alex', 'Brian', 'Chris', 'Daniel', 'Emily', 'Grace', 'Jason', 'Kevin', 'Lauren',
+               'Megan', 'Priya', 'Ryan', 'Sarah', 'Steven', 'Wei', 'Zoë', 'José', 'Renée']
+LAST_NAMES = ['Lee', 'Smith', 'Nguyen', 'Garcia', 'Kim', "O'Brien", 'Patel', 'Chen', 'Martinez',
+              'Müller', 'Peña', 'Zhang', 'Singh', 'Tran', 'Park']
+COMPANIES = ['Google', 'Meta', 'Amazon', 'Deloitte', 'Goldman Sachs', 'Salesforce', 'Startup Inc.']
+INDUSTRIES = ['Technology', 'Finance', 'Consulting', 'Marketing', 'Education', 'Government']
+
+
+def make_frame(rows: int, rng: random.Random) -> pd.DataFrame:
+    """A consolidated-alumni-shaped table with list columns as real lists."""
+    records = []
+    for i in range(rows):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+        company = rng.choice(COMPANIES)
+        records.append({
+            'name': name,
+            'current_role': rng.choice(['Engineer', 'Analyst', 'Associate', None]),
+            'current_company': company,
+            'current_industry': rng.choice(INDUSTRIES),
+            'current_location': rng.choice(['Santa Barbara, CA', 'San Jose, CA', 'New York, NY', None]),
+            'family_branch': rng.choice(['Alpha', 'Delta', 'Omega', None]),
+            'graduation_year': rng.randint(2000, 2025) if rng.random() < 0.8 else None,
+            'big_brother': None,
+            'little_brothers': [],
+            'linkedin_url': f"https://www.linkedin.com/in/alum-{i}" if rng.random() < 0.6 else None,
+            'source_sheet': [f"sheet{rng.randint(1, 6)}.csv"],
+            'has_linkedin': None,
+            'scraped': False,
+            'manually_verified': False,
+            'career_history': [{'role': 'Engineer', 'company': company, 'industry': 'Technology',
+                                'location': 'Goleta, CA', 'date': '2021-03-03'}] if rng.random() < 0.5 else [],
+            'majors': [rng.choice(['Economics', 'Computer Science', 'Statistics'])],
+            'minors': [],
+            'emails': [f"alum{i}@example.com"],
+            'phones': [f"805{rng.randint(1000000, 9999999)}"] if rng.random() < 0.5 else [],
+        })
+    return pd.DataFrame(records)
+
+
+def timed(label: str, rows: int, action, detail=lambda result: ''):
+    start = time.perf_counter()
+    result = action()
+    seconds = time.perf_counter() - start
+    print(f"{label:<14}{seconds:>9.2f}s{rows / seconds if seconds else 0:>12,.0f} rows/s  {detail(result)}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=update_supabase.UPLOAD_WORKERS)
+    parser.add_argument('--path', default=':memory:', help='SQLite database file (default: in memory)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    # Per-batch progress lines would swamp the timings
+    logging.getLogger().setLevel(logging.WARNING)
+
+    rng = random.Random(args.seed)
+    backend = SQLiteBackend(args.path)
+    df = make_frame(args.rows, rng)
+    records = update_supabase.build_upload_records(df)
+    print(f"{args.rows:,} rows, {args.workers} workers, SQLite at {args.path}\n")
+
+    timed('upload', len(records),
+          lambda: update_supabase.upload_records(backend, records, 'insert', args.workers),
+          lambda stats: f"{stats.rows_written:,} written, {stats.batches} batches")
+    timed('delete', len(records), lambda: update_supabase.delete_existing_data(backend),
+          lambda ok: f"{backend.count():,} rows left")
+
+    def sync(frame):
+        plan = update_supabase.plan_sync(update_supabase.build_upload_records(frame),
+                                         update_supabase.fetch_manifest(backend))
+        update_supabase.apply_sync(backend, plan, args.workers)
+        return plan
+
+    def describe(plan):
+        return (f"{len(plan.inserts):,} inserts, {len(plan.updates):,} updates, "
+                f"{len(plan.deletes):,} deletes, {plan.unchanged:,} unchanged")
+
+    timed('sync initial', len(df), lambda: sync(df), describe)
+    timed('sync no-op', len(df), lambda: sync(df), describe)
+
+    changed = df.copy()
+    edited = rng.sample(range(len(changed)), len(changed) // 20)
+    changed.loc[edited, 'current_company'] = 'New Company'
+    removed = set(rng.sample(range(len(changed)), len(changed) // 100))
+    changed = pd.concat([changed.drop(index=list(removed)), make_frame(len(df) // 100, rng).assign(
+        name=lambda f: f['name'] + ' (new)')], ignore_index=True)
+    timed('sync changes', len(changed), lambda: sync(changed), describe)
+
+    profiles = backend.fetch_unscraped(['id', 'name', 'linkedin_url'])
+    scraped = {
+        'role': 'Engineer', 'companies': ['Google', 'Meta'], 'location': 'Goleta, CA',
+        'has_linkedin': True, 'scraped': True, 'manually_verified': False,
+        'career_history': {'bio': None, 'picture_url': None, 'experiences': []},
+    }
+
+    def scrape_writes():
+        for profile in profiles:
+            backend.update(profile['id'], scraped)
+        return len(profiles)
+
+    timed('scraper', len(profiles), scrape_writes, lambda n: f"{n:,} profiles updated")
+
+    def buffered_writes():
+        with tempfile.TemporaryDirectory() as spool_dir:
+            writeback = WriteBackBuffer(backend, Path(spool_dir) / 'spool.jsonl',
+                                        rejected_path=Path(spool_dir) / 'rejected.jsonl')
+            for profile in profiles:
+                writeback.add({'id': profile['id'], 'name': profile['name'], **scraped})
+            writeback.close()
+        return writeback.written
+
+    timed('scraper bulk', len(profiles), buffered_writes, lambda n: f"{n:,} profiles written back")
+
+
+if __name__ == '__main__':
+    main()
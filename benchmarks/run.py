@@ -0,0 +1,177 @@
+"""Time the consolidation pipelines on synthetic data and write a JSON report.
+
+Usage: python -m benchmarks.run [--sizes 1000 10000 100000] [--output report.json]
+                                [--compare previous.json]
+
+Each size gets a fresh synthetic data/ tree (see benchmarks.synthetic). The
+stages then run in order as separate processes in that tree, so every stage
+is timed from a cold interpreter and its peak RSS is its own:
+
+    process_alumni_data  data/scripts/process_alumni_data.py --no-cache
+    merge_alumni_data    scripts/merge_alumni_data.py
+    merge_duplicates     scripts/merge_duplicates.py
+
+Reports record the git commit they were produced at; pass an earlier report
+to --compare to print the change per stage and size.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from benchmarks.synthetic import REPO_ROOT, generate_dataset
+
+STAGES = {
+    'process_alumni_data': [REPO_ROOT / 'data' / 'scripts' / 'process_alumni_data.py', '--no-cache'],
+    'merge_alumni_data': [REPO_ROOT / 'scripts' / 'merge_alumni_data.py'],
+    'merge_duplicates': [REPO_ROOT / 'scripts' / 'merge_duplicates.py'],
+}
+
+CONSOLIDATED_PATH = Path('data') / 'processed' / 'consolidated_alumni.csv'
+
+
+def git_info() -> Dict[str, Any]:
+    def git(*args):
+        result = subprocess.run(['git', *args], cwd=REPO_ROOT, capture_output=True, text=True)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {'commit': git('rev-parse', 'HEAD'), 'dirty': bool(status) if status is not None else None}
+
+
+def peak_rss_mb(rusage) -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return round(rusage.ru_maxrss * scale / (1024 * 1024), 1)
+
+
+def count_rows(path: Path) -> Optional[int]:
+    if not path.exists():
+        return None
+    import pandas as pd
+    return len(pd.read_csv(path, usecols=[0]))
+
+
+def run_stage(name: str, workdir: Path, timeout: float) -> Dict[str, Any]:
+    """Run one stage in workdir and measure wall time and peak RSS."""
+    command = [sys.executable] + [str(part) for part in STAGES[name]]
+    log_path = workdir / f"{name}.log"
+    with open(log_path, 'w') as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=workdir, stdout=log, stderr=subprocess.STDOUT)
+        timed_out = False
+        # Poll with wait4 so the rusage belongs to this child alone
+        while True:
+            pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.perf_counter() - start > timeout:
+                process.kill()
+                timed_out = True
+                pid, status, rusage = os.wait4(process.pid, 0)
+                break
+            time.sleep(0.01)
+        seconds = time.perf_counter() - start
+    # Popen must not try to reap the process again
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    return {
+        'stage': name,
+        'seconds': round(seconds, 3),
+        'peak_rss_mb': peak_rss_mb(rusage),
+        'returncode': process.returncode,
+        'timed_out': timed_out,
+        'rows_out': count_rows(workdir / CONSOLIDATED_PATH),
+        'log': log_path.name,
+    }
+
+
+def run_size(alumni: int, args, workdir: Path) -> List[Dict[str, Any]]:
+    start = time.perf_counter()
+    counts = generate_dataset(workdir, alumni, sheets=args.sheets, seed=args.seed)
+    generated = time.perf_counter() - start
+    rows_in = sum(rows for filename, rows in counts.items() if filename != 'names.csv')
+    print(f"\n{alumni:,} alumni: {rows_in:,} sheet rows in {len(counts) - 1} sheets "
+          f"(generated in {generated:.1f}s)")
+
+    results = []
+    for stage in args.stages:
+        result = run_stage(stage, workdir, args.timeout)
+        result.update({'alumni': alumni, 'rows_in': rows_in})
+        results.append(result)
+        status = 'timed out' if result['timed_out'] else (
+            'ok' if result['returncode'] == 0 else f"exit {result['returncode']}")
+        print(f"  {stage:<22}{result['seconds']:>10.2f}s{result['peak_rss_mb']:>10.1f} MB"
+              f"{result['rows_out'] or 0:>10,} rows  {status}")
+    return results
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print per-stage time and memory ratios against an earlier report."""
+    before = {(r['stage'], r['alumni']): r for r in baseline['results']}
+    print(f"\nCompared with {(baseline.get('git') or {}).get('commit') or 'baseline'}:")
+    print(f"{'stage':<22}{'alumni':>10}{'before s':>10}{'after s':>10}{'time':>8}{'RSS':>8}")
+    for result in report['results']:
+        old = before.get((result['stage'], result['alumni']))
+        if old is None:
+            continue
+        time_ratio = result['seconds'] / old['seconds'] if old['seconds'] else float('nan')
+        rss_ratio = result['peak_rss_mb'] / old['peak_rss_mb'] if old['peak_rss_mb'] else float('nan')
+        print(f"{result['stage']:<22}{result['alumni']:>10,}{old['seconds']:>10.2f}"
+              f"{result['seconds']:>10.2f}{time_ratio:>7.2f}x{rss_ratio:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='Numbers of alumni in names.csv (default: 1000 10000 100000)')
+    parser.add_argument('--sheets', type=int, default=6, help='Generic sheets per dataset (default: 6)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--timeout', type=float, default=3600,
+                        help='Seconds before a stage is killed and marked as timed out')
+    parser.add_argument('--output', type=Path, default=Path('benchmark_report.json'))
+    parser.add_argument('--compare', type=Path, help='Earlier report to compare against')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated data directories')
+    args = parser.parse_args()
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git': git_info(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': args.seed,
+        'sheets': args.sheets,
+        'results': [],
+    }
+
+    for alumni in args.sizes:
+        workdir = Path(tempfile.mkdtemp(prefix=f"alumni_bench_{alumni}_"))
+        try:
+            report['results'].extend(run_size(alumni, args, workdir))
+        finally:
+            if args.keep:
+                print(f"  data kept in {workdir}")
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""Seeded synthetic alumni data laid out like the real data/ directory.
+
+Usage: python -m benchmarks.synthetic OUT_DIR [--alumni 1000] [--sheets 6] [--seed 0]
+
+Writes OUT_DIR/data/raw/names.csv, OUT_DIR/data/raw/sheets/*.csv and a copy of
+column_mappings.json, so the pipelines can be run with OUT_DIR as the working
+directory. Besides the generic sheets (whose headers are drawn from the
+variants in column_mappings.json) it writes the three special layouts the
+pipelines handle: form1.csv (Timestamp, separate City/State columns),
+MF-Form2_2021-07-01.csv (industry header rows above their alumni) and
+form5.csv (LinkedIn URL and graduation year in one column).
+"""
+import argparse
+import json
+import random
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Dict, Optional
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MAPPINGS_PATH = REPO_ROOT / 'data' / 'scripts' / 'column_mappings.json'
+
+FIRST_NAMES = ['Alex', 'Andrew', 'Angela', 'Brian', 'Chris', 'Daniel', 'David', 'Emily', 'Eric',
+               'Grace', 'Hannah', 'Jason', 'Jennifer', 'Jessica', 'Justin', 'Kevin', 'Kyle',
+               'Lauren', 'Matthew', 'Megan', 'Michael', 'Nicole', 'Ryan', 'Sarah', 'Steven',
+               'Tyler', 'Victoria', 'José', 'Zoë', 'Renée', 'Chungin', 'Nguyen', 'Priya', 'Wei']
+NICKNAMES = ['Roy', 'AJ', 'Mike', 'Jen', 'Danny', 'Kev', 'Vicky']
+LAST_NAMES = ['Lee', 'Smith', 'Nguyen', 'Garcia', 'Kim', "O'Brien", 'Patel', 'Chen', 'Martinez',
+              'Johnson', 'Wang', 'Brown', 'Davis', 'Lopez', 'Wilson', 'Anderson', 'Thomas',
+              'Taylor', 'Moore', 'Jackson', 'Müller', 'Peña', 'Zhang', 'Singh', 'Tran', 'Park']
+
+INDUSTRIES = ['Technology', 'Tech', 'software engineering', 'Investment Banking', 'Finance',
+              'Health', 'Consulting', 'Consulting firm', 'digital media', 'Marketing',
+              'Non-profit', 'Education', 'Government', 'Real Estate', 'Unknown']
+ROLES = ['Software Engineer', 'Analyst', 'Associate', 'Product Manager', 'Consultant',
+         'Account Executive', 'Data Scientist', 'Marketing Manager', 'Founder', 'Unknown']
+COMPANIES = ['Google', 'Meta', 'Amazon', 'Deloitte', 'Goldman Sachs', 'JPMorgan', 'Salesforce',
+             'Apple', 'McKinsey', 'Procter & Gamble', 'Kaiser Permanente', 'Startup Inc.']
+CITIES = [('Santa Barbara', 'CA'), ('Goleta', 'CA'), ('Los Angeles', 'CA'), ('San Francisco', 'CA'),
+          ('San Jose', 'CA'), ('Irvine', 'CA'), ('New York', 'NY'), ('Boston', 'MA'),
+          ('Austin', 'TX'), ('Seattle', 'WA'), ('Chicago', 'IL'), ('Denver', 'CO')]
+MAJORS = ['Economics', 'Communication', 'Computer Science', 'Statistics', 'Psychology',
+          'Mathematics', 'Political Science', 'Economics & Accounting']
+FAMILIES = ['Lambda', 'Omega', 'Gamma', 'Delta', 'Alpha', 'Beta']
+DOMAINS = ['gmail.com', 'ucsb.edu', 'umail.ucsb.edu', 'yahoo.com']
+
+# Fields written to the generic sheets, with the header used when the mappings
+# file has no variant for a field
+SHEET_FIELDS = ['name', 'emails', 'phones', 'current_location', 'current_role', 'current_company',
+                'current_industry', 'graduation_year', 'majors', 'minors', 'family_branch',
+                'big_brother', 'linkedin_url']
+
+
+class Alumnus:
+    """Ground truth for one synthetic alumnus."""
+
+    def __init__(self, rng: random.Random, name: str, index: int):
+        self.name = name
+        slug = '.'.join(''.join(c for c in part if c.isalnum()) for part in name.lower().split())
+        self.email = f"{slug}{index}@{rng.choice(DOMAINS)}"
+        self.phone = f"{rng.randint(200, 999)}{rng.randint(200, 999)}{rng.randint(0, 9999):04d}"
+        self.city, self.state = rng.choice(CITIES)
+        self.role = rng.choice(ROLES)
+        self.company = rng.choice(COMPANIES)
+        self.industry = rng.choice(INDUSTRIES)
+        self.graduation_year = rng.randint(2005, 2025)
+        self.majors = rng.sample(MAJORS, rng.choice([1, 1, 2]))
+        self.minor = rng.choice([None, None, 'Spanish', 'Applied Psychology', 'Technology Management'])
+        self.family = rng.choice(FAMILIES)
+        self.linkedin = f"https://www.linkedin.com/in/{slug.replace('.', '-')}-{index}" if rng.random() < 0.7 else None
+
+
+def make_names(rng: random.Random, count: int) -> List[str]:
+    """Distinct names, including nickname and accented forms."""
+    names, seen = [], set()
+    while len(names) < count:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        roll = rng.random()
+        if roll < 0.05:
+            name = f"{first} ({rng.choice(NICKNAMES)}) {last}"
+        elif roll < 0.35:
+            name = f"{first} {chr(rng.randint(65, 90))}. {last}"
+        else:
+            name = f"{first} {last}"
+        if name in seen:
+            # Keep names unique without letting the loop stall at large sizes
+            name = f"{name} {len(names)}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def name_variant(rng: random.Random, name: str) -> str:
+    """How a name might be typed on a form: mostly exact, sometimes cased or spaced differently."""
+    roll = rng.random()
+    if roll < 0.05:
+        return name.lower()
+    if roll < 0.08:
+        return name.replace(' ', '  ', 1) + ' '
+    return name
+
+
+def format_phone(rng: random.Random, digits: str):
+    return rng.choice([
+        f"{digits[:3]}-{digits[3:6]}-{digits[6:]}",
+        f"({digits[:3]}) {digits[3:6]}-{digits[6:]}",
+        f"1 {digits[:3]} {digits[3:6]} {digits[6:]}",
+        f"cell: {digits}",
+        int(digits),
+    ])
+
+
+def format_location(rng: random.Random, alum: Alumnus) -> str:
+    return rng.choice([
+        f"{alum.city}, {alum.state}",
+        f"{alum.city} {alum.state}",
+        f"{alum.city}, {alum.state} {rng.randint(90001, 99999)}",
+        f"apt {rng.randint(1, 400)} {alum.city}, {alum.state}",
+        alum.city,
+    ])
+
+
+def field_value(rng: random.Random, alum: Alumnus, field: str):
+    """One sheet cell for an alumnus; roughly 1 in 10 optional cells is blank."""
+    if field == 'name':
+        return name_variant(rng, alum.name)
+    if rng.random() < 0.1:
+        return None
+    if field == 'emails':
+        return rng.choice([alum.email, alum.email.upper(), f"email: {alum.email}"])
+    if field == 'phones':
+        return format_phone(rng, alum.phone)
+    if field == 'current_location':
+        return format_location(rng, alum)
+    if field == 'current_role':
+        return alum.role
+    if field == 'current_company':
+        return alum.company
+    if field == 'current_industry':
+        return alum.industry
+    if field == 'graduation_year':
+        return rng.choice([alum.graduation_year, alum.graduation_year, f"'{alum.graduation_year % 100:02d}"])
+    if field == 'majors':
+        return ', '.join(alum.majors)
+    if field == 'minors':
+        return alum.minor
+    if field == 'family_branch':
+        return alum.family
+    if field == 'big_brother':
+        return None
+    if field == 'linkedin_url':
+        return alum.linkedin
+    raise KeyError(field)
+
+
+def header_variants(mappings: Dict) -> Dict[str, List[str]]:
+    """Header spellings per field: the primary name and every alternative."""
+    return {field: [mapping['primary']] + list(mapping['alternatives'])
+            for field, mapping in mappings.items()}
+
+
+def sample_members(rng: random.Random, alumni: List[Alumnus], fraction: float) -> List[Alumnus]:
+    return rng.sample(alumni, max(1, int(len(alumni) * fraction)))
+
+
+def make_generic_sheet(rng: random.Random, members: List[Alumnus], variants: Dict[str, List[str]]) -> pd.DataFrame:
+    # Each sheet picks one spelling per field, like a separately designed form
+    headers = {}
+    for field in SHEET_FIELDS:
+        options = [h for h in variants.get(field, [field]) if h not in headers.values()]
+        if options:
+            headers[field] = rng.choice(options)
+    return pd.DataFrame([
+        {header: field_value(rng, alum, field) for field, header in headers.items()}
+        for alum in members
+    ])
+
+
+def make_form1(rng: random.Random, members: List[Alumnus], start: date) -> pd.DataFrame:
+    rows = []
+    for i, alum in enumerate(members):
+        rows.append({
+            'Timestamp': f"{start + timedelta(minutes=i)} 12:00:00",
+            'Name': name_variant(rng, alum.name),
+            'Email': field_value(rng, alum, 'emails'),
+            'Phone': field_value(rng, alum, 'phones'),
+            'City': alum.city if rng.random() > 0.1 else None,
+            'State': alum.state,
+            'Company': field_value(rng, alum, 'current_company'),
+            'Title': field_value(rng, alum, 'current_role'),
+            'Industry': field_value(rng, alum, 'current_industry'),
+            'Graduation Year': field_value(rng, alum, 'graduation_year'),
+        })
+    return pd.DataFrame(rows)
+
+
+def make_mf_form2(rng: random.Random, members: List[Alumnus]) -> pd.DataFrame:
+    """Alumni grouped under industry header rows in the name column."""
+    rows = []
+    by_industry: Dict[str, List[Alumnus]] = {}
+    for alum in members:
+        by_industry.setdefault(alum.industry, []).append(alum)
+    for industry in sorted(by_industry):
+        rows.append({'Name (or industry)': industry, 'Title': None, 'Company': None, 'Email Address': None})
+        for alum in by_industry[industry]:
+            rows.append({
+                'Name (or industry)': name_variant(rng, alum.name),
+                'Title': alum.role,
+                'Company': alum.company,
+                'Email Address': field_value(rng, alum, 'emails'),
+            })
+        # Blank spacer rows between industries, as in the exported sheet
+        rows.append({'Name (or industry)': None, 'Title': None, 'Company': None, 'Email Address': None})
+    return pd.DataFrame(rows)
+
+
+def make_form5(rng: random.Random, members: List[Alumnus]) -> pd.DataFrame:
+    """LinkedIn URL and graduation year typed into a single column."""
+    rows = []
+    for alum in members:
+        parts = [p for p in (alum.linkedin, str(alum.graduation_year) if rng.random() < 0.8 else None) if p]
+        rng.shuffle(parts)
+        rows.append({
+            'Name': name_variant(rng, alum.name),
+            'Email': field_value(rng, alum, 'emails'),
+            'Company': field_value(rng, alum, 'current_company'),
+            'LinkedIn URL': rng.choice([', ', ' - ', ' class of ']).join(parts) or None,
+        })
+    return pd.DataFrame(rows)
+
+
+def generate_dataset(root: Path, alumni: int, sheets: int = 6, seed: int = 0,
+                     mappings_path: Optional[Path] = None) -> Dict[str, int]:
+    """Write a synthetic data/ tree under root and return row counts per file."""
+    rng = random.Random(seed)
+    root = Path(root)
+    raw_dir = root / 'data' / 'raw'
+    sheets_dir = raw_dir / 'sheets'
+    scripts_dir = root / 'data' / 'scripts'
+    sheets_dir.mkdir(parents=True, exist_ok=True)
+    scripts_dir.mkdir(parents=True, exist_ok=True)
+
+    mappings_path = Path(mappings_path or MAPPINGS_PATH)
+    shutil.copy(mappings_path, scripts_dir / 'column_mappings.json')
+    with open(mappings_path, 'r') as f:
+        variants = header_variants(json.load(f))
+
+    # A few percent of the people on the sheets are missing from names.csv
+    people = [Alumnus(rng, name, i) for i, name in enumerate(make_names(rng, int(alumni * 1.03) + 1))]
+    roster = people[:alumni]
+
+    counts = {}
+    names = pd.DataFrame({'name': [alum.name for alum in roster]})
+    names.to_csv(raw_dir / 'names.csv', index=False)
+    counts['names.csv'] = len(names)
+
+    outputs = {
+        'form1.csv': make_form1(rng, sample_members(rng, people, 0.2), date(2019, 9, 1)),
+        'MF-Form2_2021-07-01.csv': make_mf_form2(rng, sample_members(rng, people, 0.2)),
+        'form5.csv': make_form5(rng, sample_members(rng, people, 0.2)),
+    }
+    start = date(2018, 1, 15)
+    for i in range(sheets):
+        sheet_date = start + timedelta(days=137 * i)
+        members = sample_members(rng, people, rng.uniform(0.3, 0.6))
+        outputs[f"sheet{i + 1}_{sheet_date.isoformat()}.csv"] = make_generic_sheet(rng, members, variants)
+
+    for filename, df in outputs.items():
+        df.to_csv(sheets_dir / filename, index=False)
+        counts[filename] = len(df)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('out_dir', type=Path)
+    parser.add_argument('--alumni', type=int, default=1000)
+    parser.add_argument('--sheets', type=int, default=6, help='Number of generic sheets')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    counts = generate_dataset(args.out_dir, args.alumni, args.sheets, args.seed)
+    for filename, rows in counts.items():
+        print(f"{filename:<32}{rows:>10,} rows")
+
+
+if __name__ == '__main__':
+    main()
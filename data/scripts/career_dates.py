@@ -0,0 +1,243 @@
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+# "Apr 2025 to Present", "Sep 2024 - Nov 2024 · 3 mos", "2016 – 2019", "Sep – Nov 2024";
+# a stated tenure after the '·' is ignored and recomputed from the months
+DURATION_RE = re.compile(
+    r'^\s*(?:(?P<start_month>[a-z]+)\.?\s*)??(?P<start_year>\d{4})?\s*(?:-|–|—|\bto\b)\s*'
+    r'(?:(?P<present>present|current|now)|(?:(?P<end_month>[a-z]+)\.?\s+)?(?P<end_year>\d{4}))',
+    re.IGNORECASE,
+)
+
+# A single month or year, for roles that started and ended within it: "May 2021", "2019 · 1 yr"
+SINGLE_DATE_RE = re.compile(r'^\s*(?:(?P<month>[a-z]+)\.?\s+)?(?P<year>\d{4})\s*(?:·.*)?$', re.IGNORECASE)
+
+ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+# Stands in for a missing month or sort key in the integer columns
+MISSING = -1
+
+
+class Duration(NamedTuple):
+    """A parsed duration; months are month_index values, MISSING when unknown."""
+    start_month: int
+    end_month: int
+    current: bool
+
+
+_NO_DURATION = Duration(MISSING, MISSING, False)
+
+
+def month_index(year: int, month: int) -> int:
+    """Months since January of year 0, so consecutive months differ by one."""
+    return year * 12 + month - 1
+
+
+def _month_number(name: Optional[str], default: int) -> Optional[int]:
+    if name is None:
+        return default
+    return MONTHS.get(name[:3].lower())
+
+
+@lru_cache(maxsize=None)
+def parse_duration(text: str) -> Duration:
+    """Start and end month of a free-text duration.
+
+    A year without a month starts in January and ends in December; a single
+    month or year is both the start and the end. Scraped
+    durations repeat heavily across profiles, so results are memoized.
+    """
+    match = DURATION_RE.match(text)
+    if not match:
+        single = SINGLE_DATE_RE.match(text)
+        if not single:
+            return _NO_DURATION
+        year = int(single.group('year'))
+        if single.group('month') is None:
+            return Duration(month_index(year, 1), month_index(year, 12), False)
+        month = _month_number(single.group('month'), 1)
+        if month is None:
+            return _NO_DURATION
+        return Duration(month_index(year, month), month_index(year, month), False)
+    start_year = match.group('start_year')
+    if start_year is None:
+        # "Sep – Nov 2024": the year is only given once
+        if not (match.group('start_month') and match.group('end_year')):
+            return _NO_DURATION
+        start_year = match.group('end_year')
+    start = _month_number(match.group('start_month'), 1)
+    if start is None:
+        return _NO_DURATION
+    start_month = month_index(int(start_year), start)
+    if match.group('present'):
+        return Duration(start_month, MISSING, True)
+    end = _month_number(match.group('end_month'), 12)
+    if end is None:
+        return Duration(start_month, MISSING, False)
+    return Duration(start_month, month_index(int(match.group('end_year')), end), False)
+
+
+@lru_cache(maxsize=None)
+def _date_ordinal(value: Any) -> int:
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return MISSING if pd.isna(value) else value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    if isinstance(value, str) and ISO_DATE_RE.match(value):
+        try:
+            return date.fromisoformat(value[:10]).toordinal()
+        except ValueError:
+            return MISSING
+    return MISSING
+
+
+def date_ordinal(value: Any) -> int:
+    """Day ordinal of a date, datetime or ISO date string; MISSING for anything else."""
+    try:
+        return _date_ordinal(value)
+    except TypeError:
+        # Unhashable values are never dates
+        return MISSING
+
+
+@lru_cache(maxsize=None)
+def month_end_ordinal(month: int) -> int:
+    """Day ordinal of the last day of a month_index month."""
+    year, month = divmod(month + 1, 12)
+    return date(year, month + 1, 1).toordinal() - 1
+
+
+def _map_distinct(values: List[Any], parse, missing, dtype) -> np.ndarray:
+    """parse() applied once per distinct value (by equality), as an array in input order."""
+    codes, uniques = pd.factorize(np.array(values, dtype=object), use_na_sentinel=True)
+    # One trailing slot for missing values, which factorize codes as -1
+    parsed = np.array([parse(value) for value in uniques] + [missing], dtype=dtype)
+    return parsed[codes]
+
+
+def career_frame(histories: Sequence[List[Dict[str, Any]]], today: Optional[date] = None) -> pd.DataFrame:
+    """One row per career entry of every history, with integer date columns.
+
+    Columns: record (index into histories), position (index in its history),
+    start_month, end_month, current, tenure_months and sort_key. Months are
+    month_index values and MISSING when unknown. The sort key is a day
+    ordinal: the entry's 'date' when it has one, else the end of its
+    duration (today for a current role), else MISSING.
+    """
+    today = today or date.today()
+    lengths = np.fromiter((len(history) for history in histories), dtype=np.int64, count=len(histories))
+    entries = [entry for history in histories for entry in history]
+    record = np.repeat(np.arange(len(histories)), lengths)
+    position = np.arange(len(entries)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+    durations = _map_distinct([entry.get('duration') for entry in entries],
+                              lambda text: parse_duration(text) if isinstance(text, str) else _NO_DURATION,
+                              _NO_DURATION, dtype=np.int64).reshape(-1, 3)
+    start, end, current = durations[:, 0], durations[:, 1], durations[:, 2].astype(bool)
+    dated = _map_distinct([entry.get('date') for entry in entries], date_ordinal, MISSING, dtype=np.int64)
+
+    today_month = month_index(today.year, today.month)
+    effective_end = np.where(current, today_month, end)
+    known = (start != MISSING) & (effective_end != MISSING)
+    tenure = np.where(known, effective_end - start + 1, MISSING)
+
+    end_ordinal = np.full(len(entries), MISSING, dtype=np.int64)
+    has_end = end != MISSING
+    end_ordinal[has_end] = [month_end_ordinal(int(month)) for month in end[has_end]]
+    end_ordinal[current] = today.toordinal()
+    sort_key = np.where(dated != MISSING, dated, end_ordinal)
+
+    return pd.DataFrame({
+        'record': record,
+        'position': position,
+        'start_month': start,
+        'end_month': end,
+        'current': current,
+        'tenure_months': tenure,
+        'sort_key': sort_key,
+    })
+
+
+def sort_order(frame: pd.DataFrame) -> np.ndarray:
+    """Row order of career_frame: by record, most recent first, entries without a
+    sort key last, ties in their original order."""
+    return np.lexsort((frame['position'].to_numpy(), -frame['sort_key'].to_numpy(),
+                       frame['record'].to_numpy()))
+
+
+def sort_histories(histories: Sequence[List[Dict[str, Any]]], today: Optional[date] = None) -> List[Optional[Dict[str, Any]]]:
+    """Sort every history in place, most recent first, in one pass over all entries.
+
+    Returns the most recent entry of each history (None for empty ones),
+    which is the entry current values are taken from.
+    """
+    frame = career_frame(histories, today)
+    order = sort_order(frame).tolist()
+    entries = [entry for history in histories for entry in history]
+    ordered = [entries[row] for row in order]
+    # Rows stay grouped by record in their original record order, so each
+    # history is the same slice of ordered as it was of entries
+    offset = 0
+    for history in histories:
+        size = len(history)
+        if size > 1:
+            history[:] = ordered[offset:offset + size]
+        offset += size
+    return [history[0] if history else None for history in histories]
+
+
+def month_label(month: int) -> Optional[str]:
+    """'YYYY-MM' for a month_index month; None for MISSING."""
+    if month == MISSING:
+        return None
+    year, month = divmod(month, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+
+def current_positions(frame: pd.DataFrame, records: int) -> List[Optional[int]]:
+    """Position of each record's current role in career_frame, None if it has no dated entry.
+
+    A current role wins, then the latest sort key (end of the role), then the
+    latest start; ties keep the listed order, which on LinkedIn is newest first.
+    """
+    dated = frame[(frame['start_month'] != MISSING) | (frame['sort_key'] != MISSING)]
+    record = dated['record'].to_numpy()
+    order = np.lexsort((dated['position'].to_numpy(), -dated['start_month'].to_numpy(),
+                        -dated['sort_key'].to_numpy(), ~dated['current'].to_numpy(), record))
+    record = record[order]
+    first = np.ones(len(record), dtype=bool)
+    first[1:] = record[1:] != record[:-1]
+    positions: List[Optional[int]] = [None] * records
+    for record_id, position in zip(record[first].tolist(), dated['position'].to_numpy()[order][first].tolist()):
+        positions[record_id] = position
+    return positions
+
+
+def annotate_experiences(histories: Sequence[List[Dict[str, Any]]],
+                         today: Optional[date] = None) -> List[Optional[int]]:
+    """Add start, end, current and tenure_months to every experience, in one pass over all of them.
+
+    start and end are 'YYYY-MM' (None when unknown; end is None for a current
+    role), parsed from each experience's 'duration'. Returns the index of each
+    history's current role, None when none of its durations could be parsed.
+    """
+    frame = career_frame(histories, today)
+    entries = [entry for history in histories for entry in history]
+    for entry, start, end, current, tenure in zip(
+            entries, frame['start_month'].tolist(), frame['end_month'].tolist(),
+            frame['current'].tolist(), frame['tenure_months'].tolist()):
+        entry['start'] = month_label(start)
+        entry['end'] = month_label(end)
+        entry['current'] = current
+        entry['tenure_months'] = None if tenure == MISSING else tenure
+    return current_positions(frame, len(histories))
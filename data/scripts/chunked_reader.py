@@ -0,0 +1,106 @@
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import List, Dict, Any, Iterator
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+
+def csv_chunk_dtypes(path: Path, chunk_size: int) -> Dict[str, Any]:
+    """Work out the dtypes a whole-file read_csv would give, one chunk at a time.
+
+    Each chunk infers its own dtypes, so a phone column that is all digits in
+    one chunk would come back as numbers there and as strings elsewhere. A
+    cheap first pass finds columns that are text (or have gaps) anywhere so
+    that every chunk can be read the way the whole sheet would have been.
+    """
+    kinds: Dict[str, set] = {}
+    for chunk in pd.read_csv(path, chunksize=chunk_size):
+        for column, dtype in chunk.dtypes.items():
+            kinds.setdefault(column, set()).add(dtype.kind)
+
+    dtypes = {}
+    for column, column_kinds in kinds.items():
+        if 'b' in column_kinds:
+            # Booleans only survive as bools when inferred, leave them be
+            continue
+        if 'O' in column_kinds:
+            dtypes[column] = object
+        elif 'f' in column_kinds:
+            dtypes[column] = 'float64'
+    return dtypes
+
+
+def read_csv_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Read a CSV in chunks whose dtypes match a whole-file pd.read_csv."""
+    yield from pd.read_csv(path, chunksize=chunk_size, dtype=csv_chunk_dtypes(path, chunk_size))
+
+
+def _xlsx_rows(path: Path) -> Iterator[tuple]:
+    """Yield the header and data rows of an .xlsx file's first worksheet."""
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            # Match read_excel: whole-number floats come back as ints
+            yield tuple(int(v) if isinstance(v, float) and v.is_integer() else v for v in row)
+    finally:
+        workbook.close()
+
+
+def read_xlsx_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Stream the first worksheet of an .xlsx file in chunks of rows.
+
+    openpyxl's read-only mode keeps only the current row in memory. Like
+    csv_chunk_dtypes, a first pass over the cell values decides each column's
+    dtype so that chunks match a whole-file pd.read_excel.
+    """
+    rows = _xlsx_rows(path)
+    header = next(rows, None)
+    if header is None:
+        return
+    # Name blank and repeated headers the way read_excel does
+    columns = []
+    for i, col in enumerate(header):
+        name = f"Unnamed: {i}" if col is None else col
+        base, n = name, 0
+        while name in columns:
+            n += 1
+            name = f"{base}.{n}"
+        columns.append(name)
+    width = len(columns)
+
+    has_gaps = [False] * width
+    types: List[set] = [set() for _ in columns]
+    for row in rows:
+        for i, value in enumerate(row[:width]):
+            if value is None:
+                has_gaps[i] = True
+            else:
+                types[i].add(type(value))
+
+    def convert(column: pd.Series, i: int) -> pd.Series:
+        column_types = types[i]
+        if column_types and column_types <= {int, float}:
+            if float in column_types or has_gaps[i]:
+                return column.astype('float64')
+            return column.astype('int64')
+        if column_types == {bool} and not has_gaps[i]:
+            return column.astype(bool)
+        if column_types == {datetime}:
+            return pd.to_datetime(column)
+        return column.where(column.notna(), np.nan)
+
+    rows = _xlsx_rows(path)
+    next(rows)
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            break
+        chunk = pd.DataFrame(
+            [row[:width] + (None,) * (width - len(row)) for row in batch],
+            columns=columns, dtype=object
+        )
+        yield pd.DataFrame({col: convert(chunk[col], i) for i, col in enumerate(columns)},
+                           index=chunk.index)
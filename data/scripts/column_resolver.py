@@ -0,0 +1,115 @@
+import re
+import logging
+from typing import List, Dict, Any, Tuple, NamedTuple, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_header(header: Any) -> str:
+    """Normalize a column header for matching: lowercase, trimmed, single-spaced."""
+    return ' '.join(str(header).lower().split())
+
+
+class ColumnResolution(NamedTuple):
+    # field -> resolved column(s) of the sheet
+    mapping: Dict[str, Any]
+    # field or header -> the competing matches that were not (or not only) used
+    ambiguous: Dict[str, List[str]]
+
+
+class ColumnResolver:
+    """Resolves a sheet's headers to our fields from a compiled mapping table.
+
+    Two matching modes are supported:
+
+    - 'exact' (column_mappings.json): each field takes the first of its primary
+      and alternative names present in the sheet, compared after
+      normalize_header. Ambiguous entries list every other candidate header
+      that was also present for that field.
+    - 'substring' (COLUMN_MAPPINGS in merge_alumni_data): each field takes every
+      column whose header contains one of its candidates. Ambiguous entries
+      list headers claimed by more than one field.
+
+    Sheets exported from the same form share a header signature, so each
+    distinct signature is resolved once and then served from memory.
+    """
+
+    def __init__(self, mappings: Dict[str, Any], mode: str = 'exact'):
+        if mode not in ('exact', 'substring'):
+            raise ValueError(f"Unknown column matching mode: {mode}")
+        self.mode = mode
+        self._resolved: Dict[Tuple[str, ...], ColumnResolution] = {}
+
+        if mode == 'exact':
+            # normalized header -> [(field, rank)], rank 0 being the primary name
+            self.lookup: Dict[str, List[Tuple[str, int]]] = {}
+            self.fields = list(mappings)
+            for field, mapping in mappings.items():
+                candidates = [mapping['primary']] + list(mapping['alternatives'])
+                seen = set()
+                for rank, candidate in enumerate(candidates):
+                    key = normalize_header(candidate)
+                    if key not in seen:
+                        seen.add(key)
+                        self.lookup.setdefault(key, []).append((field, rank))
+        else:
+            # One alternation per field; candidates differ only in case, so
+            # they collapse to a handful of lowercase literals
+            self.patterns = {
+                field: re.compile('|'.join(
+                    re.escape(c) for c in sorted({c.lower() for c in candidates}, key=len, reverse=True)
+                ))
+                for field, candidates in mappings.items()
+            }
+
+    def resolve(self, headers: Sequence[Any]) -> ColumnResolution:
+        """Resolve a sheet's headers, memoized per header signature."""
+        signature = tuple(str(h) for h in headers)
+        resolution = self._resolved.get(signature)
+        if resolution is None:
+            if self.mode == 'exact':
+                resolution = self._resolve_exact(list(headers))
+            else:
+                resolution = self._resolve_substring(list(headers))
+            if resolution.ambiguous:
+                logger.info(f"Ambiguous column matches: {resolution.ambiguous}")
+            self._resolved[signature] = resolution
+        return resolution
+
+    def _resolve_exact(self, headers: List[Any]) -> ColumnResolution:
+        # field -> [(rank, header)] for every candidate the sheet has
+        found: Dict[str, List[Tuple[int, Any]]] = {}
+        claimed = set()
+        for header in headers:
+            key = normalize_header(header)
+            # Repeated headers resolve to their first occurrence
+            if key in claimed:
+                continue
+            claimed.add(key)
+            for field, rank in self.lookup.get(key, ()):
+                found.setdefault(field, []).append((rank, header))
+
+        mapping = {}
+        ambiguous = {}
+        for field in self.fields:
+            if field not in found:
+                continue
+            matches = sorted(found[field], key=lambda match: match[0])
+            mapping[field] = matches[0][1]
+            if len(matches) > 1:
+                ambiguous[field] = [str(header) for _, header in matches[1:]]
+        return ColumnResolution(mapping, ambiguous)
+
+    def _resolve_substring(self, headers: List[Any]) -> ColumnResolution:
+        mapping = {}
+        claimed_by: Dict[str, List[str]] = {}
+        lowered = [(header, str(header).lower()) for header in headers]
+        for field, pattern in self.patterns.items():
+            matches = [header for header, text in lowered if pattern.search(text)]
+            if matches:
+                mapping[field] = matches
+                for header in matches:
+                    claimed_by.setdefault(str(header), []).append(field)
+
+        ambiguous = {header: fields for header, fields in claimed_by.items() if len(fields) > 1}
+        return ColumnResolution(mapping, ambiguous)
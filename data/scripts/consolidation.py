@@ -0,0 +1,78 @@
+from typing import List, Dict, Any, Optional
+import numpy as np
+import pandas as pd
+
+# Columns of the consolidated alumni table, in output order
+CONSOLIDATED_COLUMNS = [
+    'name', 'current_role', 'current_company', 'current_industry',
+    'current_location', 'family_branch', 'graduation_year', 'big_brother',
+    'little_brothers', 'linkedin_url', 'source_sheet', 'has_linkedin', 'scraped',
+    'manually_verified', 'data_last_updated', 'career_history',
+    'majors', 'minors', 'emails', 'phones'
+]
+
+# Columns that hold a list per alumnus
+LIST_COLUMNS = ['career_history', 'majors', 'minors', 'emails', 'phones', 'little_brothers']
+
+
+def normalize_name_key(name: Any) -> Optional[str]:
+    """Normalize a name into the key used for matching rows across sheets."""
+    if not isinstance(name, str):
+        return None
+    return name.lower()
+
+
+class ConsolidationEngine:
+    """Accumulates alumni records keyed by normalized name.
+
+    Records are kept as plain dicts in insertion order and looked up through a
+    name -> position index, so matching a sheet row is O(1) and the DataFrame is
+    only built once in to_frame().
+    """
+
+    def __init__(self, columns: List[str] = CONSOLIDATED_COLUMNS):
+        self.columns = list(columns)
+        self.records: List[Dict[str, Any]] = []
+        self._index: Dict[str, int] = {}
+
+    def _new_record(self, name: Any) -> Dict[str, Any]:
+        # Missing values start as NaN, matching a freshly reindexed DataFrame
+        record = dict.fromkeys(self.columns, np.nan)
+        record['name'] = name
+        for field in LIST_COLUMNS:
+            if field in record:
+                record[field] = []
+        return record
+
+    def _append(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        key = normalize_name_key(record['name'])
+        # Keep the first record for a key, like a first-match lookup would
+        if key is not None and key not in self._index:
+            self._index[key] = len(self.records)
+        self.records.append(record)
+        return record
+
+    def seed(self, names: pd.Series) -> None:
+        """Seed the engine with the master list of names."""
+        for name in names:
+            self._append(self._new_record(name))
+
+    def get(self, name: Any) -> Optional[Dict[str, Any]]:
+        """Return the record for a name, or None if it has not been seen."""
+        idx = self._index.get(normalize_name_key(name))
+        return None if idx is None else self.records[idx]
+
+    def get_or_create(self, name: Any) -> Dict[str, Any]:
+        """Return the record for a name, appending a new one if needed."""
+        record = self.get(name)
+        if record is None:
+            record = self._append(self._new_record(name))
+        return record
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Build the consolidated DataFrame from the accumulated records."""
+        # object dtype keeps ints, bools and lists exactly as they were stored
+        return pd.DataFrame(self.records, columns=self.columns, dtype=object)
@@ -0,0 +1,185 @@
+import json
+import logging
+import platform
+import time
+import tracemalloc
+import traceback
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Iterator, Iterable, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def _max_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if platform.system() == 'Darwin' else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1024 * 1024), 1)
+
+
+class StageStats:
+    """Accumulated measurements for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.peak_traced_mb: Optional[float] = None
+        self.max_rss_mb: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'stage': self.name,
+            'calls': self.calls,
+            'seconds': round(self.seconds, 4),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'peak_traced_mb': self.peak_traced_mb,
+            'max_rss_mb': self.max_rss_mb,
+            'error': self.error,
+        }
+
+
+class StageContext:
+    """Handle yielded by RunReport.stage; set rows_out once it is known."""
+
+    __slots__ = ('rows_out',)
+
+    def __init__(self):
+        self.rows_out = None
+
+
+class RunReport:
+    """Collects per-stage wall time, row counts, memory and counters for a run.
+
+    A stage can be entered many times (once per sheet or chunk); its figures
+    accumulate. With trace_memory, tracemalloc measures the peak Python
+    allocation inside each stage, at a noticeable cost in speed; otherwise only
+    the process's peak RSS after each stage is recorded.
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self.started = datetime.now(timezone.utc)
+        self.status = 'running'
+        self.error: Optional[str] = None
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _stats(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+        return stats
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = 0) -> Iterator[StageContext]:
+        """Time a block of work as (part of) a stage."""
+        stats = self._stats(name)
+        context = StageContext()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield context
+        except Exception as e:
+            stats.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+            stats.rows_in += rows_in
+            if context.rows_out is not None:
+                stats.rows_out += context.rows_out
+            if self.trace_memory:
+                peak = (tracemalloc.get_traced_memory()[1] - baseline) / (1024 * 1024)
+                stats.peak_traced_mb = round(max(stats.peak_traced_mb or 0.0, peak), 1)
+            stats.max_rss_mb = _max_rss_mb()
+
+    def timed_iter(self, name: str, items: Iterable) -> Iterator:
+        """Yield from items, charging the time spent producing each one to a stage.
+
+        Used for streamed reads, where the work happens inside the generator.
+        """
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                # The call that finds the end is still work done for the stage
+                self._stats(name).seconds += time.perf_counter() - start
+                return
+            stats = self._stats(name)
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+            if hasattr(item, '__len__'):
+                stats.rows_out += len(item)
+            stats.max_rss_mb = _max_rss_mb()
+            yield item
+
+    def count(self, group: str, key: str, n: int = 1) -> None:
+        """Add n to a named counter, e.g. count('sheet_rows', 'form1', 120)."""
+        counters = self.counters.setdefault(group, {})
+        counters[key] = counters.get(key, 0) + int(n)
+
+    def fail(self, error: BaseException) -> None:
+        self.status = 'error'
+        self.error = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'started': self.started.isoformat(timespec='seconds'),
+            'finished': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'status': 'ok' if self.status == 'running' else self.status,
+            'error': self.error,
+            'python': platform.python_version(),
+            'trace_memory': self.trace_memory,
+            'max_rss_mb': _max_rss_mb(),
+            'stages': [stats.to_dict() for stats in self.stages.values()],
+            'counters': self.counters,
+        }
+
+    def write(self, path: Path) -> None:
+        """Write the report as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        logger.info(f"Run report written to {path}")
+
+
+class NullReport:
+    """Drop-in RunReport that records nothing, used when reporting is off."""
+
+    enabled = False
+
+    def stage(self, name: str, rows_in: int = 0):
+        return nullcontext(StageContext())
+
+    def timed_iter(self, name: str, items: Iterable) -> Iterable:
+        return items
+
+    def count(self, group: str, key: str, n: int = 1) -> None:
+        pass
+
+    def fail(self, error: BaseException) -> None:
+        pass
+
+    def write(self, path: Path) -> None:
+        pass
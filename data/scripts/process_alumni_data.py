@@ -1,19 +1,33 @@
 import pandas as pd
-import numpy as np
 from pathlib import Path
 import json
-from typing import List, Dict, Any
+from typing import List, Any, Tuple, Optional, Iterator
 import logging
-from datetime import datetime
-import os
-import re
+from datetime import date, datetime
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+
+from career_dates import sort_histories
+from chunked_reader import read_csv_chunks, read_xlsx_chunks
+from column_resolver import ColumnResolver
+from instrumentation import RunReport, NullReport
+from consolidation import ConsolidationEngine, CONSOLIDATED_COLUMNS
+from sheet_cache import SheetCache
+from snapshot import write_consolidated
+from sql_export import EXPORT_FORMATS, write_insert_script, write_copy_export
+from standardize import (
+    INDUSTRY_CATEGORIES, INDUSTRY_MAPPING, LOCATION_PREFIX_RE, LOCATION_SUFFIX_RE,
+    CITY_COMMA_STATE_RE, CITY_SPACE_STATE_RE, EMAIL_PREFIX_RE, EMAIL_RE,
+    PHONE_PREFIX_RE, PHONE_FORMATTED_RE, PARENTHETICAL_SUFFIX_RE, COLUMN_STANDARDIZERS,
+    STANDARDIZED_SUFFIX, standardize_sheet
+)
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class AlumniDataProcessor:
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, use_cache: bool = True, report: Optional[RunReport] = None):
         self.data_dir = Path(data_dir)
         self.raw_dir = self.data_dir / 'raw'
         self.processed_dir = self.data_dir / 'processed'
@@ -24,14 +38,19 @@ class AlumniDataProcessor:
         self.processed_dir.mkdir(parents=True, exist_ok=True)
         
         # Load column mappings
-        with open(self.data_dir / 'scripts' / 'column_mappings.json', 'r') as f:
+        mappings_path = self.data_dir / 'scripts' / 'column_mappings.json'
+        with open(mappings_path, 'r') as f:
             self.column_mappings = json.load(f)
+        self.column_resolver = ColumnResolver(self.column_mappings)
+        
+        # Cache of parsed, column-mapped sheets keyed by content hash
+        self.sheet_cache = SheetCache(self.processed_dir / '.cache', mappings_path, enabled=use_cache)
+        
+        # Per-stage timings and counters; a no-op unless a RunReport is passed in
+        self.report = report or NullReport()
         
         # Standard industry categories
-        self.industry_categories = [
-            'Technology', 'Finance', 'Healthcare', 'Marketing', 
-            'Consulting', 'Education', 'Government', 'Non-Profit'
-        ]
+        self.industry_categories = list(INDUSTRY_CATEGORIES)
         
         # Standard family branches
         self.family_branches = ['Lambda', 'Omega', 'Gamma', 'Delta', 'Alpha', 'Beta']
@@ -56,52 +75,155 @@ class AlumniDataProcessor:
         
         return pd.read_csv(names_file)
 
+    @staticmethod
+    def _sheet_date(file: Path):
+        """Sheet date from the filename (format: ..._YYYY-MM-DD), or None."""
+        try:
+            date_str = file.stem.split('_')[-1]
+            return datetime.strptime(date_str, '%Y-%m-%d').date()
+        except ValueError:
+            return None
+
+    def _sheet_files(self) -> List[Path]:
+        """List the source sheet files, ordered by sheet date and then filename.
+
+        Undated sheets come first so that dated sheets are merged oldest to newest
+        and the most recent values win, whatever order the filesystem lists them in.
+        """
+        files = [
+            file for file in self.sheets_dir.glob('*.*')
+            if file.suffix.lower() in ['.xlsx', '.xls', '.csv']
+        ]
+        return sorted(files, key=lambda file: (self._sheet_date(file) or date.min, file.name))
+
+    def _read_sheet(self, file: Path) -> pd.DataFrame:
+        """Parse a single source sheet and tag it with its source information."""
+        if file.suffix.lower() in ['.xlsx', '.xls']:
+            df = pd.read_excel(file)
+        else:
+            df = pd.read_csv(file)
+        
+        df['source_sheet'] = file.stem
+        # Add sheet date if available in filename (format: YYYY-MM-DD)
+        df['sheet_date'] = self._sheet_date(file)
+        return df
+
     def load_source_sheets(self) -> List[pd.DataFrame]:
         """Load all source sheets from the sheets directory."""
         sheets = []
-        for file in self.sheets_dir.glob('*.*'):
+        for file in self._sheet_files():
             try:
-                if file.suffix.lower() in ['.xlsx', '.xls']:
-                    df = pd.read_excel(file)
-                elif file.suffix.lower() == '.csv':
-                    df = pd.read_csv(file)
-                else:
-                    continue
-                
-                df['source_sheet'] = file.stem
-                # Add sheet date if available in filename (format: YYYY-MM-DD)
-                try:
-                    date_str = file.stem.split('_')[-1]
-                    df['sheet_date'] = datetime.strptime(date_str, '%Y-%m-%d').date()
-                except:
-                    df['sheet_date'] = None
-                sheets.append(df)
+                sheets.append(self._read_sheet(file))
                 logger.info(f"Loaded sheet: {file.stem}")
             except Exception as e:
                 logger.error(f"Error loading {file}: {str(e)}")
         return sheets
 
+    def _load_mapped_sheet(self, file: Path) -> Tuple[pd.DataFrame, bool]:
+        """Load one sheet with its columns mapped; also report whether it was cached."""
+        with self.report.stage('load') as stage:
+            mapped = self.sheet_cache.load(file)
+            if mapped is None:
+                df = self._read_sheet(file)
+            stage.rows_out = len(df if mapped is None else mapped)
+        if mapped is not None:
+            return mapped, True
+        with self.report.stage('map', rows_in=len(df)) as stage:
+            mapped = self.map_columns(df)
+            stage.rows_out = len(mapped)
+        self.sheet_cache.store(file, mapped)
+        return mapped, False
+
+    def load_mapped_sheets(self, workers: int = 1) -> List[pd.DataFrame]:
+        """Load all source sheets with their columns mapped, reusing cached sheets.
+
+        With workers > 1 the sheets are parsed and mapped in a process pool. Results
+        are collected in _sheet_files() order, so the output never depends on which
+        worker finishes first.
+        """
+        files = self._sheet_files()
+        if workers > 1 and len(files) > 1:
+            # Stage timings recorded inside the workers stay there, so the
+            # parallel read and map are reported together as 'load'
+            with self.report.stage('load') as stage, \
+                    ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+                futures = [pool.submit(self._load_mapped_sheet, file) for file in files]
+                results = []
+                for file, future in zip(files, futures):
+                    try:
+                        results.append((file, future.result()))
+                    except Exception as e:
+                        logger.error(f"Error loading {file}: {str(e)}")
+                stage.rows_out = sum(len(mapped) for _, (mapped, _) in results)
+        else:
+            results = []
+            for file in files:
+                try:
+                    results.append((file, self._load_mapped_sheet(file)))
+                except Exception as e:
+                    logger.error(f"Error loading {file}: {str(e)}")
+        
+        sheets = []
+        hits = 0
+        for file, (mapped, cached) in results:
+            sheets.append(mapped)
+            hits += cached
+            logger.info(f"Loaded sheet: {file.stem}")
+        if self.sheet_cache.enabled:
+            logger.info(f"Sheet cache: {hits} hits, {len(results) - hits} misses")
+        return sheets
+
+    def _read_sheet_chunks(self, file: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Parse a source sheet in chunks of at most chunk_size rows."""
+        suffix = file.suffix.lower()
+        if suffix == '.csv':
+            chunks = read_csv_chunks(file, chunk_size)
+        elif suffix == '.xlsx':
+            chunks = read_xlsx_chunks(file, chunk_size)
+        else:
+            # Legacy .xls can't be streamed; read it whole and slice
+            df = pd.read_excel(file)
+            chunks = (df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size))
+        
+        sheet_date = self._sheet_date(file)
+        for chunk in chunks:
+            chunk = chunk.copy()
+            chunk['source_sheet'] = file.stem
+            chunk['sheet_date'] = sheet_date
+            yield chunk
+
+    def iter_mapped_chunks(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Stream every source sheet as column-mapped chunks, in _sheet_files() order.
+
+        Only one chunk is held in memory at a time, so the sheet cache is bypassed.
+        """
+        for file in self._sheet_files():
+            try:
+                rows = 0
+                for chunk in self.report.timed_iter('load', self._read_sheet_chunks(file, chunk_size)):
+                    rows += len(chunk)
+                    with self.report.stage('map', rows_in=len(chunk)) as stage:
+                        mapped = self.map_columns(chunk)
+                        stage.rows_out = len(mapped)
+                    yield mapped
+                logger.info(f"Streamed sheet: {file.stem} ({rows} rows)")
+            except Exception as e:
+                logger.error(f"Error loading {file}: {str(e)}")
+
     def map_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Map source sheet columns to standardized column names."""
         mapped_df = pd.DataFrame()
         
-        # First, normalize all column names to lowercase
-        df.columns = [str(col).lower().strip() for col in df.columns]
+        # Resolve headers against the compiled mapping table (primary name first,
+        # then alternatives, compared case- and whitespace-insensitively)
+        resolution = self.column_resolver.resolve(df.columns)
         
-        # Map each column based on our mappings
-        for field, mapping in self.column_mappings.items():
-            # Try primary name first
-            if mapping['primary'] in df.columns:
-                mapped_df[field] = df[mapping['primary']]
+        for field in self.column_mappings:
+            if field in resolution.mapping:
+                mapped_df[field] = df[resolution.mapping[field]]
             else:
-                # Try alternatives
-                for alt in mapping['alternatives']:
-                    if alt in df.columns:
-                        mapped_df[field] = df[alt]
-                        break
-                else:
-                    # If no mapping found, create empty column
-                    mapped_df[field] = None
+                # If no mapping found, create empty column
+                mapped_df[field] = None
         
         # Preserve source information
         mapped_df['source_sheet'] = df['source_sheet']
@@ -116,25 +238,6 @@ class AlumniDataProcessor:
         
         industry = str(industry).strip().title()
         
-        # Map common variations to standard categories
-        industry_mapping = {
-            'tech': 'Technology',
-            'software': 'Technology',
-            'it': 'Technology',
-            'finance': 'Finance',
-            'banking': 'Finance',
-            'accounting': 'Finance',
-            'healthcare': 'Healthcare',
-            'medical': 'Healthcare',
-            'health': 'Healthcare',
-            'marketing': 'Marketing',
-            'consulting': 'Consulting',
-            'education': 'Education',
-            'government': 'Government',
-            'non-profit': 'Non-Profit',
-            'nonprofit': 'Non-Profit'
-        }
-        
         # Check for exact matches first
         for category in self.industry_categories:
             if category.lower() == industry.lower():
@@ -146,7 +249,7 @@ class AlumniDataProcessor:
                 return category
         
         # Check mapping dictionary
-        for key, value in industry_mapping.items():
+        for key, value in INDUSTRY_MAPPING.items():
             if key in industry.lower():
                 return value
         
@@ -161,8 +264,8 @@ class AlumniDataProcessor:
         location = str(location).strip()
         
         # Remove common prefixes/suffixes
-        location = re.sub(r'^(apt\.?|apartment|unit|#)\s*[a-z0-9-]+[,\s]*', '', location, flags=re.IGNORECASE)
-        location = re.sub(r'[,\s]+(apt\.?|apartment|unit|#)\s*[a-z0-9-]+$', '', location, flags=re.IGNORECASE)
+        location = LOCATION_PREFIX_RE.sub('', location)
+        location = LOCATION_SUFFIX_RE.sub('', location)
         
         # Try to extract city and state
         # Common patterns:
@@ -174,13 +277,13 @@ class AlumniDataProcessor:
         # City ST
         
         # First try to match "City, State" or "City, ST" pattern
-        match = re.match(r'^([^,]+),\s*([A-Za-z]{2})(?:\s+\d{5})?$', location)
+        match = CITY_COMMA_STATE_RE.match(location)
         if match:
             city, state = match.groups()
             return f"{city.strip()}, {state.upper()}"
         
         # Try to match "City State" or "City ST" pattern
-        match = re.match(r'^([^,]+)\s+([A-Za-z]{2})(?:\s+\d{5})?$', location)
+        match = CITY_SPACE_STATE_RE.match(location)
         if match:
             city, state = match.groups()
             return f"{city.strip()}, {state.upper()}"
@@ -206,11 +309,11 @@ class AlumniDataProcessor:
         email = str(email).strip().lower()
         
         # Remove common prefixes/suffixes
-        email = re.sub(r'^(email|e-mail|mail):\s*', '', email, flags=re.IGNORECASE)
-        email = re.sub(r'\s*\(.*\)$', '', email)
+        email = EMAIL_PREFIX_RE.sub('', email)
+        email = PARENTHETICAL_SUFFIX_RE.sub('', email)
         
         # Basic email validation
-        if re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+        if EMAIL_RE.match(email):
             return email
         return None
 
@@ -223,11 +326,11 @@ class AlumniDataProcessor:
         phone = str(phone).strip()
         
         # Remove common prefixes/suffixes
-        phone = re.sub(r'^(phone|tel|telephone|mobile|cell):\s*', '', phone, flags=re.IGNORECASE)
-        phone = re.sub(r'\s*\(.*\)$', '', phone)
+        phone = PHONE_PREFIX_RE.sub('', phone)
+        phone = PARENTHETICAL_SUFFIX_RE.sub('', phone)
         
         # If it's already in a good format, return as is
-        if re.match(r'^\(\d{3}\)\s\d{3}-\d{4}$', phone):
+        if PHONE_FORMATTED_RE.match(phone):
             return phone
             
         # Try to extract just the digits
@@ -262,13 +365,13 @@ class AlumniDataProcessor:
         # City ST
         
         # First try to match "City, State" or "City, ST" pattern
-        match = re.match(r'^([^,]+),\s*([A-Za-z]{2})(?:\s+\d{5})?$', location)
+        match = CITY_COMMA_STATE_RE.match(location)
         if match:
             city, state = match.groups()
             return f"{city.strip()}, {state.upper()}"
         
         # Try to match "City State" or "City ST" pattern
-        match = re.match(r'^([^,]+)\s+([A-Za-z]{2})(?:\s+\d{5})?$', location)
+        match = CITY_SPACE_STATE_RE.match(location)
         if match:
             city, state = match.groups()
             return f"{city.strip()}, {state.upper()}"
@@ -276,236 +379,248 @@ class AlumniDataProcessor:
         # If we can't parse it, return the original
         return location
 
-    def process_data(self) -> pd.DataFrame:
-        """Process all source sheets and consolidate into a single DataFrame."""
-        # Initialize consolidated DataFrame with default values
-        consolidated = pd.DataFrame(columns=[
-            'name', 'current_role', 'current_company', 'current_industry', 
-            'current_location', 'family_branch', 'graduation_year', 'big_brother',
-            'little_brothers', 'linkedin_url', 'source_sheet', 'has_linkedin', 'scraped', 
-            'manually_verified', 'data_last_updated', 'career_history',
-            'majors', 'minors', 'emails', 'phones'
-        ], dtype=object)
-        
-        # Load master names
-        master_names = self.load_master_names()
-        consolidated['name'] = master_names['name']
-        
-        # Initialize arrays for multi-value fields
-        consolidated['career_history'] = consolidated['career_history'].apply(lambda x: [])
-        consolidated['majors'] = consolidated['majors'].apply(lambda x: [])
-        consolidated['minors'] = consolidated['minors'].apply(lambda x: [])
-        consolidated['emails'] = consolidated['emails'].apply(lambda x: [])
-        consolidated['phones'] = consolidated['phones'].apply(lambda x: [])
-        consolidated['little_brothers'] = consolidated['little_brothers'].apply(lambda x: [])
-        
-        # Process each source sheet
-        for sheet in self.load_source_sheets():
-            # Map columns to standardized names
-            mapped_sheet = self.map_columns(sheet)
+    def standardize_columns(self, mapped_df: pd.DataFrame) -> pd.DataFrame:
+        """Standardize industry, location, email and phone columns of a mapped sheet."""
+        return standardize_sheet(mapped_df, self.industry_categories)
+
+    def merge_sheet(self, engine: ConsolidationEngine, mapped_sheet: pd.DataFrame) -> None:
+        """Fold a mapped, standardized sheet (or chunk of one) into the engine."""
+        # Process each row
+        for row in mapped_sheet.to_dict('records'):
+            name = row['name']
+            if pd.isna(name):
+                continue
+            
+            # Find the matching record, adding a new one if name not found
+            record = engine.get_or_create(name)
+            
+            # Create career history entry
+            career_entry = {
+                'role': row.get('current_role'),
+                'company': row.get('current_company'),
+                'industry': row['current_industry_std'],
+                'location': row['current_location_std'],
+                'date': row.get('sheet_date')
+            }
+            
+            # Only add career entry if we have at least one non-null value
+            if any(v is not None and v != 'Unknown' for v in career_entry.values()):
+                record['career_history'].append(career_entry)
+            
+            # Update current values with most recent data
+            if row.get('current_role') and row.get('current_role') != 'Unknown':
+                record['current_role'] = row['current_role']
+            if row.get('current_company') and row.get('current_company') != 'Unknown':
+                record['current_company'] = row['current_company']
+            if row.get('current_industry') and row.get('current_industry') != 'Unknown':
+                record['current_industry'] = row['current_industry_std']
+            if row.get('current_location') and row.get('current_location') != 'Unknown':
+                record['current_location'] = row['current_location_std']
+            
+            # Update other fields
+            if row.get('family_branch') and row.get('family_branch') != 'Unknown':
+                record['family_branch'] = row['family_branch']
+            if row.get('graduation_year'):
+                record['graduation_year'] = self.standardize_graduation_year(row['graduation_year'])
+            if row.get('big_brother') and row.get('big_brother') != 'Unknown':
+                record['big_brother'] = row['big_brother']
+            if row.get('little_brothers'):
+                littles = [l.strip() for l in str(row['little_brothers']).split(',') if l.strip()]
+                record['little_brothers'].extend(littles)
+            if row.get('linkedin_url'):
+                record['linkedin_url'] = row['linkedin_url']
+                record['has_linkedin'] = True
+            
+            # Update multi-value fields
+            if row.get('majors'):
+                majors = [m.strip() for m in str(row['majors']).split(',') if m.strip()]
+                record['majors'].extend(majors)
+            if row.get('minors'):
+                minors = [m.strip() for m in str(row['minors']).split(',') if m.strip()]
+                record['minors'].extend(minors)
+            if row.get('emails'):
+                email = row['emails_std']
+                if email and email not in record['emails']:
+                    record['emails'].append(email)
+            if row.get('phones'):
+                phone = row['phones_std']
+                if phone and phone not in record['phones']:
+                    record['phones'].append(phone)
             
-            # Process each row
-            for _, row in mapped_sheet.iterrows():
-                name = row['name']
-                if pd.isna(name):
-                    continue
-                
-                # Find matching row in consolidated DataFrame
-                mask = consolidated['name'].str.lower() == name.lower()
-                if not mask.any():
-                    # Add new row if name not found
-                    new_row = pd.Series(index=consolidated.columns)
-                    new_row['name'] = name
-                    new_row['career_history'] = []
-                    new_row['majors'] = []
-                    new_row['minors'] = []
-                    new_row['emails'] = []
-                    new_row['phones'] = []
-                    new_row['little_brothers'] = []
-                    consolidated = pd.concat([consolidated, pd.DataFrame([new_row])], ignore_index=True)
-                    mask = consolidated['name'].str.lower() == name.lower()
-                
-                # Get the index of the matching row
-                idx = mask.idxmax()
-                
-                # Create career history entry
-                career_entry = {
-                    'role': row.get('current_role'),
-                    'company': row.get('current_company'),
-                    'industry': self.standardize_industry(row.get('current_industry')),
-                    'location': self.standardize_location(row.get('current_location')),
-                    'date': row.get('sheet_date')
-                }
-                
-                # Only add career entry if we have at least one non-null value
-                if any(v is not None and v != 'Unknown' for v in career_entry.values()):
-                    consolidated.at[idx, 'career_history'].append(career_entry)
-                
-                # Update current values with most recent data
-                if row.get('current_role') and row.get('current_role') != 'Unknown':
-                    consolidated.at[idx, 'current_role'] = row['current_role']
-                if row.get('current_company') and row.get('current_company') != 'Unknown':
-                    consolidated.at[idx, 'current_company'] = row['current_company']
-                if row.get('current_industry') and row.get('current_industry') != 'Unknown':
-                    consolidated.at[idx, 'current_industry'] = self.standardize_industry(row['current_industry'])
-                if row.get('current_location') and row.get('current_location') != 'Unknown':
-                    consolidated.at[idx, 'current_location'] = self.standardize_location(row['current_location'])
-                
-                # Update other fields
-                if row.get('family_branch') and row.get('family_branch') != 'Unknown':
-                    consolidated.at[idx, 'family_branch'] = row['family_branch']
-                if row.get('graduation_year'):
-                    consolidated.at[idx, 'graduation_year'] = self.standardize_graduation_year(row['graduation_year'])
-                if row.get('big_brother') and row.get('big_brother') != 'Unknown':
-                    consolidated.at[idx, 'big_brother'] = row['big_brother']
-                if row.get('little_brothers'):
-                    littles = [l.strip() for l in str(row['little_brothers']).split(',') if l.strip()]
-                    consolidated.at[idx, 'little_brothers'].extend(littles)
-                if row.get('linkedin_url'):
-                    consolidated.at[idx, 'linkedin_url'] = row['linkedin_url']
-                    consolidated.at[idx, 'has_linkedin'] = True
-                
-                # Update multi-value fields
-                if row.get('majors'):
-                    majors = [m.strip() for m in str(row['majors']).split(',') if m.strip()]
-                    consolidated.at[idx, 'majors'].extend(majors)
-                if row.get('minors'):
-                    minors = [m.strip() for m in str(row['minors']).split(',') if m.strip()]
-                    consolidated.at[idx, 'minors'].extend(minors)
-                if row.get('emails'):
-                    email = self.standardize_email(row['emails'])
-                    if email and email not in consolidated.at[idx, 'emails']:
-                        consolidated.at[idx, 'emails'].append(email)
-                if row.get('phones'):
-                    phone = self.standardize_phone(row['phones'])
-                    if phone and phone not in consolidated.at[idx, 'phones']:
-                        consolidated.at[idx, 'phones'].append(phone)
-                
-                # Update metadata
-                consolidated.at[idx, 'source_sheet'] = row['source_sheet']
-                consolidated.at[idx, 'data_last_updated'] = row.get('sheet_date')
-        
-        # Sort career history by date (most recent first)
-        for idx in consolidated.index:
-            career_history = consolidated.at[idx, 'career_history']
+            # Update metadata
+            record['source_sheet'] = row['source_sheet']
+            record['data_last_updated'] = row.get('sheet_date')
+
+    def sort_career_histories(self, engine: ConsolidationEngine) -> None:
+        """Order career histories (most recent first) and pick current values from them.
+
+        Every history is sorted in one pass on integer date keys (see
+        career_dates), instead of comparing date strings record by record.
+        """
+        histories = [record['career_history'] for record in engine.records]
+        latest_entries = sort_histories(histories)
+        for record, latest in zip(engine.records, latest_entries):
             # Convert all date objects in career_history to ISO strings
-            for entry in career_history:
+            for entry in record['career_history']:
                 if isinstance(entry.get('date'), (datetime, pd.Timestamp)):
                     entry['date'] = entry['date'].date().isoformat() if hasattr(entry['date'], 'date') else entry['date'].isoformat()
                 elif hasattr(entry.get('date'), 'isoformat'):
                     entry['date'] = entry['date'].isoformat()
-            career_history.sort(key=lambda x: x['date'] if x['date'] else '', reverse=True)
-            consolidated.at[idx, 'career_history'] = career_history
             # Set current values from most recent career entry
-            if career_history:
-                latest = career_history[0]
+            if latest is not None:
                 if latest['role']:
-                    consolidated.at[idx, 'current_role'] = latest['role']
+                    record['current_role'] = latest['role']
                 if latest['company']:
-                    consolidated.at[idx, 'current_company'] = latest['company']
+                    record['current_company'] = latest['company']
                 if latest['industry']:
-                    consolidated.at[idx, 'current_industry'] = latest['industry']
+                    record['current_industry'] = latest['industry']
                 if latest['location']:
-                    consolidated.at[idx, 'current_location'] = latest['location']
+                    record['current_location'] = latest['location']
             # Convert data_last_updated to ISO string if it's a date
-            if isinstance(consolidated.at[idx, 'data_last_updated'], (datetime, pd.Timestamp)):
-                consolidated.at[idx, 'data_last_updated'] = consolidated.at[idx, 'data_last_updated'].date().isoformat() if hasattr(consolidated.at[idx, 'data_last_updated'], 'date') else consolidated.at[idx, 'data_last_updated'].isoformat()
-            elif hasattr(consolidated.at[idx, 'data_last_updated'], 'isoformat'):
-                consolidated.at[idx, 'data_last_updated'] = consolidated.at[idx, 'data_last_updated'].isoformat()
-        
-        # Remove duplicates from multi-value fields
-        for field in ['majors', 'minors', 'emails', 'phones', 'little_brothers']:
-            consolidated[field] = consolidated[field].apply(lambda x: list(set(x)) if x else [])
-        
-        return consolidated
-
-    def generate_supabase_import(self, df: pd.DataFrame) -> None:
-        """Generate SQL import statements for Supabase."""
-        # Create SQL file
-        with open('data/processed/supabase_import.sql', 'w') as f:
-            # Write header
-            f.write("-- Generated SQL import statements for Supabase\n\n")
-            
-            # Write INSERT statements
-            for _, row in df.iterrows():
-                # Convert career history to JSONB array
-                career_history = json.dumps(row['career_history']) if row['career_history'] else '[]'
-                
-                # Convert multi-value fields to JSONB arrays
-                majors = json.dumps(row['majors']) if row['majors'] else '[]'
-                minors = json.dumps(row['minors']) if row['minors'] else '[]'
-                emails = json.dumps(row['emails']) if row['emails'] else '[]'
-                phones = json.dumps(row['phones']) if row['phones'] else '[]'
-                little_brothers = json.dumps(row['little_brothers']) if row['little_brothers'] else '[]'
-                
-                # Create INSERT statement
-                sql = f"""INSERT INTO alumni (
-                    name, current_role, current_company, current_industry, 
-                    current_location, family_branch, graduation_year, big_brother,
-                    little_brothers, linkedin_url, source_sheet, has_linkedin, scraped, 
-                    manually_verified, data_last_updated, career_history,
-                    majors, minors, emails, phones
-                ) VALUES (
-                    '{row['name'].replace("'", "''")}',
-                    {f"'{row['current_role'].replace("'", "''")}'" if pd.notna(row['current_role']) else 'NULL'},
-                    {f"'{row['current_company'].replace("'", "''")}'" if pd.notna(row['current_company']) else 'NULL'},
-                    {f"'{row['current_industry'].replace("'", "''")}'" if pd.notna(row['current_industry']) else 'NULL'},
-                    {f"'{row['current_location'].replace("'", "''")}'" if pd.notna(row['current_location']) else 'NULL'},
-                    {f"'{row['family_branch'].replace("'", "''")}'" if pd.notna(row['family_branch']) else 'NULL'},
-                    {f"'{row['graduation_year']}'" if pd.notna(row['graduation_year']) else 'NULL'},
-                    {f"'{row['big_brother'].replace("'", "''")}'" if pd.notna(row['big_brother']) else 'NULL'},
-                    '{little_brothers}'::jsonb,
-                    {f"'{row['linkedin_url'].replace("'", "''")}'" if pd.notna(row['linkedin_url']) else 'NULL'},
-                    {f"'{row['source_sheet'].replace("'", "''")}'" if pd.notna(row['source_sheet']) else 'NULL'},
-                    {str(row['has_linkedin']).lower()},
-                    {str(row['scraped']).lower()},
-                    {str(row['manually_verified']).lower()},
-                    {f"'{row['data_last_updated']}'" if pd.notna(row['data_last_updated']) else 'NULL'},
-                    '{career_history}'::jsonb,
-                    '{majors}'::jsonb,
-                    '{minors}'::jsonb,
-                    '{emails}'::jsonb,
-                    '{phones}'::jsonb
-                ) ON CONFLICT (name) DO UPDATE SET
-                    current_role = EXCLUDED.current_role,
-                    current_company = EXCLUDED.current_company,
-                    current_industry = EXCLUDED.current_industry,
-                    current_location = EXCLUDED.current_location,
-                    family_branch = EXCLUDED.family_branch,
-                    graduation_year = EXCLUDED.graduation_year,
-                    big_brother = EXCLUDED.big_brother,
-                    little_brothers = EXCLUDED.little_brothers,
-                    linkedin_url = EXCLUDED.linkedin_url,
-                    source_sheet = EXCLUDED.source_sheet,
-                    has_linkedin = EXCLUDED.has_linkedin,
-                    scraped = EXCLUDED.scraped,
-                    manually_verified = EXCLUDED.manually_verified,
-                    data_last_updated = EXCLUDED.data_last_updated,
-                    career_history = EXCLUDED.career_history,
-                    majors = EXCLUDED.majors,
-                    minors = EXCLUDED.minors,
-                    emails = EXCLUDED.emails,
-                    phones = EXCLUDED.phones,
-                    updated_at = CURRENT_TIMESTAMP;\n"""
-                
-                f.write(sql)
+            if isinstance(record['data_last_updated'], (datetime, pd.Timestamp)):
+                record['data_last_updated'] = record['data_last_updated'].date().isoformat() if hasattr(record['data_last_updated'], 'date') else record['data_last_updated'].isoformat()
+            elif hasattr(record['data_last_updated'], 'isoformat'):
+                record['data_last_updated'] = record['data_last_updated'].isoformat()
+
+    def dedupe_multi_value_fields(self, engine: ConsolidationEngine) -> None:
+        """Remove duplicates from multi-value fields."""
+        for record in engine.records:
+            for field in ['majors', 'minors', 'emails', 'phones', 'little_brothers']:
+                record[field] = list(set(record[field])) if record[field] else []
+
+    def finalize_records(self, engine: ConsolidationEngine) -> None:
+        """Order career histories, pick current values and dedupe multi-value fields."""
+        with self.report.stage('career_history_sort', rows_in=len(engine)) as stage:
+            self.sort_career_histories(engine)
+            stage.rows_out = len(engine)
+        with self.report.stage('dedupe', rows_in=len(engine)) as stage:
+            self.dedupe_multi_value_fields(engine)
+            stage.rows_out = len(engine)
+
+    def _count_fallbacks(self, sheet: pd.DataFrame) -> None:
+        """Count values the standardizers mapped to 'Other'/'Unknown' or rejected."""
+        for column in COLUMN_STANDARDIZERS:
+            std_column = column + STANDARDIZED_SUFFIX
+            if std_column not in sheet.columns:
+                continue
+            standardized = sheet[std_column]
+            for fallback in ('Other', 'Unknown'):
+                n = (standardized == fallback).sum()
+                if n:
+                    self.report.count('standardizer_fallbacks', f"{column}:{fallback}", n)
+            rejected = (sheet[column].notna() & standardized.isna()).sum()
+            if rejected:
+                self.report.count('standardizer_fallbacks', f"{column}:rejected", rejected)
+
+    def process_data(self, workers: int = 1, chunk_size: Optional[int] = None) -> pd.DataFrame:
+        """Process all source sheets and consolidate into a single DataFrame.
+
+        With chunk_size set, sheets are streamed in chunks of that many rows and
+        each chunk is folded into the consolidated state before the next one is
+        read, so memory no longer grows with the size of individual sheets.
+        """
+        # Seed the consolidation engine with the master names
+        engine = ConsolidationEngine(CONSOLIDATED_COLUMNS)
+        with self.report.stage('load_names') as stage:
+            engine.seed(self.load_master_names()['name'])
+            stage.rows_out = len(engine)
+        
+        # Process each source sheet (columns already mapped to standardized names)
+        if chunk_size:
+            mapped_sheets = self.iter_mapped_chunks(chunk_size)
+        else:
+            mapped_sheets = self.load_mapped_sheets(workers)
+        for mapped_sheet in mapped_sheets:
+            rows = len(mapped_sheet)
+            # Standardize whole columns at once instead of cell by cell
+            with self.report.stage('standardize', rows_in=rows) as stage:
+                standardized = self.standardize_columns(mapped_sheet)
+                stage.rows_out = len(standardized)
+            if self.report.enabled:
+                self._count_fallbacks(standardized)
+                if rows:
+                    self.report.count('sheet_rows', str(standardized['source_sheet'].iat[0]), rows)
+            # rows_out for the merge stage counts the records it added
+            with self.report.stage('merge', rows_in=rows) as stage:
+                before = len(engine)
+                self.merge_sheet(engine, standardized)
+                stage.rows_out = len(engine) - before
+        
+        self.finalize_records(engine)
+        
+        # Build the consolidated DataFrame once from the accumulated records
+        with self.report.stage('build_frame', rows_in=len(engine)) as stage:
+            df = engine.to_frame()
+            stage.rows_out = len(df)
+        return df
+
+    def generate_supabase_import(self, df: pd.DataFrame, export_format: str = 'insert',
+                                 batch_size: int = 500, compress: bool = False) -> None:
+        """Generate SQL import statements for Supabase.
+
+        'insert' writes multi-row upserts of batch_size rows, one transaction per
+        batch. 'copy' writes a COPY data file plus a psql script that merges it
+        through a staging table. compress gzips the generated data.
+        """
+        with self.report.stage('sql_generation', rows_in=len(df)) as stage:
+            stage.rows_out = self._write_supabase_import(df, export_format, batch_size, compress)
+
+    def _write_supabase_import(self, df: pd.DataFrame, export_format: str,
+                               batch_size: int, compress: bool) -> int:
+        suffix = '.gz' if compress else ''
+        script_path = self.processed_dir / 'supabase_import.sql'
+        if export_format == 'insert':
+            script_path = script_path.with_name(script_path.name + suffix)
+            written = write_insert_script(df, script_path, batch_size=batch_size, compress=compress)
+        elif export_format == 'copy':
+            data_path = self.processed_dir / f"alumni_import.tsv{suffix}"
+            written = write_copy_export(df, data_path, script_path, compress=compress)
+        else:
+            raise ValueError(f"Unknown export format: {export_format}")
+        logger.info(f"Wrote {written} alumni to {script_path}")
+        return written
 
 def main():
-    processor = AlumniDataProcessor('data')
+    parser = argparse.ArgumentParser(description='Consolidate alumni source sheets.')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of processes used to parse and map sheets (default: 1)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-parse every sheet instead of using data/processed/.cache')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='Stream sheets in chunks of this many rows to bound memory use')
+    parser.add_argument('--sql-format', choices=EXPORT_FORMATS, default='insert',
+                        help="'insert' for batched upserts, 'copy' for a COPY file and merge script")
+    parser.add_argument('--batch-size', type=int, default=500,
+                        help='Rows per INSERT statement and transaction (default: 500)')
+    parser.add_argument('--gzip', action='store_true',
+                        help='Gzip-compress the generated import data')
+    parser.add_argument('--report', type=Path, default=None,
+                        help='Write a JSON run report with per-stage timings and counters')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Measure peak Python allocations per stage in the run report (slower)')
+    args = parser.parse_args()
+    
+    report = RunReport(trace_memory=args.trace_memory) if args.report else NullReport()
+    processor = AlumniDataProcessor('data', use_cache=not args.no_cache, report=report)
     try:
         # Process the data
-        consolidated_df = processor.process_data()
+        consolidated_df = processor.process_data(workers=args.workers, chunk_size=args.chunk_size)
         
-        # Save processed data
-        consolidated_df.to_csv(processor.processed_dir / 'consolidated_alumni.csv', index=False)
+        # Save processed data: the Parquet snapshot plus the compatibility CSV
+        write_consolidated(consolidated_df, processor.processed_dir)
         
         # Generate Supabase import
-        processor.generate_supabase_import(consolidated_df)
+        processor.generate_supabase_import(consolidated_df, export_format=args.sql_format,
+                                           batch_size=args.batch_size, compress=args.gzip)
         
         logger.info("Data processing completed successfully!")
         
     except Exception as e:
         logger.error(f"Error processing data: {str(e)}")
+        report.fail(e)
+    finally:
+        if args.report:
+            report.write(args.report)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -23,6 +23,8 @@ CREATE TABLE alumni (
     minors TEXT[] DEFAULT ARRAY[]::TEXT[],
     emails TEXT[] DEFAULT ARRAY[]::TEXT[],
     phones TEXT[] DEFAULT ARRAY[]::TEXT[],
+    -- Hash of the synced content, compared by update_supabase.py --sync
+    content_hash TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -0,0 +1,180 @@
+from pathlib import Path
+from typing import Optional
+from datetime import date, datetime, time
+import hashlib
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - the cache is optional
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached representation or the mapping step changes shape
+CACHE_VERSION = '2'
+
+# Parquet schema metadata key holding our own bookkeeping
+_METADATA_KEY = b'alumni_sheet_cache'
+
+
+def _encode_value(value):
+    """Encode one cell of a mixed-type column as type-preserving JSON."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (str, bool, int, float)):
+        return json.dumps(value)
+    if isinstance(value, np.generic):
+        return json.dumps(value.item())
+    if isinstance(value, datetime):
+        return json.dumps({'__datetime__': value.isoformat()})
+    if isinstance(value, date):
+        return json.dumps({'__date__': value.isoformat()})
+    if isinstance(value, time):
+        return json.dumps({'__time__': value.isoformat()})
+    raise TypeError(f"cannot cache value of type {type(value).__name__}")
+
+
+def _decode_value(text):
+    if text is None:
+        return np.nan
+    value = json.loads(text)
+    if isinstance(value, dict):
+        if '__datetime__' in value:
+            return datetime.fromisoformat(value['__datetime__'])
+        if '__date__' in value:
+            return date.fromisoformat(value['__date__'])
+        if '__time__' in value:
+            return time.fromisoformat(value['__time__'])
+    return value
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SheetCache:
+    """Parquet cache of parsed, column-mapped source sheets.
+
+    Entries are keyed by the sheet's content hash, its file name (source_sheet
+    and sheet_date come from the name) and a fingerprint of column_mappings.json,
+    so editing a sheet or the mappings invalidates its entry automatically.
+    """
+
+    def __init__(self, cache_dir: Path, mappings_path: Path, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._keys = {}
+        self.enabled = enabled and pa is not None
+        if enabled and pa is None:
+            logger.warning("pyarrow is not installed; sheet cache disabled")
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.mappings_fingerprint = file_digest(mappings_path)
+
+    def key(self, file: Path) -> str:
+        """Cache key for a source sheet (hashed once per file per run)."""
+        if file not in self._keys:
+            digest = hashlib.sha256()
+            for part in (CACHE_VERSION, self.mappings_fingerprint, file.name, file_digest(file)):
+                digest.update(part.encode('utf-8'))
+                digest.update(b'\0')
+            self._keys[file] = digest.hexdigest()
+        return self._keys[file]
+
+    def _entry_path(self, file: Path) -> Path:
+        return self.cache_dir / f"{file.name}.{self.key(file)[:24]}.parquet"
+
+    def load(self, file: Path) -> Optional[pd.DataFrame]:
+        """Return the cached mapped sheet for a file, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        path = self._entry_path(file)
+        if not path.exists():
+            self.misses += 1
+            logger.info(f"Sheet cache miss: {file.name}")
+            return None
+
+        try:
+            table = pq.read_table(path)
+            metadata = json.loads(table.schema.metadata[_METADATA_KEY])
+            df = table.to_pandas()
+        except Exception as e:
+            self.misses += 1
+            logger.warning(f"Discarding unreadable cache entry {path.name}: {str(e)}")
+            path.unlink(missing_ok=True)
+            return None
+
+        # Parquet has a single null; put back None for the placeholder columns
+        # and NaN everywhere else, exactly as the freshly parsed sheet had them
+        for column in df.columns:
+            if column in metadata['none_columns']:
+                df[column] = pd.Series([None] * len(df), index=df.index, dtype=object)
+            elif column in metadata['encoded_columns']:
+                df[column] = df[column].map(_decode_value).astype(object)
+            elif df[column].dtype == object:
+                df[column] = df[column].where(df[column].notna(), np.nan)
+
+        self.hits += 1
+        logger.info(f"Sheet cache hit: {file.name}")
+        return df
+
+    def store(self, file: Path, df: pd.DataFrame) -> None:
+        """Cache a mapped sheet, replacing older entries for the same file."""
+        if not self.enabled:
+            return
+
+        path = self._entry_path(file)
+        none_columns = [
+            column for column in df.columns
+            if df[column].dtype == object and all(value is None for value in df[column])
+        ]
+        encoded_columns = []
+        try:
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Hand-edited sheets often mix numbers and text in one column;
+                # store those columns as type-tagged JSON strings instead
+                df = df.copy()
+                for column in df.columns:
+                    if df[column].dtype == object and column not in none_columns:
+                        types = {type(v) for v in df[column] if isinstance(v, str) or pd.notna(v)}
+                        if types - {str}:
+                            df[column] = df[column].map(_encode_value)
+                            encoded_columns.append(column)
+                table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError) as e:
+            logger.warning(f"Not caching {file.name}: {str(e)}")
+            return
+
+        metadata = dict(table.schema.metadata or {})
+        metadata[_METADATA_KEY] = json.dumps({
+            'none_columns': none_columns,
+            'encoded_columns': encoded_columns,
+        }).encode('utf-8')
+        table = table.replace_schema_metadata(metadata)
+
+        # Write to a temporary name first so an interrupted run never leaves a torn entry
+        tmp_path = path.with_suffix('.tmp')
+        pq.write_table(table, tmp_path)
+        tmp_path.replace(path)
+
+        # Drop entries for previous versions of the same file
+        for stale in self.cache_dir.glob('*.parquet'):
+            if (stale != path and stale.name.startswith(f"{file.name}.")
+                    and stale.name.count('.') == path.name.count('.')):
+                stale.unlink(missing_ok=True)
@@ -0,0 +1,258 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import ast
+import logging
+import math
+import re
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - the snapshot is optional
+    pa = None
+    pq = None
+
+from consolidation import LIST_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+CSV_NAME = 'consolidated_alumni.csv'
+SNAPSHOT_NAME = 'consolidated_alumni.parquet'
+
+# Bump when the snapshot schema changes shape
+SNAPSHOT_VERSION = '2'
+
+# Parquet schema metadata key holding the snapshot version
+_METADATA_KEY = b'alumni_snapshot'
+
+# Fields of one career_history entry
+CAREER_FIELDS = ['role', 'company', 'industry', 'location', 'date']
+
+# Columns stored as list<string>; source_sheet is multi-valued once sheets are merged
+STRING_LIST_COLUMNS = [c for c in LIST_COLUMNS if c != 'career_history'] + ['source_sheet']
+
+FLAG_COLUMNS = ['has_linkedin', 'scraped', 'manually_verified']
+
+# Columns stored as nullable int32
+INTEGER_COLUMNS = ['graduation_year']
+
+_YEAR_RE = re.compile(r'\b(\d{4})\b')
+
+if pa is not None:
+    CAREER_ENTRY_TYPE = pa.struct([(field, pa.string()) for field in CAREER_FIELDS])
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value))
+
+
+def _text(value: Any) -> Optional[str]:
+    """A scalar cell as text; whole-number floats lose their '.0'."""
+    if _is_missing(value):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _flag(value: Any) -> Optional[bool]:
+    if _is_missing(value):
+        return None
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', '1', 'yes')
+    return bool(value)
+
+
+def _year(value: Any) -> Optional[int]:
+    """A year cell as an int: numbers as they are, text by its first four-digit number."""
+    if _is_missing(value):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    text = str(value).strip()
+    try:
+        number = float(text)
+        return int(number) if number.is_integer() else None
+    except ValueError:
+        match = _YEAR_RE.search(text)
+        return int(match.group(1)) if match else None
+
+
+def _string_items(value: Any) -> Optional[List[str]]:
+    """List cell items as strings; comma-joined text (merge_alumni_data's format) is split."""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [str(item).strip() for item in value if not _is_missing(item) and str(item).strip()]
+    if _is_missing(value):
+        return None
+    return [item.strip() for item in str(value).split(',') if item.strip()]
+
+
+def _career_entries(value: Any) -> Optional[List[Dict[str, Optional[str]]]]:
+    if _is_missing(value):
+        return None
+    entries = []
+    for entry in value:
+        if isinstance(entry, dict):
+            entries.append({field: _text(entry.get(field)) for field in CAREER_FIELDS})
+        else:
+            logger.warning(f"Dropping career_history entry that is not a record: {entry!r}")
+    return entries
+
+
+def to_arrow_table(df: pd.DataFrame) -> 'pa.Table':
+    """Convert a consolidated frame to the typed snapshot schema.
+
+    List columns become list<string>, career_history becomes a list of
+    structs, flags become booleans, graduation_year becomes a nullable int32
+    and every other column is text. A year cell with no year in it is
+    stored as null and counted in a warning.
+    """
+    arrays, fields = [], []
+    for column in df.columns:
+        values = df[column].tolist()
+        if column == 'career_history':
+            array = pa.array([_career_entries(v) for v in values], type=pa.list_(CAREER_ENTRY_TYPE))
+        elif column in STRING_LIST_COLUMNS:
+            array = pa.array([_string_items(v) for v in values], type=pa.list_(pa.string()))
+        elif column in FLAG_COLUMNS:
+            array = pa.array([_flag(v) for v in values], type=pa.bool_())
+        elif column in INTEGER_COLUMNS:
+            years = [_year(v) for v in values]
+            dropped = sum(1 for v, year in zip(values, years) if year is None and not _is_missing(v))
+            if dropped:
+                logger.warning(f"{dropped} {column} values are not years; stored as null")
+            array = pa.array(years, type=pa.int32())
+        else:
+            array = pa.array([_text(v) for v in values], type=pa.string())
+        arrays.append(array)
+        fields.append(pa.field(column, array.type))
+    schema = pa.schema(fields, metadata={_METADATA_KEY: SNAPSHOT_VERSION.encode('utf-8')})
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def from_arrow_table(table: 'pa.Table') -> pd.DataFrame:
+    """Build a frame whose list columns hold Python lists (and dicts for career_history)."""
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if pa.types.is_list(column.type):
+            columns[name] = pd.Series(column.to_pylist(), dtype=object)
+        elif pa.types.is_boolean(column.type):
+            columns[name] = pd.Series(column.to_pylist(), dtype='boolean')
+        elif pa.types.is_integer(column.type):
+            columns[name] = pd.Series(column.to_pylist(), dtype='Int32')
+        else:
+            # Missing scalars read back as NaN, like pd.read_csv gives them
+            series = pd.Series(column.to_pylist(), dtype=object)
+            columns[name] = series.where(series.notna(), np.nan)
+    return pd.DataFrame(columns, columns=table.column_names)
+
+
+def write_snapshot(df: pd.DataFrame, path: Path) -> bool:
+    """Write the typed snapshot; returns False if pyarrow is unavailable."""
+    if pa is None:
+        logger.warning("pyarrow is not installed; not writing the Parquet snapshot")
+        return False
+    table = to_arrow_table(df)
+    # Write to a temporary name first so readers never see a torn snapshot
+    tmp_path = Path(path).with_suffix('.tmp')
+    pq.write_table(table, tmp_path)
+    tmp_path.replace(path)
+    return True
+
+
+def read_snapshot(path: Path) -> pd.DataFrame:
+    table = pq.read_table(path)
+    version = (table.schema.metadata or {}).get(_METADATA_KEY, b'').decode('utf-8')
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} is snapshot version {version or 'unknown'}, expected {SNAPSHOT_VERSION}")
+    return from_arrow_table(table)
+
+
+def write_consolidated(df: pd.DataFrame, processed_dir: Path) -> Path:
+    """Write the compatibility CSV and then the Parquet snapshot next to it.
+
+    The snapshot is written last so it is never older than the CSV it matches.
+    """
+    processed_dir = Path(processed_dir)
+    csv_path = processed_dir / CSV_NAME
+    df.to_csv(csv_path, index=False)
+    if write_snapshot(df, processed_dir / SNAPSHOT_NAME):
+        logger.info(f"Wrote {processed_dir / SNAPSHOT_NAME}")
+    return csv_path
+
+
+class _NanToNone(ast.NodeTransformer):
+    def visit_Name(self, node):
+        return ast.Constant(None) if node.id == 'nan' else node
+
+
+def _literal_with_nan(text: str) -> Any:
+    """ast.literal_eval that also accepts the bare nan pandas writes into list reprs."""
+    return ast.literal_eval(_NanToNone().visit(ast.parse(text, mode='eval')))
+
+
+def _parse_csv_list(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if text.startswith('['):
+        try:
+            parsed = _literal_with_nan(text)
+            if isinstance(parsed, list):
+                return parsed
+        except (ValueError, SyntaxError):
+            pass
+    return _string_items(text)
+
+
+def parse_csv_lists(df: pd.DataFrame) -> pd.DataFrame:
+    """Give a consolidated CSV the snapshot's column types.
+
+    List columns are parsed back into lists, flags become nullable booleans
+    and graduation_year a nullable Int32. Only used when there is no
+    up-to-date snapshot to read instead.
+    """
+    for column in ['career_history'] + STRING_LIST_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map(_parse_csv_list).astype(object)
+    for column in FLAG_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.Series([_flag(v) for v in df[column]], index=df.index, dtype='boolean')
+    for column in INTEGER_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.Series([_year(v) for v in df[column]], index=df.index, dtype='Int32')
+    return df
+
+
+def load_consolidated(processed_dir: Path) -> pd.DataFrame:
+    """Load the consolidated alumni table, preferring the Parquet snapshot.
+
+    The CSV is used when there is no snapshot, pyarrow is missing or the CSV
+    has been modified since the snapshot was written; its columns are given
+    the snapshot's types (see parse_csv_lists) so callers see the same
+    shape and dtypes either way.
+    """
+    processed_dir = Path(processed_dir)
+    csv_path = processed_dir / CSV_NAME
+    snapshot_path = processed_dir / SNAPSHOT_NAME
+    if pa is not None and snapshot_path.exists():
+        if not csv_path.exists() or snapshot_path.stat().st_mtime >= csv_path.stat().st_mtime:
+            try:
+                return read_snapshot(snapshot_path)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable snapshot {snapshot_path}: {str(e)}")
+        else:
+            logger.info(f"{csv_path} is newer than {snapshot_path}; reading the CSV")
+    return parse_csv_lists(pd.read_csv(csv_path))
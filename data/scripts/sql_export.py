@@ -0,0 +1,232 @@
+import gzip
+import json
+import logging
+import math
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, TextIO
+
+import numpy as np
+import pandas as pd
+
+from consolidation import CONSOLIDATED_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Column types of the alumni table in schema.sql
+TEXT_ARRAY_COLUMNS = {'little_brothers', 'majors', 'minors', 'emails', 'phones'}
+JSONB_ARRAY_COLUMNS = {'career_history'}
+BOOLEAN_COLUMNS = {'has_linkedin', 'scraped', 'manually_verified'}
+INTEGER_COLUMNS = {'graduation_year'}
+DATE_COLUMNS = {'data_last_updated'}
+
+EXPORT_FORMATS = ('insert', 'copy')
+
+# Staging table used by the COPY merge script
+STAGING_TABLE = 'alumni_staging'
+_SEQUENCE_COLUMN = 'import_seq'
+
+# Backslash escapes for the COPY text format
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\n': '\\n', '\r': '\\r', '\t': '\\t'})
+
+
+def quote_ident(name: str) -> str:
+    """Quote an identifier (current_role is a reserved word in Postgres)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def is_missing(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return math.isnan(value)
+    return value is pd.NaT or value is pd.NA
+
+
+def _json_safe(value: Any) -> Any:
+    """Make a value JSON-serializable, turning NaN into null."""
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if is_missing(value):
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _text(value: Any) -> str:
+    # Postgres text cannot hold NUL characters
+    return str(value).replace('\x00', '')
+
+
+def _as_list(value: Any) -> list:
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return list(value)
+    return [] if is_missing(value) else [value]
+
+
+def normalize_value(column: str, value: Any) -> Any:
+    """Convert a consolidated value to the Python type of its column, or None."""
+    if column in TEXT_ARRAY_COLUMNS:
+        return [None if is_missing(v) else _text(v) for v in _as_list(value)]
+    if column in JSONB_ARRAY_COLUMNS:
+        return [json.dumps(_json_safe(v), allow_nan=False) for v in _as_list(value)]
+    if is_missing(value):
+        return None
+    if column in BOOLEAN_COLUMNS:
+        if isinstance(value, str):
+            return value.strip().lower() in ('true', 't', 'yes', 'y', '1')
+        return bool(value)
+    if column in INTEGER_COLUMNS:
+        if isinstance(value, (int, np.integer)) or (isinstance(value, float) and value.is_integer()):
+            return int(value)
+        # Leave anything else for the database to cast (or reject)
+        return _text(value)
+    if column in DATE_COLUMNS:
+        if isinstance(value, (datetime, pd.Timestamp)):
+            return value.date().isoformat()
+        if isinstance(value, date):
+            return value.isoformat()
+    return _text(value)
+
+
+def _sql_string(text: str) -> str:
+    return "'" + text.replace("'", "''") + "'"
+
+
+def sql_literal(column: str, value: Any) -> str:
+    """Render a normalized value as a SQL expression of its column type."""
+    if column in TEXT_ARRAY_COLUMNS or column in JSONB_ARRAY_COLUMNS:
+        element_type = 'JSONB' if column in JSONB_ARRAY_COLUMNS else 'TEXT'
+        elements = ', '.join('NULL' if v is None else _sql_string(v) for v in value)
+        return f"ARRAY[{elements}]::{element_type}[]"
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, int):
+        return str(value)
+    return _sql_string(value)
+
+
+def _array_element(text: str) -> str:
+    # Array literal elements are double-quoted with \ and " backslash-escaped
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def copy_field(column: str, value: Any) -> str:
+    """Render a normalized value as one field of a COPY text-format row."""
+    if column in TEXT_ARRAY_COLUMNS or column in JSONB_ARRAY_COLUMNS:
+        text = '{' + ','.join('NULL' if v is None else _array_element(v) for v in value) + '}'
+    elif value is None:
+        return '\\N'
+    elif isinstance(value, bool):
+        text = 't' if value else 'f'
+    else:
+        text = str(value)
+    return text.translate(_COPY_ESCAPES)
+
+
+def iter_export_rows(df: pd.DataFrame, columns: List[str] = CONSOLIDATED_COLUMNS) -> Iterator[Dict[str, Any]]:
+    """Yield each alumnus as a dict of normalized values, skipping unnamed rows."""
+    skipped = 0
+    for values in df[columns].itertuples(index=False, name=None):
+        row = {column: normalize_value(column, value) for column, value in zip(columns, values)}
+        if not row['name']:
+            skipped += 1
+            continue
+        yield row
+    if skipped:
+        logger.warning(f"Skipped {skipped} rows without a name (name is NOT NULL)")
+
+
+def _open_output(path: Path, compress: bool) -> TextIO:
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def _upsert_clause(columns: List[str]) -> str:
+    updates = ',\n    '.join(
+        f"{quote_ident(c)} = EXCLUDED.{quote_ident(c)}" for c in columns if c != 'name'
+    )
+    return f"ON CONFLICT (name) DO UPDATE SET\n    {updates},\n    updated_at = CURRENT_TIMESTAMP"
+
+
+def _write_insert_batch(f: TextIO, batch: Dict[str, Dict[str, Any]], columns: List[str]) -> None:
+    column_list = ', '.join(quote_ident(c) for c in columns)
+    values = ',\n'.join(
+        '(' + ', '.join(sql_literal(c, row[c]) for c in columns) + ')' for row in batch.values()
+    )
+    f.write(f"BEGIN;\nINSERT INTO alumni ({column_list}) VALUES\n{values}\n{_upsert_clause(columns)};\nCOMMIT;\n\n")
+
+
+def write_insert_script(df: pd.DataFrame, path: Path, batch_size: int = 500,
+                        compress: bool = False, columns: List[str] = CONSOLIDATED_COLUMNS) -> int:
+    """Write multi-row upserts of batch_size rows, each in its own transaction.
+
+    Returns the number of rows written.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    written = 0
+    with _open_output(path, compress) as f:
+        f.write("-- Generated SQL import statements for Supabase\n\n")
+        # Keyed by name: one INSERT ... ON CONFLICT cannot touch the same row
+        # twice, so a repeated name within a batch keeps its last version, just
+        # as sequential single-row upserts would
+        batch: Dict[str, Dict[str, Any]] = {}
+        for row in iter_export_rows(df, columns):
+            batch.pop(row['name'], None)
+            batch[row['name']] = row
+            written += 1
+            if len(batch) >= batch_size:
+                _write_insert_batch(f, batch, columns)
+                batch = {}
+        if batch:
+            _write_insert_batch(f, batch, columns)
+    return written
+
+
+def write_copy_export(df: pd.DataFrame, data_path: Path, script_path: Path,
+                      compress: bool = False, columns: List[str] = CONSOLIDATED_COLUMNS) -> int:
+    """Write a COPY text-format data file and a psql script that merges it.
+
+    The script loads the file into a temporary staging table with \\copy and
+    upserts it into alumni in a single transaction. Returns the number of rows.
+    """
+    written = 0
+    with _open_output(data_path, compress) as f:
+        for written, row in enumerate(iter_export_rows(df, columns), start=1):
+            fields = [copy_field(c, row[c]) for c in columns] + [str(written)]
+            f.write('\t'.join(fields) + '\n')
+
+    column_list = ', '.join(quote_ident(c) for c in columns)
+    staging_columns = f"{column_list}, {_SEQUENCE_COLUMN}"
+    source = str(data_path).replace("'", "''")
+    if compress:
+        copy_source = f"PROGRAM 'gzip -dc ''{source}'''"
+    else:
+        copy_source = f"'{source}'"
+
+    with open(script_path, 'w', encoding='utf-8') as f:
+        f.write(
+            "-- Generated Supabase import: run with psql from the repository root\n"
+            f"-- Loads {data_path.name} into a staging table and upserts it into alumni\n\n"
+            "BEGIN;\n\n"
+            f"CREATE TEMP TABLE {STAGING_TABLE} (LIKE alumni INCLUDING DEFAULTS) ON COMMIT DROP;\n"
+            f"ALTER TABLE {STAGING_TABLE} ADD COLUMN {_SEQUENCE_COLUMN} BIGINT;\n\n"
+            f"\\copy {STAGING_TABLE} ({staging_columns}) FROM {copy_source}\n\n"
+            "-- Later rows win when a name appears more than once\n"
+            f"INSERT INTO alumni ({column_list})\n"
+            f"SELECT DISTINCT ON (name) {column_list}\n"
+            f"FROM {STAGING_TABLE}\n"
+            f"ORDER BY name, {_SEQUENCE_COLUMN} DESC\n"
+            f"{_upsert_clause(columns)};\n\n"
+            "COMMIT;\n"
+        )
+    return written
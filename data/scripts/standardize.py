@@ -0,0 +1,213 @@
+import re
+from typing import List, Dict, Optional
+import numpy as np
+import pandas as pd
+
+# Standard industry categories
+INDUSTRY_CATEGORIES = [
+    'Technology', 'Finance', 'Healthcare', 'Marketing',
+    'Consulting', 'Education', 'Government', 'Non-Profit'
+]
+
+# Map common variations to standard categories (checked in order)
+INDUSTRY_MAPPING = {
+    'tech': 'Technology',
+    'software': 'Technology',
+    'it': 'Technology',
+    'finance': 'Finance',
+    'banking': 'Finance',
+    'accounting': 'Finance',
+    'healthcare': 'Healthcare',
+    'medical': 'Healthcare',
+    'health': 'Healthcare',
+    'marketing': 'Marketing',
+    'consulting': 'Consulting',
+    'education': 'Education',
+    'government': 'Government',
+    'non-profit': 'Non-Profit',
+    'nonprofit': 'Non-Profit'
+}
+
+# Precompiled patterns shared by the scalar and column-level standardizers
+LOCATION_PREFIX_RE = re.compile(r'^(apt\.?|apartment|unit|#)\s*[a-z0-9-]+[,\s]*', re.IGNORECASE)
+LOCATION_SUFFIX_RE = re.compile(r'[,\s]+(apt\.?|apartment|unit|#)\s*[a-z0-9-]+$', re.IGNORECASE)
+CITY_COMMA_STATE_RE = re.compile(r'^([^,]+),\s*([A-Za-z]{2})(?:\s+\d{5})?$')
+CITY_SPACE_STATE_RE = re.compile(r'^([^,]+)\s+([A-Za-z]{2})(?:\s+\d{5})?$')
+EMAIL_PREFIX_RE = re.compile(r'^(email|e-mail|mail):\s*', re.IGNORECASE)
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_PREFIX_RE = re.compile(r'^(phone|tel|telephone|mobile|cell):\s*', re.IGNORECASE)
+PHONE_FORMATTED_RE = re.compile(r'^\(\d{3}\)\s\d{3}-\d{4}$')
+PARENTHETICAL_SUFFIX_RE = re.compile(r'\s*\(.*\)$')
+
+# Everything but ASCII digits; non-ASCII phone text falls back to str.isdigit()
+ASCII_NON_DIGIT_RE = re.compile(r'[^0-9]')
+
+# Suffix for the standardized copies of mapped columns
+STANDARDIZED_SUFFIX = '_std'
+
+
+def _empty_like(series: pd.Series, fill) -> pd.Series:
+    return pd.Series([fill] * len(series), index=series.index, dtype=object)
+
+
+def _standardize_distinct(series: pd.Series, transform, missing) -> pd.Series:
+    """Apply a text transform once per distinct value of a column.
+
+    Every standardizer starts from str(value), so values are stringified first and
+    factorized; sheets repeat the same industries, cities and formats heavily, so
+    the transform usually runs over a small fraction of the rows.
+    """
+    result = _empty_like(series, missing)
+    present = series.notna()
+    if not present.any():
+        return result
+
+    codes, uniques = pd.factorize(series[present].astype(str))
+    standardized = transform(pd.Series(uniques, dtype=object))
+    result[present] = np.asarray(standardized, dtype=object)[codes]
+    return result
+
+
+def _format_city_state(text: pd.Series) -> np.ndarray:
+    """Rewrite 'City, ST' / 'City ST' values to 'City, ST', leaving others as-is."""
+    comma = text.str.extract(CITY_COMMA_STATE_RE)
+    space = text.str.extract(CITY_SPACE_STATE_RE)
+    return np.where(
+        comma[0].notna(),
+        comma[0].str.strip() + ', ' + comma[1].str.upper(),
+        np.where(space[0].notna(), space[0].str.strip() + ', ' + space[1].str.upper(), text)
+    )
+
+
+def standardize_industry_column(series: pd.Series, categories: List[str] = INDUSTRY_CATEGORIES,
+                                mapping: Dict[str, str] = INDUSTRY_MAPPING) -> pd.Series:
+    """Column-level equivalent of AlumniDataProcessor.standardize_industry."""
+    def transform(text: pd.Series) -> np.ndarray:
+        lowered = text.str.strip().str.title().str.lower()
+        conditions = (
+            # Exact matches first, then partial matches, then the mapping dictionary
+            [lowered == category.lower() for category in categories]
+            + [lowered.str.contains(category.lower(), regex=False) for category in categories]
+            + [lowered.str.contains(key, regex=False) for key in mapping]
+        )
+        choices = list(categories) + list(categories) + list(mapping.values())
+        return np.select(conditions, choices, default='Other')
+
+    return _standardize_distinct(series, transform, 'Unknown')
+
+
+def _clean_location(text: pd.Series) -> np.ndarray:
+    text = text.str.strip()
+    text = text.str.replace(LOCATION_PREFIX_RE, '', regex=True)
+    text = text.str.replace(LOCATION_SUFFIX_RE, '', regex=True)
+    return _format_city_state(text)
+
+
+def standardize_location_column(series: pd.Series) -> pd.Series:
+    """Column-level equivalent of AlumniDataProcessor.standardize_location."""
+    return _standardize_distinct(series, _clean_location, 'Unknown')
+
+
+def _format_address(text: str) -> str:
+    text = text.strip()
+    match = CITY_COMMA_STATE_RE.match(text) or CITY_SPACE_STATE_RE.match(text)
+    if match:
+        city, state = match.groups()
+        return f"{city.strip()}, {state.upper()}"
+    return text
+
+
+def standardize_address_column(series: pd.Series) -> pd.Series:
+    """Column-level equivalent of AlumniDataProcessor.standardize_address.
+
+    Addresses are mostly distinct, so each distinct value goes through one
+    precompiled match rather than a chain of pandas string operations.
+    """
+    return _standardize_distinct(series, lambda text: [_format_address(t) for t in text], None)
+
+
+def _strip_affixes(text: pd.Series, prefix_re: re.Pattern) -> pd.Series:
+    """Remove a 'label:' prefix and a trailing '(...)' note.
+
+    The regexes only run on values that can match them (a prefix needs a ':' and
+    the suffix needs a closing ')'), which keeps clean values off the slow path.
+    """
+    text = text.copy()
+    has_label = text.str.contains(':', regex=False)
+    if has_label.any():
+        text[has_label] = text[has_label].str.replace(prefix_re, '', regex=True)
+    has_note = text.str.endswith(')')
+    if has_note.any():
+        text[has_note] = text[has_note].str.replace(PARENTHETICAL_SUFFIX_RE, '', regex=True)
+    return text
+
+
+def _clean_email(text: pd.Series) -> np.ndarray:
+    text = _strip_affixes(text.str.strip().str.lower(), EMAIL_PREFIX_RE)
+    return np.where(text.str.match(EMAIL_RE).astype(bool), text, None)
+
+
+def standardize_email_column(series: pd.Series) -> pd.Series:
+    """Column-level equivalent of AlumniDataProcessor.standardize_email."""
+    return _standardize_distinct(series, _clean_email, None)
+
+
+def _digits(text: str) -> str:
+    if text.isascii():
+        return ASCII_NON_DIGIT_RE.sub('', text)
+    return ''.join(filter(str.isdigit, text))
+
+
+def _format_phone(text: str) -> str:
+    text = text.strip()
+    if ':' in text:
+        text = PHONE_PREFIX_RE.sub('', text)
+    if text.endswith(')'):
+        text = PARENTHETICAL_SUFFIX_RE.sub('', text)
+    # Values already in a good format are returned as is
+    if PHONE_FORMATTED_RE.match(text):
+        return text
+    digits = _digits(text)
+    # Exactly 10 digits, or 11 digits starting with a 1
+    if len(digits) == 11 and digits.startswith('1'):
+        digits = digits[1:]
+    elif len(digits) != 10:
+        # If we can't parse it into a standard format, keep the cleaned value
+        return text
+    return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+
+
+def standardize_phone_column(series: pd.Series) -> pd.Series:
+    """Column-level equivalent of AlumniDataProcessor.standardize_phone.
+
+    Phone numbers are nearly all distinct, so like addresses they are
+    formatted one distinct value at a time.
+    """
+    return _standardize_distinct(series, lambda text: [_format_phone(t) for t in text], None)
+
+
+# Mapped column -> column-level standardizer
+COLUMN_STANDARDIZERS = {
+    'current_industry': standardize_industry_column,
+    'current_location': standardize_location_column,
+    'emails': standardize_email_column,
+    'phones': standardize_phone_column,
+}
+
+
+def standardize_sheet(mapped_df: pd.DataFrame,
+                      industry_categories: Optional[List[str]] = None) -> pd.DataFrame:
+    """Add standardized copies of the mapped columns to a sheet.
+
+    Each standardizer runs once over its whole column and the result is stored
+    as '<column>_std', leaving the raw values in place for the merge step.
+    """
+    for column, standardizer in COLUMN_STANDARDIZERS.items():
+        if column not in mapped_df.columns:
+            continue
+        if column == 'current_industry' and industry_categories is not None:
+            standardized = standardizer(mapped_df[column], industry_categories)
+        else:
+            standardized = standardizer(mapped_df[column])
+        mapped_df[column + STANDARDIZED_SUFFIX] = standardized
+    return mapped_df
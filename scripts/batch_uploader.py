@@ -0,0 +1,215 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses that mean "try again later" rather than "this batch is bad"
+TRANSIENT_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Postgres error codes for conflicts and overload that succeed on a retry:
+# serialization failure, deadlock, statement timeout, too many connections
+TRANSIENT_PG_CODES = {'40001', '40P01', '57014', '53300'}
+
+TRANSIENT_MESSAGES = ('timed out', 'timeout', 'too many requests', 'temporarily unavailable',
+                      'connection reset', 'connection refused', 'bad gateway', 'service unavailable')
+
+
+def is_transient(error: BaseException) -> bool:
+    """Guess whether an upload error is worth retrying (overload, timeouts, dropped connections)."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return int(status) in TRANSIENT_STATUSES
+    code = str(getattr(error, 'code', '') or '')
+    if code in TRANSIENT_PG_CODES or code in {str(s) for s in TRANSIENT_STATUSES}:
+        return True
+    # httpx and friends: ReadTimeout, ConnectError, RemoteProtocolError...
+    name = type(error).__name__.lower()
+    if 'timeout' in name or 'connect' in name or 'protocol' in name:
+        return True
+    message = str(error).lower()
+    return any(text in message for text in TRANSIENT_MESSAGES)
+
+
+class UploadStats:
+    """Totals for one upload run."""
+
+    def __init__(self, total_rows: int):
+        self.total_rows = total_rows
+        self.rows_written = 0
+        self.rows_retried = 0
+        self.rows_failed = 0
+        self.batches = 0
+        self.retries = 0
+        self.throttles = 0
+        self.bisections = 0
+        self.seconds = 0.0
+        # (records, error) for every batch that was given up on; single rows when bisecting
+        self.failed_batches: List[Tuple[List[Dict[str, Any]], BaseException]] = []
+
+    def summary(self) -> str:
+        rate = self.rows_written / self.seconds if self.seconds else 0.0
+        return (f"{self.rows_written} of {self.total_rows} rows written in {self.batches} batches "
+                f"({self.seconds:.1f}s, {rate:.0f} rows/s); {self.rows_retried} rows needed a retry "
+                f"({self.retries} retries, {self.throttles} throttles); {self.rows_failed} rows failed "
+                f"({self.bisections} bisections)")
+
+
+class ConcurrentUploader:
+    """Uploads records through a bounded thread pool in adaptively sized batches.
+
+    send(batch) performs one request and raises on failure. Batches are cut to
+    a byte budget that grows while requests come back faster than
+    target_latency and shrinks when they are slower. Transient errors are
+    retried with jittered exponential backoff; each one also halves the number
+    of requests in flight and pauses every worker briefly, and concurrency
+    then creeps back up one request at a time as batches succeed.
+
+    A batch that fails for any other reason (a constraint violation, say) is
+    split in half and each half sent again, recursively, so the good rows still
+    land and every bad row ends up alone in stats.failed_batches with its own
+    error. With bisect=False the whole batch is recorded as failed instead.
+    """
+
+    def __init__(self, send: Callable[[List[Dict[str, Any]]], Any], workers: int = 4,
+                 batch_bytes: int = 256 * 1024, min_batch_bytes: int = 16 * 1024,
+                 max_batch_bytes: int = 2 * 1024 * 1024, max_batch_rows: int = 1000,
+                 target_latency: float = 2.0, max_retries: int = 5, backoff: float = 0.5,
+                 max_backoff: float = 30.0, bisect: bool = True, label: str = 'Uploaded'):
+        self.send = send
+        self.workers = max(1, workers)
+        self.batch_bytes = batch_bytes
+        self.min_batch_bytes = min_batch_bytes
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_rows = max_batch_rows
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.bisect = bisect
+        self.label = label
+
+        self._lock = threading.Lock()
+        self._concurrency = self.workers
+        self._successes = 0
+        self._pause_until = 0.0
+        self.stats = UploadStats(0)
+
+    def _next_batch(self, pending: Deque[Tuple[Dict[str, Any], int]]) -> List[Dict[str, Any]]:
+        """Take records off the queue up to the current byte budget (always at least one)."""
+        batch, size = [], 0
+        while pending and len(batch) < self.max_batch_rows:
+            record, record_bytes = pending[0]
+            if batch and size + record_bytes > self.batch_bytes:
+                break
+            pending.popleft()
+            batch.append(record)
+            size += record_bytes
+        return batch
+
+    def _throttle(self, delay: float) -> None:
+        with self._lock:
+            self.stats.throttles += 1
+            self._pause_until = max(self._pause_until, time.monotonic() + delay)
+            self._concurrency = max(1, self._concurrency // 2)
+            self.batch_bytes = max(self.min_batch_bytes, self.batch_bytes // 2)
+            self._successes = 0
+
+    def _wait_for_pause(self) -> None:
+        while True:
+            with self._lock:
+                remaining = self._pause_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def _record_success(self, batch: List[Dict[str, Any]], latency: float, attempts: int) -> None:
+        with self._lock:
+            self.stats.batches += 1
+            self.stats.rows_written += len(batch)
+            if attempts:
+                self.stats.rows_retried += len(batch)
+            if latency < self.target_latency / 2:
+                self.batch_bytes = min(self.max_batch_bytes, int(self.batch_bytes * 1.25))
+            elif latency > self.target_latency:
+                self.batch_bytes = max(self.min_batch_bytes, self.batch_bytes // 2)
+            # Additive increase: one more request in flight per round of successes
+            self._successes += 1
+            if self._successes >= self._concurrency and self._concurrency < self.workers:
+                self._concurrency += 1
+                self._successes = 0
+            done = self.stats.rows_written + self.stats.rows_failed
+        logger.info(f"{self.label} {done}/{self.stats.total_rows} rows "
+                    f"(batch of {len(batch)} in {latency:.2f}s)")
+
+    def _record_failure(self, batch: List[Dict[str, Any]], error: BaseException) -> None:
+        with self._lock:
+            self.stats.batches += 1
+            self.stats.rows_failed += len(batch)
+            self.stats.failed_batches.append((batch, error))
+        logger.error(f"Batch of {len(batch)} rows failed: {error}")
+
+    def _attempt(self, batch: List[Dict[str, Any]]) -> Optional[BaseException]:
+        """Send a batch, retrying transient errors; returns the error if it still fails."""
+        attempts = 0
+        while True:
+            self._wait_for_pause()
+            start = time.perf_counter()
+            try:
+                self.send(batch)
+            except Exception as e:
+                if attempts < self.max_retries and is_transient(e):
+                    delay = min(self.max_backoff, self.backoff * 2 ** attempts) * random.uniform(0.5, 1.0)
+                    attempts += 1
+                    with self._lock:
+                        self.stats.retries += 1
+                    logger.warning(f"Transient error on a batch of {len(batch)} rows ({e}); "
+                                   f"retry {attempts} of {self.max_retries} in {delay:.1f}s")
+                    self._throttle(delay)
+                    continue
+                if attempts:
+                    with self._lock:
+                        self.stats.rows_retried += len(batch)
+                return e
+            self._record_success(batch, time.perf_counter() - start, attempts)
+            return None
+
+    def _send_with_retries(self, batch: List[Dict[str, Any]]) -> None:
+        error = self._attempt(batch)
+        if error is None:
+            return
+        # Halving cannot get past an outage, only around bad rows
+        if len(batch) == 1 or not self.bisect or is_transient(error):
+            self._record_failure(batch, error)
+            return
+        with self._lock:
+            self.stats.bisections += 1
+        logger.warning(f"Batch of {len(batch)} rows failed ({error}); bisecting to isolate bad rows")
+        middle = len(batch) // 2
+        self._send_with_retries(batch[:middle])
+        self._send_with_retries(batch[middle:])
+
+    def upload(self, records: List[Dict[str, Any]]) -> UploadStats:
+        """Send every record and return the run's stats."""
+        self.stats = UploadStats(len(records))
+        pending = deque((record, len(json.dumps(record, default=str))) for record in records)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = set()
+            while pending or in_flight:
+                while pending and len(in_flight) < self._concurrency:
+                    in_flight.add(pool.submit(self._send_with_retries, self._next_batch(pending)))
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+        self.stats.seconds = time.perf_counter() - start
+        return self.stats
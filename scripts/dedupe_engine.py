@@ -0,0 +1,348 @@
+import ast
+import math
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from functools import lru_cache
+from itertools import combinations
+
+import pandas as pd
+
+# Pairs scoring at least this much are treated as the same person
+DEFAULT_THRESHOLD = 0.85
+
+# Blocks bigger than this are split further (or skipped) to keep the number of
+# compared pairs roughly linear in the number of records
+DEFAULT_MAX_BLOCK_SIZE = 25
+
+# How much each kind of shared contact detail says two records are one person
+EVIDENCE_WEIGHTS = {'email': 0.9, 'phone': 0.8, 'linkedin': 0.95}
+
+PARENTHETICAL_RE = re.compile(r'\(([^)]*)\)')
+NON_WORD_RE = re.compile(r'[^a-z0-9\s]')
+LINKEDIN_HANDLE_RE = re.compile(r'linkedin\.com/in/([^/?#\s]+)', re.IGNORECASE)
+
+_SOUNDEX_CODES = {}
+for _letters, _code in (('bfpv', '1'), ('cgjkqsxz', '2'), ('dt', '3'), ('l', '4'), ('mn', '5'), ('r', '6')):
+    for _letter in _letters:
+        _SOUNDEX_CODES[_letter] = _code
+
+
+def fold_text(text):
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = NON_WORD_RE.sub(' ', text.replace("'", ''))
+    return ' '.join(text.split())
+
+
+def soundex(word):
+    """American Soundex code of a word, e.g. 'Robert' -> 'R163'."""
+    word = ''.join(c for c in fold_text(word) if c.isalpha())
+    if not word:
+        return ''
+    code = word[0].upper()
+    previous = _SOUNDEX_CODES.get(word[0], '')
+    for letter in word[1:]:
+        digit = _SOUNDEX_CODES.get(letter, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w don't separate letters with the same code; vowels do
+        if letter not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def parse_multi_value(value):
+    """Split a list cell (a Python list repr or a comma-separated string) into items."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    text = str(value).strip()
+    if text.startswith('['):
+        try:
+            return [str(v).strip() for v in ast.literal_eval(text) if str(v).strip()]
+        except (ValueError, SyntaxError):
+            text = text.strip('[]')
+    return [item.strip().strip('\'"') for item in text.split(',') if item.strip().strip('\'"')]
+
+
+def parse_year(value):
+    """A graduation year as an int, or None if it isn't a plain number."""
+    try:
+        year = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(year) if math.isfinite(year) else None
+
+
+def name_parts(name):
+    """Split a name into given names (first name and any '(nickname)'), middle initials and surname."""
+    name = str(name)
+    nicknames = [fold_text(n) for n in PARENTHETICAL_RE.findall(name) if fold_text(n)]
+    tokens = fold_text(PARENTHETICAL_RE.sub(' ', name)).split()
+    if not tokens:
+        return [], [], ''
+    if len(tokens) == 1:
+        return nicknames, [], tokens[0]
+    given = [tokens[0]] + nicknames
+    middles = [t[0] for t in tokens[1:-1]]
+    return given, middles, tokens[-1]
+
+
+class DedupeRecord:
+    """Features of one alumnus, computed once and reused for every comparison."""
+
+    __slots__ = ('index', 'name', 'full_form', 'reduced_forms', 'middles', 'surname', 'given',
+                 'emails', 'phones', 'linkedin', 'graduation_year')
+
+    def __init__(self, index, row):
+        self.index = index
+        self.name = row.get('name')
+        self.given, self.middles, self.surname = name_parts(self.name)
+        # The name as written, and the shorter ways it might also appear:
+        # first name or nickname plus surname, without middle names
+        self.full_form = fold_text(PARENTHETICAL_RE.sub(' ', str(self.name)))
+        self.reduced_forms = {f"{g} {self.surname}" for g in self.given} - {self.full_form}
+        self.emails = {e.lower() for e in parse_multi_value(row.get('emails')) if '@' in e}
+        self.phones = set()
+        for phone in parse_multi_value(row.get('phones')):
+            digits = re.sub(r'\D', '', phone)
+            if len(digits) >= 10:
+                self.phones.add(digits[-10:])
+        match = LINKEDIN_HANDLE_RE.search(str(row.get('linkedin_url') or ''))
+        self.linkedin = match.group(1).lower().rstrip('/') if match else None
+        self.graduation_year = parse_year(row.get('graduation_year'))
+
+    def blocking_keys(self):
+        keys = set()
+        surname_code = soundex(self.surname)
+        if surname_code:
+            for given in self.given or ['']:
+                keys.add(f"name:{surname_code}:{given[:1]}")
+        keys.update(f"email:{e}" for e in self.emails)
+        keys.update(f"phone:{p}" for p in self.phones)
+        if self.linkedin:
+            keys.add(f"linkedin:{self.linkedin}")
+        return keys
+
+    def refined_keys(self, key):
+        """Narrower keys for a record in an oversized name block: one per phonetic given name."""
+        initial = key.rsplit(':', 1)[-1]
+        return {f"{key}:{soundex(g)}" for g in self.given if g[:1] == initial} or {key}
+
+
+@lru_cache(maxsize=1 << 18)
+def _similar(a, b):
+    # Names repeat a lot across pairs, so the ratio is cached
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def _at_least(a, b, bound):
+    """Whether _similar(a, b) >= bound, using the cheap upper bounds first."""
+    matcher = SequenceMatcher(None, a, b)
+    return matcher.real_quick_ratio() >= bound and matcher.quick_ratio() >= bound and _similar(a, b) >= bound
+
+
+def shared_contacts(a, b):
+    """Contact details two records have in common, with their evidence weights."""
+    shared = {}
+    if a.emails & b.emails:
+        shared['email'] = EVIDENCE_WEIGHTS['email']
+    if a.phones & b.phones:
+        shared['phone'] = EVIDENCE_WEIGHTS['phone']
+    if a.linkedin and a.linkedin == b.linkedin:
+        shared['linkedin'] = EVIDENCE_WEIGHTS['linkedin']
+    return shared
+
+
+def name_conflict(a, b):
+    """Why two names can't belong to one person, or None if they might."""
+    if a.graduation_year and b.graduation_year and a.graduation_year != b.graduation_year:
+        return 'graduation_year'
+    # "David K. Johnson" and "David M. Johnson" are probably different people
+    if a.middles and b.middles and a.middles != b.middles:
+        return 'middle_initial'
+    if a.given and b.given:
+        # Given names (nicknames included) must overlap, or be a prefix or
+        # close spelling of one another: Roy ~ Roy, Kev ~ Kevin, Jon ~ John
+        if not any(x == y or x.startswith(y) or y.startswith(x) or _at_least(x, y, 0.75)
+                   for x in a.given for y in b.given):
+            return 'given_name'
+    return None
+
+
+def name_similarity(a, b):
+    """Similarity of two names from 0 to 1.
+
+    Matches that only hold after dropping a middle name or swapping in a
+    nickname score a little lower than matches on the name as written.
+    """
+    if a.full_form == b.full_form:
+        return 1.0
+    best = _similar(a.full_form, b.full_form)
+    for form_a in a.reduced_forms | {a.full_form}:
+        for form_b in b.reduced_forms | {b.full_form}:
+            if form_a in a.reduced_forms or form_b in b.reduced_forms:
+                best = max(best, 0.9 * (1.0 if form_a == form_b else _similar(form_a, form_b)))
+    return best
+
+
+def score_pair(a, b):
+    """Confidence that two records are the same person, with the evidence behind it."""
+    evidence = shared_contacts(a, b)
+    conflict = name_conflict(a, b)
+    if conflict and not evidence:
+        return 0.0, {'conflict': conflict}
+
+    similarity = name_similarity(a, b)
+    if similarity >= 0.6:
+        evidence['name'] = round(similarity, 3)
+
+    # Treat each piece of evidence as independent
+    doubt = 1.0
+    for weight in evidence.values():
+        doubt *= 1.0 - weight
+    return 1.0 - doubt, evidence
+
+
+def build_blocks(records, max_block_size=DEFAULT_MAX_BLOCK_SIZE, stats=None):
+    """Group record positions by blocking key, splitting or dropping oversized blocks."""
+    blocks = {}
+    for position, record in enumerate(records):
+        for key in record.blocking_keys():
+            blocks.setdefault(key, []).append(position)
+
+    result = []
+    for key, members in blocks.items():
+        if len(members) < 2:
+            continue
+        if len(members) <= max_block_size:
+            result.append(members)
+            continue
+        # Common surname + initial: split on the phonetic given names as well.
+        # A contact detail shared by that many records identifies nobody.
+        sub_blocks = {}
+        if key.startswith('name:'):
+            for position in members:
+                for sub_key in records[position].refined_keys(key):
+                    sub_blocks.setdefault(sub_key, []).append(position)
+        else:
+            sub_blocks[key] = members
+        for sub_members in sub_blocks.values():
+            if 2 <= len(sub_members) <= max_block_size:
+                result.append(sub_members)
+            elif len(sub_members) > max_block_size and stats is not None:
+                stats['skipped_blocks'] = stats.get('skipped_blocks', 0) + 1
+                stats['skipped_records'] = stats.get('skipped_records', 0) + len(sub_members)
+    return result
+
+
+class _DisjointSet:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            # Keep the earliest record as the root so clusters are stable
+            if b < a:
+                a, b = b, a
+            self.parent[b] = a
+
+
+def find_duplicate_clusters(df, threshold=DEFAULT_THRESHOLD, max_block_size=DEFAULT_MAX_BLOCK_SIZE,
+                            stats=None):
+    """Find groups of rows that look like the same alumnus.
+
+    Rows are only compared within blocks that share a phonetic surname and
+    first initial (the nickname in "Chungin (Roy) Lee" counts as a first name),
+    an email, a phone number or a LinkedIn handle, so the work grows with the
+    number of rows rather than its square. Returns one dict per cluster of two
+    or more rows, in order of first appearance, with the row labels, names,
+    the lowest confidence among its joining pairs, and those pairs.
+    """
+    stats = stats if stats is not None else {}
+    records = [DedupeRecord(index, row) for index, row in zip(df.index, df.to_dict('records'))]
+
+    blocks = build_blocks(records, max_block_size, stats)
+    seen_pairs = set()
+    matches = []
+    for members in blocks:
+        for a, b in combinations(members, 2):
+            pair = (a, b) if a < b else (b, a)
+            if pair in seen_pairs:
+                continue
+            seen_pairs.add(pair)
+            confidence, evidence = score_pair(records[a], records[b])
+            if confidence >= threshold:
+                matches.append((pair, confidence, evidence))
+    stats.update({'records': len(records), 'blocks': len(blocks), 'pairs_scored': len(seen_pairs),
+                  'pairs_matched': len(matches)})
+
+    # Join the most confident pairs first, and never join two clusters that
+    # contain a pair of records that conflict (e.g. "Alex Nguyen" and "Kevin
+    # Nguyen" linked only through "Alex (Kev) Nguyen")
+    matches.sort(key=lambda match: (-match[1], match[0]))
+    groups = _DisjointSet(len(records))
+    cluster_members = {}
+    joined = []
+    for (a, b), confidence, evidence in matches:
+        root_a, root_b = groups.find(a), groups.find(b)
+        if root_a == root_b:
+            joined.append(((a, b), confidence, evidence))
+            continue
+        members_a = cluster_members.get(root_a, [a])
+        members_b = cluster_members.get(root_b, [b])
+        if any(name_conflict(records[x], records[y]) and not shared_contacts(records[x], records[y])
+               for x in members_a for y in members_b):
+            stats['pairs_rejected'] = stats.get('pairs_rejected', 0) + 1
+            continue
+        groups.union(a, b)
+        cluster_members.pop(root_a, None)
+        cluster_members.pop(root_b, None)
+        cluster_members[groups.find(a)] = members_a + members_b
+        joined.append(((a, b), confidence, evidence))
+
+    clusters = {}
+    for (a, b), confidence, evidence in joined:
+        cluster = clusters.setdefault(groups.find(a), {'confidence': 1.0, 'pairs': []})
+        cluster['confidence'] = min(cluster['confidence'], confidence)
+        cluster['pairs'].append({
+            'a': records[a].name, 'b': records[b].name,
+            'confidence': round(confidence, 3), 'evidence': evidence,
+        })
+
+    members = {}
+    for position in range(len(records)):
+        root = groups.find(position)
+        if root in clusters:
+            members.setdefault(root, []).append(position)
+
+    result = []
+    for root in sorted(clusters):
+        positions = members[root]
+        result.append({
+            'rows': [records[p].index for p in positions],
+            'names': [records[p].name for p in positions],
+            'confidence': round(clusters[root]['confidence'], 3),
+            'pairs': clusters[root]['pairs'],
+        })
+    return result
+
+
+def cluster_labels(df, clusters):
+    """Map each row label to the label of the first row in its cluster (or itself)."""
+    labels = pd.Series(df.index, index=df.index)
+    for cluster in clusters:
+        labels.loc[cluster['rows']] = cluster['rows'][0]
+    return labels
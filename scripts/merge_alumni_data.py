@@ -1,8 +1,18 @@
 import pandas as pd
 import os
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
+from concurrent.futures import ProcessPoolExecutor
+import argparse
 import re
+import sys
+
+# Shared pipeline helpers live next to column_mappings.json in data/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data' / 'scripts'))
+
+from chunked_reader import read_csv_chunks
+from column_resolver import ColumnResolver
+from snapshot import write_consolidated
 
 # Define the categories we want to track
 CATEGORIES = [
@@ -84,15 +94,21 @@ def extract_graduation_year(text):
         return years[0]
     return None
 
+# Compiled once; sheets with the same headers resolve from its memo
+COLUMN_RESOLVER = ColumnResolver(COLUMN_MAPPINGS, mode='substring')
+
+def resolve_columns(df_columns):
+    """Resolve the sheet's columns, returning the mapping and any ambiguous headers."""
+    return COLUMN_RESOLVER.resolve(df_columns)
+
 def get_column_mapping(df_columns):
     """Create a mapping of our categories to the sheet's columns."""
-    mapping = {}
-    for category, possible_columns in COLUMN_MAPPINGS.items():
-        # Find all matching columns in the dataframe
-        matches = [col for col in df_columns if any(pc.lower() in col.lower() for pc in possible_columns)]
-        if matches:
-            mapping[category] = matches
-    return mapping
+    return resolve_columns(df_columns).mapping
+
+def report_ambiguous_columns(ambiguous):
+    """Print headers that matched more than one category."""
+    for column, categories in ambiguous.items():
+        print(f"  Column '{column}' matches several categories: {', '.join(categories)}")
 
 def process_form1(df):
     """Process form1.csv specific formatting."""
@@ -110,9 +126,12 @@ def process_form1(df):
     
     return df
 
-def process_mf_form2(df):
-    """Process MF-Form2_2021-07-01.csv specific formatting."""
-    current_industry = None
+def split_mf_form2_rows(df, current_industry=None):
+    """Attach the industry from header rows to the rows below them.
+
+    Returns the alumni rows and the industry in effect after the last row, so a
+    sheet streamed in chunks can carry the industry into the next chunk.
+    """
     processed_rows = []
     
     for _, row in df.iterrows():
@@ -131,6 +150,11 @@ def process_mf_form2(df):
         new_row['current_industry'] = current_industry
         processed_rows.append(new_row)
     
+    return processed_rows, current_industry
+
+def process_mf_form2(df):
+    """Process MF-Form2_2021-07-01.csv specific formatting."""
+    processed_rows, _ = split_mf_form2_rows(df)
     return pd.DataFrame(processed_rows)
 
 def process_form5(df):
@@ -143,8 +167,19 @@ def process_form5(df):
     
     return df
 
-def process_sheet(file_path, master_df):
-    """Process a single sheet file and merge its data with the master dataframe."""
+def parse_sheet_date(file_path):
+    """Get the sheet date from a filename like 'MF-Form2_2021-07-01.csv', or None."""
+    try:
+        return datetime.strptime(Path(file_path).stem.split('_')[-1], '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+def sheet_sort_key(file_path):
+    """Order sheets by sheet date (undated first), then filename."""
+    return (parse_sheet_date(file_path) or date.min, os.path.basename(file_path))
+
+def load_sheet(file_path):
+    """Read a sheet, apply its form-specific transforms and map its columns."""
     print(f"Processing {file_path}...")
     
     # Read the sheet
@@ -163,8 +198,41 @@ def process_sheet(file_path, master_df):
         df = process_form5(df)
     
     # Get column mapping
-    column_mapping = get_column_mapping(df.columns)
+    resolution = resolve_columns(df.columns)
+    report_ambiguous_columns(resolution.ambiguous)
+    
+    return df, resolution.mapping
+
+def iter_sheet_chunks(file_path, chunk_size):
+    """Like load_sheet, but yield the sheet in chunks of at most chunk_size rows."""
+    print(f"Streaming {file_path} in chunks of {chunk_size} rows...")
     
+    filename = os.path.basename(file_path)
+    current_industry = None
+    reported = set()
+    for df in read_csv_chunks(file_path, chunk_size):
+        # Clean column names
+        df.columns = [col.strip() for col in df.columns]
+        
+        # Apply specific processing based on filename
+        if filename == 'form1.csv':
+            df = process_form1(df)
+        elif filename == 'MF-Form2_2021-07-01.csv':
+            # Industry header rows can sit in an earlier chunk than their alumni
+            processed_rows, current_industry = split_mf_form2_rows(df, current_industry)
+            df = pd.DataFrame(processed_rows)
+        elif filename == 'form5.csv':
+            df = process_form5(df)
+        
+        resolution = resolve_columns(df.columns)
+        # Every chunk of a sheet shares its headers; report them once
+        if tuple(df.columns) not in reported:
+            reported.add(tuple(df.columns))
+            report_ambiguous_columns(resolution.ambiguous)
+        yield df, resolution.mapping
+
+def merge_sheet(df, column_mapping, file_path, master_df):
+    """Merge a loaded sheet's rows into the master dataframe."""
     # Process each row
     for _, row in df.iterrows():
         name = clean_name(row.get('name', row.get('Name', row.get('Name (or industry)'))))
@@ -223,7 +291,19 @@ def process_sheet(file_path, master_df):
     
     return master_df
 
+def process_sheet(file_path, master_df):
+    """Process a single sheet file and merge its data with the master dataframe."""
+    df, column_mapping = load_sheet(file_path)
+    return merge_sheet(df, column_mapping, file_path, master_df)
+
 def main():
+    parser = argparse.ArgumentParser(description='Merge alumni sheets into consolidated_alumni.csv.')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of processes used to read and normalize sheets (default: 1)')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='Stream sheets in chunks of this many rows to bound memory use')
+    args = parser.parse_args()
+    
     # Create output directory if it doesn't exist
     output_dir = Path('data/processed')
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -236,16 +316,31 @@ def main():
         if category not in master_df.columns:
             master_df[category] = None
     
-    # Process all sheet files except form5.csv
+    # Process all sheet files except form5.csv, in a fixed order so the
+    # result doesn't depend on directory listing or worker scheduling
     sheets_dir = Path('data/raw/sheets')
-    for file_path in sheets_dir.glob('*.csv'):
-        if os.path.basename(file_path) == 'form5.csv':
-            continue
-        master_df = process_sheet(file_path, master_df)
+    files = sorted(
+        (file_path for file_path in sheets_dir.glob('*.csv') if os.path.basename(file_path) != 'form5.csv'),
+        key=sheet_sort_key
+    )
+    
+    if args.chunk_size:
+        # Stream each sheet so only one chunk is held in memory at a time
+        for file_path in files:
+            for df, column_mapping in iter_sheet_chunks(file_path, args.chunk_size):
+                master_df = merge_sheet(df, column_mapping, file_path, master_df)
+    elif args.workers > 1 and len(files) > 1:
+        # Read and normalize sheets in parallel; executor.map keeps input order
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(files))) as pool:
+            loaded = list(pool.map(load_sheet, files))
+        for file_path, (df, column_mapping) in zip(files, loaded):
+            master_df = merge_sheet(df, column_mapping, file_path, master_df)
+    else:
+        for file_path in files:
+            master_df = process_sheet(file_path, master_df)
     
-    # Save the consolidated file
-    output_path = output_dir / 'consolidated_alumni.csv'
-    master_df.to_csv(output_path, index=False)
+    # Save the consolidated file and its Parquet snapshot
+    output_path = write_consolidated(master_df, output_dir)
     print(f"Consolidated data saved to {output_path}")
 
 if __name__ == "__main__":
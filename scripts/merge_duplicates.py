@@ -1,56 +1,138 @@
 import pandas as pd
+import argparse
+import json
 import re
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
 
+# Shared pipeline helpers live in data/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data' / 'scripts'))
+
+from snapshot import load_consolidated, write_consolidated
+from dedupe_engine import DEFAULT_THRESHOLD, find_duplicate_clusters, cluster_labels
+
+
+PROCESSED_DIR = Path('data/processed')
 
 # This function merges information from duplicate entries into a single entry, like names with different whitespace.
 def normalize_name(name):
     # Remove extra whitespace and standardize spacing
     return re.sub(r'\s+', ' ', str(name).strip())
 
-def merge_duplicates():
+# Columns that keep the first non-null value in a group
+FIRST_VALUE_COLUMNS = [
+    'current_role', 'current_company', 'current_industry', 'current_location', 'family_branch',
+    'graduation_year', 'big_brother', 'linkedin_url'
+]
+
+# Flag columns: true if any row in the group is
+FLAG_COLUMNS = ['has_linkedin', 'scraped', 'manually_verified']
+
+# List columns whose distinct items are pooled across a group
+MULTI_VALUE_COLUMNS = [
+    'little_brothers', 'source_sheet', 'career_history', 'majors', 'minors', 'emails', 'phones'
+]
+
+# Output column order of the merged file
+MERGED_COLUMNS = [
+    'name', 'current_role', 'current_company', 'current_industry', 'current_location',
+    'family_branch', 'graduation_year', 'big_brother', 'little_brothers', 'linkedin_url',
+    'source_sheet', 'has_linkedin', 'scraped', 'manually_verified', 'career_history',
+    'majors', 'minors', 'emails', 'phones'
+]
+
+class StageTimer:
+    """Collects wall time per stage for the summary printed at the end."""
+    def __init__(self):
+        self.stages = []
+    
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+    
+    def print_summary(self):
+        print("\nTiming:")
+        for name, seconds in self.stages:
+            print(f"  {name:<20}{seconds:>8.3f}s")
+        print(f"  {'total':<20}{sum(seconds for _, seconds in self.stages):>8.3f}s")
+
+def pool_items(df, key, column):
+    """Distinct items of a list column per group, in order of first appearance."""
+    items = df.loc[df[column].notna(), [key, column]].explode(column)
+    items = items[items[column].notna()]
+    # career_history items are dicts, so compare items by their repr
+    seen = pd.DataFrame({key: items[key], 'item': items[column].map(repr)}).duplicated()
+    items = items[~seen.to_numpy()]
+    return items.groupby(key, sort=False)[column].agg(list)
+
+def merge_groups(df, key, timings):
+    """Merge the rows of each group into one row, one column type at a time."""
+    with timings.stage('first values'):
+        grouped = df.groupby(key)
+        merged_df = grouped[FIRST_VALUE_COLUMNS].first()
+        # The first name variation as written, even if it is missing
+        merged_df.insert(0, 'name', df.drop_duplicates(key).set_index(key)['name'])
+    
+    with timings.stage('flags'):
+        merged_df[FLAG_COLUMNS] = grouped[FLAG_COLUMNS].max()
+    
+    with timings.stage('multi-value pooling'):
+        for column in MULTI_VALUE_COLUMNS:
+            pooled = pool_items(df, key, column).reindex(merged_df.index)
+            merged_df[column] = [items if isinstance(items, list) else [] for items in pooled]
+    
+    return merged_df[MERGED_COLUMNS].reset_index(drop=True)
+
+def merge_duplicates(threshold=DEFAULT_THRESHOLD, exact=False, clusters_path='data/processed/duplicate_clusters.json'):
+    timings = StageTimer()
+    
     # Read the consolidated data
-    df = pd.read_csv('data/processed/consolidated_alumni.csv')
+    with timings.stage('read'):
+        df = load_consolidated(PROCESSED_DIR)
     
     # Create a normalized name column for comparison
     df['normalized_name'] = df['name'].apply(normalize_name)
     
+    if not exact:
+        # Fuzzy matching: rows in the same cluster share the normalized name of
+        # the cluster's first row, so they group together below
+        with timings.stage('fuzzy clustering'):
+            clusters = find_duplicate_clusters(df, threshold=threshold)
+        df['normalized_name'] = cluster_labels(df, clusters).map(df['normalized_name'])
+        with open(clusters_path, 'w') as f:
+            json.dump(clusters, f, indent=2, default=str)
+        print(f"Wrote {len(clusters)} duplicate clusters to {clusters_path}")
+        confidence = {df.at[c['rows'][0], 'normalized_name']: c['confidence'] for c in clusters}
+    else:
+        confidence = {}
+    
     # Find duplicates based on normalized names
     duplicates = df[df.duplicated(subset=['normalized_name'], keep=False)]
     
     if not duplicates.empty:
         print("Found duplicate entries:")
         for name in duplicates['normalized_name'].unique():
-            print(f"\nVariations of '{name}':")
+            if name in confidence:
+                print(f"\nVariations of '{name}' (confidence {confidence[name]:.2f}):")
+            else:
+                print(f"\nVariations of '{name}':")
             variations = df[df['normalized_name'] == name]
             for _, row in variations.iterrows():
                 print(f"  - '{row['name']}'")
         
         # Group by normalized name and merge rows
-        merged_df = df.groupby('normalized_name').agg({
-            'name': lambda x: x.iloc[0],  # Keep the first name variation
-            'current_role': lambda x: next((v for v in x if pd.notna(v)), None),
-            'current_company': lambda x: next((v for v in x if pd.notna(v)), None),
-            'current_industry': lambda x: next((v for v in x if pd.notna(v)), None),
-            'current_location': lambda x: next((v for v in x if pd.notna(v)), None),
-            'family_branch': lambda x: next((v for v in x if pd.notna(v)), None),
-            'graduation_year': lambda x: next((v for v in x if pd.notna(v)), None),
-            'big_brother': lambda x: next((v for v in x if pd.notna(v)), None),
-            'little_brothers': lambda x: list(set([item for sublist in x if pd.notna(sublist) for item in str(sublist).split(',')])),
-            'linkedin_url': lambda x: next((v for v in x if pd.notna(v)), None),
-            'source_sheet': lambda x: list(set([item for sublist in x if pd.notna(sublist) for item in str(sublist).split(',')])),
-            'has_linkedin': 'max',
-            'scraped': 'max',
-            'manually_verified': 'max',
-            'career_history': lambda x: list(set([item for sublist in x if pd.notna(sublist) for item in str(sublist).split(',')])),
-            'majors': lambda x: list(set([item for sublist in x if pd.notna(sublist) for item in str(sublist).split(',')])),
-            'minors': lambda x: list(set([item for sublist in x if pd.notna(sublist) for item in str(sublist).split(',')])),
-            'emails': lambda x: list(set([item for sublist in x if pd.notna(sublist) for item in str(sublist).split(',')])),
-            'phones': lambda x: list(set([item for sublist in x if pd.notna(sublist) for item in str(sublist).split(',')]))
-        }).reset_index(drop=True)
+        merged_df = merge_groups(df, 'normalized_name', timings)
         
         # Save the merged data
-        merged_df.to_csv('data/processed/consolidated_alumni.csv', index=False)
-        print("\nMerged duplicates and saved to consolidated_alumni.csv")
+        with timings.stage('write'):
+            write_consolidated(merged_df, PROCESSED_DIR)
+        print("\nMerged duplicates and saved to consolidated_alumni.csv and consolidated_alumni.parquet")
         
         # Print summary
         print(f"\nOriginal number of entries: {len(df)}")
@@ -58,6 +140,14 @@ def merge_duplicates():
         print(f"Removed {len(df) - len(merged_df)} duplicate entries")
     else:
         print("No duplicates found!")
+    
+    timings.print_summary()
 
 if __name__ == "__main__":
-    merge_duplicates() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Merge duplicate alumni in consolidated_alumni.csv.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Minimum match confidence for fuzzy duplicates (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--exact', action='store_true',
+                        help='Only merge names that match after collapsing whitespace')
+    args = parser.parse_args()
+    merge_duplicates(threshold=args.threshold, exact=args.exact)
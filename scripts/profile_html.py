@@ -0,0 +1,386 @@
+"""Offline extraction of scraped fields from saved LinkedIn profile pages.
+
+With --save-html the scraper keeps each profile page's HTML as
+data/profile_html/<alumni id>.html.gz. This module rebuilds experiences,
+companies, current_location and bio from those files without a browser or
+any network requests, spread over a process pool,
+and writes them into the alumni_mega.json snapshot:
+
+    python scripts/profile_html.py [--html-dir data/profile_html] [--workers N]
+
+so a parser fix can be applied to every stored profile in one run.
+"""
+import argparse
+import gzip
+import html as html_lib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Shared pipeline helpers live in data/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data' / 'scripts'))
+
+from career_dates import annotate_experiences
+from profile_text import DATE_RANGE_RE, EMPLOYMENT_TYPES, SINGLE_DATE_RE, clean_text, clean_company_name
+from scrape_journal import SNAPSHOT_PATH, ProfileIndex
+
+HTML_DIR = Path('data/profile_html')
+
+# Fields rebuilt from the HTML; everything else in a snapshot record is left alone
+EXTRACTED_FIELDS = ['experiences', 'companies', 'current_location', 'bio']
+
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+              'source', 'track', 'wbr'}
+
+_WORKPLACE_TYPES = ('On-site', 'Remote', 'Hybrid')
+
+# A comment, a start or end tag (attributes may quote '>'), a run of text, or a stray '<'
+_TOKEN_RE = re.compile(r'<!--.*?-->|<(/?)([a-zA-Z][\w:-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>|([^<]+)|<',
+                       re.DOTALL)
+_ATTR_RE = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+
+
+# First line of a saved page: the profile URL, for matching snapshot records without an id
+_URL_COMMENT_RE = re.compile(r'<!-- linkedin_url: (.*?) -->\n')
+
+
+def save_profile_html(profile_id: str, html: str, html_dir: Path = HTML_DIR,
+                      linkedin_url: Optional[str] = None) -> Path:
+    """Store one profile page compressed, replacing any earlier copy atomically."""
+    html_dir = Path(html_dir)
+    html_dir.mkdir(parents=True, exist_ok=True)
+    path = html_dir / f"{profile_id}.html.gz"
+    tmp_path = path.with_suffix('.tmp')
+    with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        if linkedin_url:
+            f.write(f"<!-- linkedin_url: {linkedin_url} -->\n")
+        f.write(html)
+    tmp_path.replace(path)
+    return path
+
+
+class _Node:
+    __slots__ = ('tag', 'attrs', 'children', 'parent')
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional['_Node']):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List[Any] = []
+        self.parent = parent
+
+    def iter(self) -> Iterator['_Node']:
+        """This node and every element below it, in document order."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for child in reversed(node.children) if isinstance(child, _Node))
+
+
+def _attributes(text: str) -> Dict[str, str]:
+    return {name.lower(): html_lib.unescape(double or single or bare or '')
+            for name, double, single, bare in _ATTR_RE.findall(text)}
+
+
+def parse_html(markup: str) -> _Node:
+    """Just enough of a DOM to walk LinkedIn's profile markup.
+
+    A single regex pass over tags and text, roughly three times faster than
+    html.parser on profile sections; comments are dropped, <br> becomes a
+    newline and stray end tags are ignored.
+    """
+    root = _Node('#root', {}, None)
+    current = root
+    for match in _TOKEN_RE.finditer(markup):
+        closing, tag, attrs, text = match.groups()
+        if text is not None:
+            current.children.append(html_lib.unescape(text) if '&' in text else text)
+        elif tag is None:
+            if match.group(0) == '<':
+                current.children.append('<')
+        elif closing:
+            # Close up to the matching open tag
+            tag = tag.lower()
+            node = current
+            while node is not None and node.tag != tag:
+                node = node.parent
+            if node is not None and node.parent is not None:
+                current = node.parent
+        else:
+            tag = tag.lower()
+            node = _Node(tag, _attributes(attrs), current)
+            current.children.append(node)
+            if tag == 'br':
+                current.children.append('\n')
+            elif tag not in _VOID_TAGS and not attrs.rstrip().endswith('/'):
+                current = node
+    return root
+
+
+def _text(node: _Node) -> str:
+    parts = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+        else:
+            stack.extend(reversed(item.children))
+    return ''.join(parts).strip()
+
+
+def _visible_texts(node: _Node, skip: Iterable[_Node] = ()) -> List[str]:
+    """Texts of aria-hidden spans (LinkedIn doubles each one in a screen-reader span).
+
+    Elements in skip, and everything below them, are left out.
+    """
+    skip = set(skip)
+    texts = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if item in skip:
+            continue
+        if item.tag == 'span' and item.attrs.get('aria-hidden') == 'true':
+            text = _text(item)
+            if text:
+                texts.append(text)
+            continue
+        stack.extend(child for child in reversed(item.children) if isinstance(child, _Node))
+    return texts
+
+
+def _section_html(html: str, anchor_id: str) -> Optional[str]:
+    """The markup of the <section> holding the anchor div LinkedIn marks each profile section with.
+
+    Only this slice is parsed: a profile page is mostly scripts, code blocks
+    and navigation, and tokenizing all of it dominates the extraction time.
+    """
+    anchor = html.find(f'id="{anchor_id}"')
+    if anchor < 0:
+        return None
+    start = html.rfind('<section', 0, anchor)
+    if start < 0:
+        return None
+    depth, position = 0, start
+    while True:
+        opening = html.find('<section', position)
+        closing = html.find('</section', position)
+        if closing < 0:
+            return html[start:]
+        if 0 <= opening < closing:
+            depth += 1
+            position = opening + len('<section')
+        else:
+            depth -= 1
+            position = closing + len('</section')
+            if depth == 0:
+                return html[start:html.find('>', position) + 1]
+
+
+def _section(html: str, anchor_id: str) -> Optional[_Node]:
+    fragment = _section_html(html, anchor_id)
+    if fragment is None:
+        return None
+    for node in parse_html(fragment).iter():
+        if node.tag == 'section':
+            return node
+    return None
+
+
+def _items(node: _Node) -> List[_Node]:
+    """The outermost <li> elements below node."""
+    items = []
+    stack = [child for child in reversed(node.children) if isinstance(child, _Node)]
+    while stack:
+        item = stack.pop()
+        if item.tag == 'li':
+            items.append(item)
+        else:
+            stack.extend(child for child in reversed(item.children) if isinstance(child, _Node))
+    return items
+
+
+def _is_location(text: str) -> bool:
+    if _is_dates(text) or '\n' in text or len(text) > 100:
+        return False
+    return ',' in text or any(text.endswith(kind) for kind in _WORKPLACE_TYPES)
+
+
+def _is_dates(text: str) -> bool:
+    return bool(DATE_RANGE_RE.match(text) or SINGLE_DATE_RE.match(text))
+
+
+def _duration(text: str) -> Optional[str]:
+    match = DATE_RANGE_RE.match(text)
+    if match:
+        return f"{match.group('start')} to {match.group('end')}"
+    match = SINGLE_DATE_RE.match(text)
+    return match.group('start') if match else None
+
+
+def _position(texts: List[str], company: Optional[str] = None,
+              location: Optional[str] = None) -> Dict[str, Any]:
+    """One role from its visible texts: title, [company], dates, [location], description...
+
+    In a grouped entry the company and shared location come from the group;
+    a location listed under the role itself takes precedence.
+    """
+    texts = list(texts)
+    position = texts.pop(0) if texts else None
+    duration = own_location = None
+    rest = []
+    for text in texts:
+        if duration is None and _is_dates(text):
+            duration = _duration(text)
+        elif duration is None and company is None:
+            company = clean_company_name(text)
+        elif duration is None and not rest and text.split(' · ')[0] in EMPLOYMENT_TYPES:
+            # Employment type under a grouped company's role
+            continue
+        elif own_location is None and not rest and _is_location(text):
+            own_location = text
+        else:
+            rest.append(text)
+    return {
+        "position": position,
+        "company": company,
+        "location": own_location or location,
+        "duration": duration,
+        "description": clean_text('\n'.join(rest)) if rest else None,
+    }
+
+
+def extract_experiences(html: str) -> List[Dict[str, Any]]:
+    section = _section(html, 'experience')
+    if section is None:
+        return []
+    experiences = []
+    for item in _items(section):
+        # Nested items are either roles (they have dates) or description blocks
+        roles = [li for li in _items(item) if any(_is_dates(t) for t in _visible_texts(li))]
+        texts = _visible_texts(item, skip=roles)
+        if roles:
+            # Several roles at one company: company, its total tenure, maybe a location
+            company = clean_company_name(texts[0]) if texts else None
+            location = next((t for t in texts[1:] if _is_location(t)), None)
+            for role in roles:
+                experiences.append(_position(_visible_texts(role), company, location))
+        elif texts:
+            experiences.append(_position(texts))
+    return experiences
+
+
+def extract_bio(html: str) -> Optional[str]:
+    section = _section(html, 'about')
+    if section is None:
+        return None
+    texts = _visible_texts(section)
+    # The first visible text is the "About" heading
+    return clean_text('\n'.join(texts[1:])) if len(texts) > 1 else None
+
+
+def date_experiences(profiles: List[Dict[str, Any]]) -> None:
+    """Date the experiences of every extracted profile in one pass and take
+    current_location from each profile's current role, when it lists one."""
+    histories = [profile['experiences'] for profile in profiles]
+    for profile, history, current in zip(profiles, histories, annotate_experiences(histories)):
+        if current is not None and history[current]['location']:
+            profile['current_location'] = history[current]['location']
+
+
+def extract_profile(html: str) -> Dict[str, Any]:
+    """The scraped fields of one profile page, shaped like the scraper's journal records.
+
+    current_location is the first location listed; date_experiences refines it.
+    """
+    experiences = extract_experiences(html)
+    current_location = next((e['location'] for e in experiences if e['location']), None)
+    return {
+        'experiences': experiences,
+        'companies': [e['company'] for e in experiences if e['company']],
+        'current_location': current_location,
+        'bio': extract_bio(html),
+    }
+
+
+def extract_file(path: Path) -> Dict[str, Any]:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        html = f.read()
+    fields = extract_profile(html)
+    fields['id'] = Path(path).name[:-len('.html.gz')]
+    url = _URL_COMMENT_RE.match(html)
+    fields['linkedin_url'] = url.group(1) if url else None
+    return fields
+
+
+def extract_all(html_dir: Path = HTML_DIR, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Extract every stored page in parallel across processes, then date all experiences at once."""
+    paths = sorted(Path(html_dir).glob('*.html.gz'))
+    if not paths:
+        return []
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        extracted = [extract_file(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            extracted = list(pool.map(extract_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    date_experiences(extracted)
+    return extracted
+
+
+def apply_to_snapshot(extracted: List[Dict[str, Any]], snapshot_path: Path = SNAPSHOT_PATH,
+                      output: Optional[Path] = None) -> int:
+    """Replace the extracted fields of matching snapshot records; returns how many matched.
+
+    Only EXTRACTED_FIELDS are written, so a matched record keeps its own id
+    and linkedin_url.
+    """
+    with open(snapshot_path, encoding='utf-8') as f:
+        profiles = json.load(f)
+    index = ProfileIndex(profiles)
+    matched = 0
+    for fields in extracted:
+        # By alumni id, or by URL for records written before ids were kept
+        profile = index.get(fields)
+        if profile is None:
+            continue
+        profile.update({field: fields[field] for field in EXTRACTED_FIELDS})
+        matched += 1
+
+    output = Path(output or snapshot_path)
+    tmp_path = output.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp_path.replace(output)
+    return matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-parse saved profile pages into the alumni snapshot.')
+    parser.add_argument('--html-dir', type=Path, default=HTML_DIR)
+    parser.add_argument('--snapshot', type=Path, default=SNAPSHOT_PATH)
+    parser.add_argument('--output', type=Path, default=None, help='Defaults to overwriting --snapshot')
+    parser.add_argument('--workers', type=int, default=None, help='Processes to use (default: all cores)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    extracted = extract_all(args.html_dir, args.workers)
+    seconds = time.perf_counter() - start
+    print(f"Extracted {len(extracted)} profiles from {args.html_dir} in {seconds:.2f}s")
+    if not extracted:
+        return
+    matched = apply_to_snapshot(extracted, args.snapshot, args.output)
+    print(f"Updated {matched} profiles in {args.output or args.snapshot}; "
+          f"{len(extracted) - matched} pages had no matching profile")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Normalize the free text scraped from LinkedIn profiles (bio and experience descriptions).
+
+LinkedIn repeats lines within a field, sometimes with the date range written
+two ways ("Sep 2024 - Nov 2024 · 3 mos" and "Sep 2024 to Nov 2024 · 3 mos").
+clean_text drops blank and repeated lines in one pass: each date-range line
+is reduced to a (start, end, duration) key, every other line is its own key,
+and the first line seen for each key is kept.
+
+Run as a script to re-clean every stored profile in data/alumni_mega.json:
+
+    python scripts/profile_text.py [--input data/alumni_mega.json] [--output PATH]
+"""
+import argparse
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+SNAPSHOT_PATH = Path('data/alumni_mega.json')
+
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+_DATE = rf'(?:{_MONTH}\s+)?\d{{4}}'
+
+# "Sep 2024 - Nov 2024 · 3 mos", "2019 to Present · 5 yrs 2 mos", "Apr 2025 – Present"
+DATE_RANGE_RE = re.compile(
+    rf'^(?P<start>{_DATE})\s*(?:-|–|—|\bto\b)\s*(?P<end>{_DATE}|present)\s*(?:·\s*(?P<duration>.*))?$',
+    re.IGNORECASE,
+)
+
+# A role that started and ended in the same month or year: "May 2021 · 1 mo"
+SINGLE_DATE_RE = re.compile(rf'^(?P<start>{_DATE})\s*(?:·\s*(?P<duration>.*))?$', re.IGNORECASE)
+
+EMPLOYMENT_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship', 'Self-employed', 'Freelance']
+_EMPLOYMENT_TYPE_RE = re.compile(rf'\s*·\s*({"|".join(EMPLOYMENT_TYPES)})$')
+
+
+def _squash(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+def line_key(line: str) -> Hashable:
+    """Dedupe key of a stripped line: date ranges by their parts, anything else as is."""
+    match = DATE_RANGE_RE.match(line)
+    if match:
+        return ('date range', _squash(match.group('start')), _squash(match.group('end')),
+                _squash(match.group('duration') or ''))
+    return line
+
+
+def clean_text(text: Optional[str]) -> Optional[str]:
+    """Strip lines, drop blank ones and drop repeats, keeping the first of each."""
+    if not text:
+        return None
+    unique: Dict[Hashable, str] = {}
+    for line in text.split('\n'):
+        line = line.strip()
+        if line:
+            unique.setdefault(line_key(line), line)
+    return '\n'.join(unique.values())
+
+
+def clean_company_name(company):
+    # Remove employment type (e.g., "· Full-time", "· Part-time")
+    return _EMPLOYMENT_TYPE_RE.sub('', company)
+
+
+def clean_texts(texts: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """clean_text over many fields; identical fields are only cleaned once."""
+    cache: Dict[str, Optional[str]] = {}
+    cleaned = []
+    for text in texts:
+        if not text:
+            cleaned.append(None)
+            continue
+        if text not in cache:
+            cache[text] = clean_text(text)
+        cleaned.append(cache[text])
+    return cleaned
+
+
+def clean_profiles(profiles: List[Dict[str, Any]]) -> int:
+    """Re-clean the bio and every experience description of scraped profiles in place.
+
+    Returns the number of fields that changed.
+    """
+    # Gather every field first so the whole set goes through clean_texts once
+    slots = []
+    for profile in profiles:
+        slots.append((profile, 'bio'))
+        for experience in profile.get('experiences') or []:
+            slots.append((experience, 'description'))
+    cleaned = clean_texts(holder.get(field) for holder, field in slots)
+    changed = 0
+    for (holder, field), text in zip(slots, cleaned):
+        if field in holder and holder[field] != text:
+            holder[field] = text
+            changed += 1
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-clean bio and description text of scraped profiles.')
+    parser.add_argument('--input', type=Path, default=SNAPSHOT_PATH)
+    parser.add_argument('--output', type=Path, default=None, help='Defaults to overwriting --input')
+    args = parser.parse_args()
+    output = args.output or args.input
+
+    with open(args.input, encoding='utf-8') as f:
+        profiles = json.load(f)
+    changed = clean_profiles(profiles)
+
+    tmp_path = output.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp_path.replace(output)
+    print(f"Cleaned {len(profiles)} profiles: {changed} fields changed, written to {output}")
+
+
+if __name__ == '__main__':
+    main()
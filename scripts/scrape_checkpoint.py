@@ -0,0 +1,119 @@
+"""Local checkpoint index for resumable scraper runs.
+
+The index records, per alumni id, whether the profile was scraped, how many
+attempts it took and the last error. It is an append-only JSON Lines log of
+entry updates (the latest line for an id wins), fsynced like the scrape
+journal, and rewritten with one line per id when it is loaded with many
+superseded lines. The profile's name and URL are kept too, so a run can
+resume from the index alone when the database is unreachable.
+"""
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+CHECKPOINT_PATH = Path('data/scrape_checkpoint.jsonl')
+
+# Attempts before a failing profile is left alone
+MAX_ATTEMPTS = 3
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class CheckpointIndex:
+    """Scrape status by alumni id, persisted to an append-only log."""
+
+    def __init__(self, path: Path = CHECKPOINT_PATH, max_attempts: int = MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        lines = 0
+        torn = False
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from a crash
+                        torn = True
+                        continue
+                    self.entries[entry['id']] = entry
+                    lines += 1
+        # Rewriting also drops a torn line that new appends would run into
+        if torn or lines > 2 * len(self.entries) + 100:
+            self.compact()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self.entries[entry['id']] = entry
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _update(self, profile: Dict[str, Any], **changes) -> None:
+        entry = dict(self.entries.get(profile['id']) or {
+            'id': profile['id'], 'status': PENDING, 'attempts': 0, 'last_error': None,
+        })
+        entry['name'] = profile.get('name', entry.get('name'))
+        entry['linkedin_url'] = profile.get('linkedin_url', entry.get('linkedin_url'))
+        entry.update(changes, updated_at=datetime.now().isoformat())
+        self._write(entry)
+
+    def track(self, profile: Dict[str, Any]) -> None:
+        """Remember a profile fetched from the database (no-op if it is already known)."""
+        if profile['id'] not in self.entries:
+            self._update(profile)
+
+    def should_scrape(self, profile_id: str) -> bool:
+        """False for profiles already done and for failures out of attempts."""
+        entry = self.entries.get(profile_id)
+        if entry is None:
+            return True
+        if entry['status'] == DONE:
+            return False
+        return entry['attempts'] < self.max_attempts
+
+    def mark_done(self, profile: Dict[str, Any]) -> None:
+        attempts = self.entries.get(profile['id'], {}).get('attempts', 0) + 1
+        self._update(profile, status=DONE, attempts=attempts, last_error=None)
+
+    def mark_failed(self, profile: Dict[str, Any], error: BaseException) -> None:
+        attempts = self.entries.get(profile['id'], {}).get('attempts', 0) + 1
+        self._update(profile, status=FAILED, attempts=attempts, last_error=str(error))
+
+    def retryable(self) -> Iterator[Dict[str, Any]]:
+        """Pending and failed profiles that still have attempts left, as scraper profiles."""
+        for entry in list(self.entries.values()):
+            if entry['status'] != DONE and self.should_scrape(entry['id']) and entry.get('linkedin_url'):
+                yield {'id': entry['id'], 'name': entry.get('name'), 'linkedin_url': entry['linkedin_url']}
+
+    def counts(self) -> Dict[str, int]:
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        for entry in self.entries.values():
+            counts[entry['status']] += 1
+        return counts
+
+    def compact(self) -> None:
+        """Rewrite the log with only the latest line per id."""
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(self.path)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,192 @@
+"""Append-only progress journal for the LinkedIn scraper.
+
+Each scraper run appends one JSON line per scraped profile to its own file in
+data/scrape_journal/, flushing and fsyncing after every line, so progress
+survives a crash at the cost of one small write per profile.
+
+Fold the journals into the alumni_mega.json snapshot with:
+
+    python scripts/scrape_journal.py compact [--remove]
+"""
+import argparse
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+JOURNAL_DIR = Path('data/scrape_journal')
+SNAPSHOT_PATH = Path('data/alumni_mega.json')
+
+
+class ScrapeJournal:
+    """One run's journal file; it is created on the first append."""
+
+    def __init__(self, path: Optional[Path] = None, journal_dir: Path = JOURNAL_DIR):
+        if path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = Path(journal_dir) / f"scrape_{timestamp}.jsonl"
+        self.path = Path(path)
+        self._file = None
+        self.records = 0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Write one record and make sure it is on disk before returning."""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.records += 1
+
+    def close(self) -> None:
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_journal(path: Path) -> Iterator[Dict[str, Any]]:
+    """Records of one journal; a torn last line from a crash is skipped."""
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping unreadable line {line_number} of {path}")
+
+
+def url_key(url: Optional[str]) -> Optional[str]:
+    """A LinkedIn URL reduced to host and path, so spelling variants compare equal."""
+    if not url:
+        return None
+    url = url.strip().lower().split('?')[0].split('#')[0].rstrip('/')
+    for prefix in ('https://', 'http://', 'www.'):
+        if url.startswith(prefix):
+            url = url[len(prefix):]
+    return url or None
+
+
+def record_keys(record: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """Every identity of a scraped profile: its alumni id and its URL, else its name.
+
+    Snapshot records written before the journal have no id, so a profile has
+    to match on either key to replace its older entry.
+    """
+    keys = []
+    if record.get('id'):
+        keys.append(('id', record['id']))
+    if url_key(record.get('linkedin_url')):
+        keys.append(('url', url_key(record.get('linkedin_url'))))
+    if not keys and record.get('name'):
+        keys.append(('name', record['name']))
+    return keys
+
+
+class ProfileIndex:
+    """Profiles in insertion order, found by any of their record_keys."""
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = ()):
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._slots: Dict[Tuple[str, Any], int] = {}
+        self._next_slot = 0
+        for record in records:
+            self.put(record)
+
+    def _slot(self, record: Dict[str, Any]) -> Optional[int]:
+        for key in record_keys(record):
+            slot = self._slots.get(key)
+            if slot is not None and slot in self._records:
+                return slot
+        return None
+
+    def get(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The stored profile sharing any key with record, if there is one."""
+        slot = self._slot(record)
+        return None if slot is None else self._records[slot]
+
+    def put(self, record: Dict[str, Any]) -> None:
+        """Store record at the end, replacing the profile it matches."""
+        slot = self._slot(record)
+        keys = record_keys(record)
+        if slot is not None:
+            # Keys only the old entry had (e.g. its URL) keep leading to the profile
+            keys += record_keys(self._records.pop(slot))
+        slot, self._next_slot = self._next_slot, self._next_slot + 1
+        self._records[slot] = record
+        for key in keys:
+            self._slots[key] = slot
+
+    def values(self) -> List[Dict[str, Any]]:
+        return list(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+def compact(journal_dir: Path = JOURNAL_DIR, snapshot_path: Path = SNAPSHOT_PATH,
+            remove: bool = False) -> int:
+    """Fold every journal into the snapshot and return the number of profiles in it.
+
+    Profiles already in the snapshot are kept; a journaled profile replaces the
+    snapshot entry with the same id or LinkedIn URL (see record_keys), and later
+    journals win over earlier ones.
+    The snapshot is replaced atomically. With remove=True the journals that
+    were folded in are deleted afterwards.
+    """
+    snapshot_path = Path(snapshot_path)
+    profiles = ProfileIndex()
+    if snapshot_path.exists():
+        with open(snapshot_path, encoding='utf-8') as f:
+            for record in json.load(f):
+                profiles.put(record)
+
+    # Journal names carry their start time, so name order is run order
+    journals: List[Path] = sorted(Path(journal_dir).glob('*.jsonl'))
+    journaled = 0
+    for journal in journals:
+        for record in read_journal(journal):
+            # Replacing moves a re-scraped profile to its latest position
+            profiles.put(record)
+            journaled += 1
+
+    tmp_path = snapshot_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(list(profiles.values()), f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp_path.replace(snapshot_path)
+    print(f"Compacted {journaled} journaled records from {len(journals)} journals "
+          f"into {snapshot_path} ({len(profiles)} profiles)")
+
+    if remove:
+        for journal in journals:
+            journal.unlink()
+        print(f"Removed {len(journals)} journals")
+    return len(profiles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the scraper progress journals.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compact_parser = subparsers.add_parser('compact', help='Fold the journals into one JSON snapshot')
+    compact_parser.add_argument('--journal-dir', type=Path, default=JOURNAL_DIR)
+    compact_parser.add_argument('--output', type=Path, default=SNAPSHOT_PATH)
+    compact_parser.add_argument('--remove', action='store_true',
+                                help='Delete the journals once they are in the snapshot')
+    args = parser.parse_args()
+
+    if args.command == 'compact':
+        compact(args.journal_dir, args.output, args.remove)
+
+
+if __name__ == '__main__':
+    main()
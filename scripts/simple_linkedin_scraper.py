@@ -11,68 +11,33 @@ import time
 import json
 import re
 import random
-from supabase import create_client, Client
+import argparse
+import itertools
+import queue
+import threading
 from dotenv import load_dotenv
 import sys
+from pathlib import Path
+
+from storage import StorageBackend, add_backend_arguments, backend_from_args
+from scrape_journal import ScrapeJournal
+from profile_text import clean_text, clean_company_name
+from profile_html import save_profile_html, HTML_DIR
+from scrape_checkpoint import CheckpointIndex, CHECKPOINT_PATH, MAX_ATTEMPTS
+from writeback_buffer import WriteBackBuffer, FLUSH_EVERY, FLUSH_INTERVAL
+
+# Shared pipeline helpers live in data/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data' / 'scripts'))
+
+from career_dates import annotate_experiences
 
 # Load environment variables
 load_dotenv('.env.local')
 
-# Initialize Supabase client
-supabase: Client = create_client(
-    os.getenv('NEXT_PUBLIC_SUPABASE_URL', ''),
-    os.getenv('NEXT_PUBLIC_SUPABASE_ANON_KEY', '')
-)
-
 def sanitize_filename(name):
     # Remove invalid characters from filename
     return re.sub(r'[<>:"/\\|?*]', '', name)
 
-def clean_text(text):
-    if not text:
-        return None
-    
-    # Split by newlines
-    lines = text.split('\n')
-    
-    # Clean and deduplicate lines
-    seen = set()
-    unique_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Skip if this line is a duplicate
-        if line in seen:
-            continue
-            
-        # Skip if this line is a duplicate with different date format
-        # (e.g., "Sep 2024 - Nov 2024 · 3 mos" vs "Sep 2024 to Nov 2024 · 3 mos")
-        is_duplicate_date = False
-        if '·' in line and any(char in line for char in ['-', 'to']):
-            # Extract the date part and duration
-            parts = line.split('·')
-            if len(parts) == 2:
-                date_part = parts[0].strip()
-                duration = parts[1].strip()
-                # Check if we've seen a similar date with different format
-                for seen_line in seen:
-                    if '·' in seen_line and duration in seen_line:
-                        is_duplicate_date = True
-                        break
-        
-        if not is_duplicate_date:
-            seen.add(line)
-            unique_lines.append(line)
-    
-    return '\n'.join(unique_lines)
-
-def clean_company_name(company):
-    # Remove employment type (e.g., "· Full-time", "· Part-time")
-    return re.sub(r'\s*·\s*(Full-time|Part-time|Contract|Internship|Self-employed|Freelance)$', '', company)
-
 def random_human_delay(min_sec=1, max_sec=3):
     delay = random.uniform(min_sec, max_sec)
     time.sleep(delay)
@@ -150,82 +115,157 @@ def clean_linkedin_url(url: str) -> str:
     
     return url
 
-def get_unscraped_profiles() -> list:
-    """Fetch unscraped LinkedIn profiles from Supabase."""
+# Profiles fetched per request, and pages loaded ahead of the scraper
+PAGE_SIZE = 200
+PREFETCH_PAGES = 2
+
+def prefetch(pages, depth: int = PREFETCH_PAGES):
+    """Iterate pages while a background thread loads up to depth pages ahead.
+    
+    An error in the loader is raised in the consumer once the pages before it
+    have been used; closing the generator stops the loader.
+    """
+    loaded = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+    done = object()
+    
+    def load():
+        try:
+            for page in pages:
+                while not stop.is_set():
+                    try:
+                        loaded.put(page, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            item = done
+        except Exception as e:
+            item = e
+        while not stop.is_set():
+            try:
+                loaded.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+    
+    loader = threading.Thread(target=load, name='profile-prefetch', daemon=True)
+    loader.start()
     try:
-        # Fix the query syntax
-        response = supabase.table('alumni') \
-            .select('id, name, linkedin_url') \
-            .eq('scraped', False) \
-            .not_.is_('linkedin_url', 'null') \
-            .execute()
-        
-        # The response data is directly in response.data
-        profiles = response.data
-        print(f"\nFound {len(profiles)} unscraped profiles with LinkedIn URLs")
-        
-        # Clean and validate URLs
-        valid_profiles = []
-        for profile in profiles:
-            if profile['linkedin_url']:
-                clean_url = clean_linkedin_url(profile['linkedin_url'])
-                if clean_url:
-                    valid_profiles.append({
-                        'id': profile['id'],
-                        'name': profile['name'],
-                        'linkedin_url': clean_url
-                    })
-        
-        print(f"Valid LinkedIn URLs: {len(valid_profiles)}")
-        return valid_profiles
-        
+        while True:
+            item = loaded.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+def get_unscraped_profiles(backend: StorageBackend, page_size: int = PAGE_SIZE,
+                           prefetch_pages: int = PREFETCH_PAGES):
+    """Yield unscraped LinkedIn profiles from the database, with cleaned URLs.
+    
+    Profiles are paged by id cursor and later pages load in the background,
+    so scraping can start as soon as the first page arrives.
+    """
+    fetched = valid = 0
+    pages = backend.iter_unscraped(['id', 'name', 'linkedin_url'], page_size)
+    for page in prefetch(pages, prefetch_pages):
+        fetched += len(page)
+        for profile in page:
+            # Clean and validate URLs
+            clean_url = clean_linkedin_url(profile['linkedin_url']) if profile['linkedin_url'] else None
+            if clean_url:
+                valid += 1
+                yield {
+                    'id': profile['id'],
+                    'name': profile['name'],
+                    'linkedin_url': clean_url
+                }
+    print(f"\nFetched {fetched} unscraped profiles with LinkedIn URLs ({valid} valid)")
+
+def profiles_to_scrape(backend: StorageBackend, checkpoint: CheckpointIndex, page_size: int = PAGE_SIZE):
+    """Yield the profiles this run should scrape.
+    
+    Unscraped profiles stream from the database, minus those the checkpoint
+    has as done or out of attempts. Then come checkpointed profiles that still
+    have attempts left but were not in the database results, which is all of
+    them when the database is unreachable.
+    """
+    seen = set()
+    try:
+        for profile in get_unscraped_profiles(backend, page_size):
+            seen.add(profile['id'])
+            checkpoint.track(profile)
+            if checkpoint.should_scrape(profile['id']):
+                yield profile
     except Exception as e:
         print(f"Error in get_unscraped_profiles: {e}")
-        print("Full response:", response)  # Add this to see what we're getting
-        return []
+        print("Continuing with profiles from the local checkpoint")
+    for profile in checkpoint.retryable():
+        if profile['id'] not in seen:
+            seen.add(profile['id'])
+            yield profile
+
+def summarize_experiences(person) -> dict:
+    """The person's experiences as career_history entries, plus the current role's fields.
+
+    Each experience gets start/end/current/tenure_months from its duration
+    (see career_dates). The current role is the one those dates mark as
+    current or most recent; when no duration parses, role falls back to the
+    headline job title and location to the first experience that has one.
+    """
+    experiences = []
+    for experience in person.experiences:
+        experiences.append({
+            "position": experience.position_title,
+            "company": clean_company_name(experience.institution_name),
+            "location": getattr(experience, 'location', None),
+            "duration": f"{experience.from_date} - Present" if not experience.to_date else f"{experience.from_date} to {experience.to_date}",
+            "description": clean_text(experience.description) if experience.description else None
+        })
+    [current] = annotate_experiences([experiences])
+    current_role = experiences[current] if current is not None else {}
+    
+    # Location of the current role, else of the first experience that has one
+    current_location = current_role.get('location') or next(
+        (experience['location'] for experience in experiences if experience['location']), None)
+    return {
+        'experiences': experiences,
+        'companies': [experience['company'] for experience in experiences],
+        'role': current_role.get('position') or person.job_title,
+        'current_location': current_location,
+    }
 
 # Claude function for putting info back into Supabase:
-def save_profile_to_supabase(profile_id: str, person, linkedin_url: str):
-    """Save scraped profile data to Supabase."""
+def save_profile_to_supabase(writeback: WriteBackBuffer, profile: dict, person, linkedin_url: str,
+                             summary: dict):
+    """Queue scraped profile data for the next bulk write to Supabase.
+
+    summary is summarize_experiences(person), shared with the journal record.
+    """
     try:
         # Check if we have a valid LinkedIn URL
         clean_url = clean_linkedin_url(linkedin_url)
         has_valid_linkedin = clean_url is not None
         
-        # Prepare companies array
-        companies = [clean_company_name(exp.institution_name) for exp in person.experiences]
-        
-        # Get current location from most recent experience
-        current_location = None
-        for experience in person.experiences:
-            location = getattr(experience, 'location', None)
-            if location:
-                current_location = location
-                break
-        
         # Prepare career history JSON
         career_history = {
             "bio": clean_text(person.about),
             "picture_url": person.picture if hasattr(person, 'picture') else None,
-            "experiences": []
+            "experiences": summary['experiences']
         }
         
-        # Process experiences for career_history
-        for experience in person.experiences:
-            experience_data = {
-                "position": experience.position_title,
-                "company": clean_company_name(experience.institution_name),
-                "location": getattr(experience, 'location', None),
-                "duration": f"{experience.from_date} - Present" if not experience.to_date else f"{experience.from_date} to {experience.to_date}",
-                "description": clean_text(experience.description) if experience.description else None
-            }
-            career_history["experiences"].append(experience_data)
-        
-        # Update the alumni record
+        # Update the alumni record; name rides along because a bulk upsert
+        # checks NOT NULL columns before it finds the existing row
         update_data = {
-            'role': person.job_title,
-            'companies': companies,
-            'location': current_location,
+            'id': profile['id'],
+            'name': profile['name'],
+            'role': summary['role'],
+            'companies': summary['companies'],
+            'location': summary['current_location'],
             'has_linkedin': has_valid_linkedin,  # Only true if we have a valid LinkedIn URL
             'scraped': True,
             'manually_verified': False,
@@ -236,23 +276,25 @@ def save_profile_to_supabase(profile_id: str, person, linkedin_url: str):
         if has_valid_linkedin:
             update_data['linkedin_url'] = clean_url
         
-        response = supabase.table('alumni').update(update_data).eq('id', profile_id).execute()
-        print(f"✅ Successfully saved {person.name} to database (has_linkedin: {has_valid_linkedin})")
+        writeback.add(update_data)
+        print(f"✅ Queued {person.name} for saving (has_linkedin: {has_valid_linkedin})")
         return True
         
     except Exception as e:
         print(f"❌ Error saving to database: {e}")
         return False
 
-def update_scraped_status_only(profile_id: str, success: bool = True):
+def update_scraped_status_only(writeback: WriteBackBuffer, profile: dict, success: bool = True):
     """Update only the scraped status in case of errors."""
     try:
-        supabase.table('alumni').update({
+        writeback.add({
+            'id': profile['id'],
+            'name': profile['name'],
             'scraped': success,
             'manually_verified': False
-        }).eq('id', profile_id).execute()
+        })
     except Exception as e:
-        print(f"Error updating scraped status for {profile_id}: {e}")
+        print(f"Error updating scraped status for {profile['id']}: {e}")
 
 def save_cookies(driver, filename="linkedin_cookies.json"):
     """Save cookies to a file."""
@@ -281,27 +323,58 @@ def load_cookies(driver, filename="linkedin_cookies.json"):
         return False
 
 def main():
+    parser = argparse.ArgumentParser(description='Scrape LinkedIn profiles of unscraped alumni.')
+    add_backend_arguments(parser)
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE,
+                        help=f'Profiles fetched per request (default: {PAGE_SIZE})')
+    parser.add_argument('--checkpoint', type=Path, default=CHECKPOINT_PATH,
+                        help=f'Local checkpoint index (default: {CHECKPOINT_PATH})')
+    parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS,
+                        help=f'Attempts per profile before giving up on it (default: {MAX_ATTEMPTS})')
+    parser.add_argument('--flush-every', type=int, default=FLUSH_EVERY,
+                        help=f'Write scraped profiles back after this many (default: {FLUSH_EVERY})')
+    parser.add_argument('--flush-interval', type=float, default=FLUSH_INTERVAL,
+                        help=f'...or after this many seconds (default: {FLUSH_INTERVAL:.0f})')
+    parser.add_argument('--save-html', action='store_true',
+                        help=f'Keep each profile page gzipped in {HTML_DIR} for offline re-parsing '
+                             '(see profile_html.py)')
+    args = parser.parse_args()
+    
     email = os.getenv('LINKEDIN_EMAIL')
     password = os.getenv('LINKEDIN_PASSWORD')
     if not email or not password:
         print("Please set LINKEDIN_EMAIL and LINKEDIN_PASSWORD environment variables")
         return
 
-    # Get unscraped profiles from database
-    profiles = get_unscraped_profiles()
-    if not profiles:
+    backend = backend_from_args(args)
+
+    # Scrape status by id survives crashes and database outages
+    checkpoint = CheckpointIndex(args.checkpoint, args.max_attempts)
+    counts = checkpoint.counts()
+    if checkpoint.entries:
+        print(f"Checkpoint {args.checkpoint}: {counts['done']} done, {counts['failed']} failed, "
+              f"{counts['pending']} pending")
+
+    # Stream unscraped profiles from database; later pages load while scraping
+    profiles = profiles_to_scrape(backend, checkpoint, args.page_size)
+    first_page = list(itertools.islice(profiles, args.page_size))
+    if not first_page:
         print("No unscraped profiles found!")
+        checkpoint.close()
         return
 
-    # Show profiles for review
+    # Show the first page for review
     print("\nProfiles to be scraped:")
-    for i, profile in enumerate(profiles, 1):
+    for i, profile in enumerate(first_page, 1):
         print(f"{i}. {profile['name']} - {profile['linkedin_url']}")
+    if len(first_page) == args.page_size:
+        print("...more profiles will be fetched as scraping proceeds")
     
     # Ask for confirmation
     response = input("\nDo you want to proceed with scraping these profiles? (y/n): ")
     if response.lower() != 'y':
         print("Scraping cancelled.")
+        checkpoint.close()
         return
 
     # Initialize Chrome options
@@ -310,9 +383,12 @@ def main():
     chrome_options.add_argument("--start-maximized")
     chrome_options.add_argument("--disable-notifications")
     
-    # Store all scraped data
-    all_scraped_data = []
-    output_file = None  # Initialize output_file
+    # Progress is appended to this run's journal, one line per profile;
+    # fold journals into data/alumni_mega.json with scrape_journal.py compact
+    journal = ScrapeJournal()
+    
+    # Database writes are buffered and sent in bulk; unsent rows survive in a spool
+    writeback = WriteBackBuffer(backend, flush_every=args.flush_every, flush_interval=args.flush_interval)
     
     # Single browser session for all profiles
     driver = None
@@ -337,9 +413,9 @@ def main():
             time.sleep(2)  # Reduced from 3 to 2
         
         # Process all profiles continuously
-        print(f"\nProcessing {len(profiles)} profiles...")
+        print("\nProcessing profiles...")
         
-        for profile in profiles:
+        for profile in itertools.chain(first_page, profiles):
             try:
                 print(f"\nScraping {profile['name']}...")
                 
@@ -383,16 +459,25 @@ def main():
                 # Random human-like behavior
                 random_human_scroll_and_mouse(driver)
                 
+                # Keep the raw page so fields can be re-extracted without a browser
+                if args.save_html:
+                    try:
+                        save_profile_html(profile['id'], driver.page_source,
+                                          linkedin_url=profile['linkedin_url'])
+                    except Exception as e:
+                        print(f"Could not save HTML for {profile['name']}: {e}")
+                
                 # Scrape profile
                 person = Person(profile['linkedin_url'], driver=driver)
+                summary = summarize_experiences(person)
 
                 # Save to Supabase
-                if save_profile_to_supabase(profile['id'], person, profile['linkedin_url']):
-                    print(f"✅ Successfully scraped and saved {profile['name']}")
+                if save_profile_to_supabase(writeback, profile, person, profile['linkedin_url'], summary):
+                    print(f"✅ Successfully scraped {profile['name']}")
                 else:
                     print(f"⚠️ Scraped {profile['name']} but failed to save to database")
                     # Still mark as scraped even if database save failed
-                    update_scraped_status_only(profile['id'], True)
+                    update_scraped_status_only(writeback, profile, True)
 
                 # Keep backup JSON data
                 alumni_data = {
@@ -401,52 +486,37 @@ def main():
                     "linkedin_url": profile['linkedin_url'],
                     "picture_url": person.picture if hasattr(person, 'picture') else None,
                     "bio": clean_text(person.about),
-                    "role": person.job_title,
-                    "companies": [clean_company_name(exp.institution_name) for exp in person.experiences],
-                    "current_location": None,
+                    "role": summary['role'],
+                    "companies": summary['companies'],
+                    "current_location": summary['current_location'],
                     "has_linkedin": True,
                     "scraped": True,
                     "manually_verified": False,
                     "created_at": datetime.now().isoformat(),
-                    "experiences": []
+                    "experiences": summary['experiences']
                 }
                 
-                # Process experiences for JSON backup
-                for experience in person.experiences:
-                    location = getattr(experience, 'location', None)
-                    if not alumni_data["current_location"] and location:
-                        alumni_data["current_location"] = location
-                    experience_data = {
-                        "position": experience.position_title,
-                        "company": clean_company_name(experience.institution_name),
-                        "location": location,
-                        "duration": f"{experience.from_date} - Present" if not experience.to_date else f"{experience.from_date} to {experience.to_date}",
-                        "description": clean_text(experience.description) if experience.description else None
-                    }
-                    alumni_data["experiences"].append(experience_data)
-                
-                all_scraped_data.append(alumni_data)
+                journal.append(alumni_data)
+                checkpoint.mark_done(profile)
                 
             except Exception as e:
                 print(f"❌ Error scraping {profile['name']}: {e}")
                 print("Error details:", str(e))
-                # Mark as failed in database
-                update_scraped_status_only(profile['id'], False)
+                # Failures are only recorded locally; the database keeps the
+                # profile unscraped so it is retried until attempts run out
+                checkpoint.mark_failed(profile, e)
             
             # Random delay between profiles
             time.sleep(random.uniform(2, 4))  # Reduced from 4-8 to 2-4
-            
-            # Save progress after each profile
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"data/alumni_mega_{timestamp}.json"
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(all_scraped_data, f, indent=2, ensure_ascii=False)
-            print(f"Progress saved to {output_file}")
+            writeback.maybe_flush()
             
     except Exception as e:
         print(f"❌ Error during scraping: {e}")
         print("Error details:", str(e))
     finally:
+        writeback.close()
+        journal.close()
+        checkpoint.close()
         if driver:
             try:
                 driver.quit()
@@ -454,9 +524,10 @@ def main():
                 pass
     
     print("\nScraping completed!")
-    print(f"Total profiles scraped: {len(all_scraped_data)}")
-    if output_file:
-        print(f"Final data saved to {output_file}")
+    print(f"Total profiles scraped: {journal.records}")
+    if journal.records:
+        print(f"Progress journaled to {journal.path}")
+        print("Run 'python scripts/scrape_journal.py compact' to update data/alumni_mega.json")
     else:
         print("No data was saved due to errors.")
 
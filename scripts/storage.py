@@ -0,0 +1,395 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from supabase import create_client
+except ImportError:  # pragma: no cover - only needed for the hosted backend
+    create_client = None
+
+try:
+    from dotenv import load_dotenv
+except ImportError:  # pragma: no cover
+    load_dotenv = None
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / 'data' / 'scripts' / 'schema.sql'
+
+TABLE = 'alumni'
+
+# The hosted table renamed and added columns after schema.sql was written, and
+# the scripts write the hosted names; the local table adds these on top of
+# schema.sql (source_sheet is an array there too)
+HOSTED_COLUMNS = {
+    'role': 'TEXT',
+    'companies': 'TEXT[]',
+    'industry': 'TEXT[]',
+    'location': 'TEXT',
+    'bio': 'TEXT',
+    'picture_url': 'TEXT',
+    'has_enrichment': 'BOOLEAN DEFAULT FALSE',
+    'education': 'JSONB[]',
+    'source_sheet': 'TEXT[]',
+}
+
+# Postgres error codes for the constraint failures SQLite reports
+_SQLITE_ERROR_CODES = {
+    'UNIQUE constraint failed': '23505',
+    'CHECK constraint failed': '23514',
+    'NOT NULL constraint failed': '23502',
+}
+
+_CREATE_TABLE_RE = re.compile(r'CREATE TABLE\s+(\w+)\s*\((.*?)\n\);', re.DOTALL | re.IGNORECASE)
+
+
+class StorageError(Exception):
+    """A write the database rejected; code is the Postgres SQLSTATE where known."""
+
+    def __init__(self, message: str, code: Optional[str] = None):
+        super().__init__(message)
+        self.code = code
+        self.details = None
+
+
+class StorageBackend(ABC):
+    """The alumni-table operations the upload, sync and scraper scripts need.
+
+    Every write is all-or-nothing per call and raises on failure, so callers
+    can retry or bisect a batch.
+    """
+
+    @abstractmethod
+    def fetch_page(self, columns: List[str], offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Rows offset..offset+limit of the table in id order."""
+        raise NotImplementedError
+
+    def fetch_all(self, columns: List[str], page_size: int = 1000) -> List[Dict[str, Any]]:
+        """Every row of the table, fetched a page at a time."""
+        rows = []
+        while True:
+            page = self.fetch_page(columns, len(rows), page_size)
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+
+    @abstractmethod
+    def fetch_unscraped(self, columns: List[str], after_id: Any = None,
+                        limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Rows not yet scraped that have a LinkedIn URL, in id order.
+
+        With after_id only rows whose id sorts after it are returned, so pages
+        can be walked by id cursor (keyset pagination) rather than offset.
+        """
+        raise NotImplementedError
+
+    def iter_unscraped(self, columns: List[str], page_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of unscraped rows, each starting after the last id of the one before.
+
+        Rows marked scraped while the pages are being walked cannot shift later
+        pages, as they would with offsets.
+        """
+        if 'id' not in columns:
+            columns = ['id'] + list(columns)
+        after_id = None
+        while True:
+            page = self.fetch_unscraped(columns, after_id, page_size)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            after_id = page[-1]['id']
+
+    @abstractmethod
+    def insert(self, records: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def upsert(self, records: List[Dict[str, Any]]) -> None:
+        """Insert records, or update the given columns of rows whose id exists."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update(self, row_id: Any, values: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_ids(self, ids: List[Any]) -> None:
+        raise NotImplementedError
+
+
+class SupabaseBackend(StorageBackend):
+    """The hosted Supabase table, through a supabase-py client."""
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_env(cls, env_file: str = '.env.local') -> 'SupabaseBackend':
+        """Create a client from NEXT_PUBLIC_SUPABASE_URL and NEXT_PUBLIC_SUPABASE_ANON_KEY."""
+        if create_client is None:
+            raise RuntimeError("supabase is not installed; pip install supabase or use the sqlite backend")
+        if load_dotenv is not None:
+            load_dotenv(env_file)
+        url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+        key = os.getenv('NEXT_PUBLIC_SUPABASE_ANON_KEY')
+        logger.info(f"NEXT_PUBLIC_SUPABASE_URL exists: {bool(url)}")
+        logger.info(f"NEXT_PUBLIC_SUPABASE_ANON_KEY exists: {bool(key)}")
+        return cls(create_client(url or '', key or ''))
+
+    def _table(self):
+        return self.client.table(TABLE)
+
+    def fetch_page(self, columns, offset, limit):
+        response = (self._table().select(','.join(columns))
+                    .order('id')
+                    .range(offset, offset + limit - 1)
+                    .execute())
+        return response.data or []
+
+    def fetch_unscraped(self, columns, after_id=None, limit=None):
+        query = (self._table().select(', '.join(columns))
+                 .eq('scraped', False)
+                 .not_.is_('linkedin_url', 'null')
+                 .order('id'))
+        if after_id is not None:
+            query = query.gt('id', after_id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.execute().data or []
+
+    def insert(self, records):
+        self._table().insert(records).execute()
+
+    def upsert(self, records):
+        self._table().upsert(records).execute()
+
+    def update(self, row_id, values):
+        self._table().update(values).eq('id', row_id).execute()
+
+    def delete_ids(self, ids):
+        self._table().delete().in_('id', ids).execute()
+
+
+def parse_pg_array(text: str) -> List[Optional[str]]:
+    """Parse a one-dimensional Postgres array literal such as {"a b",c,NULL}."""
+    text = text.strip()
+    if not (text.startswith('{') and text.endswith('}')):
+        raise ValueError(f"not an array literal: {text!r}")
+    items, i, body = [], 0, text[1:-1]
+    while i < len(body):
+        if body[i] == '"':
+            i += 1
+            item = []
+            while body[i] != '"':
+                if body[i] == '\\':
+                    i += 1
+                item.append(body[i])
+                i += 1
+            items.append(''.join(item))
+            i += 1
+        else:
+            end = body.find(',', i)
+            end = len(body) if end == -1 else end
+            item = body[i:end].strip()
+            items.append(None if item.upper() == 'NULL' else item)
+            i = end
+        # Skip the separator
+        i += 1
+    return items
+
+
+def load_table_columns(schema_path: Path = SCHEMA_PATH) -> Dict[str, str]:
+    """Column name -> Postgres definition (type and constraints) from schema.sql."""
+    match = _CREATE_TABLE_RE.search(Path(schema_path).read_text())
+    if match is None:
+        raise ValueError(f"No CREATE TABLE statement in {schema_path}")
+    columns = {}
+    for line in match.group(2).splitlines():
+        line = line.split('--')[0].strip().rstrip(',')
+        if line:
+            name, definition = line.split(None, 1)
+            columns[name] = definition
+    return columns
+
+
+def table_columns(schema_path: Path = SCHEMA_PATH) -> Dict[str, str]:
+    """The alumni table as the scripts see it: schema.sql with HOSTED_COLUMNS applied."""
+    columns = load_table_columns(schema_path)
+    for name, definition in HOSTED_COLUMNS.items():
+        if name in columns:
+            # Keep the constraints, take the hosted type
+            columns[name] = re.sub(r'^\S+', definition, columns[name], count=1)
+        else:
+            columns[name] = definition
+    return columns
+
+
+def sqlite_column(name: str, definition: str) -> str:
+    """Translate one Postgres column definition from schema.sql to SQLite.
+
+    Arrays and JSONB are stored as JSON text, booleans as 0/1 and UUIDs and
+    timestamps as text; NOT NULL, UNIQUE, CHECK and defaults are kept.
+    """
+    definition = re.sub(r'DEFAULT\s+gen_random_uuid\(\)\s*', '', definition, flags=re.IGNORECASE)
+    definition = re.sub(r"ARRAY\[\]::\w+\[\]", "'[]'", definition)
+    definition = re.sub(r'^(TEXT|JSONB)\[\]|^JSONB|^UUID|^DATE|^TIMESTAMP WITH TIME ZONE', 'TEXT', definition)
+    definition = re.sub(r'^BOOLEAN', 'INTEGER', definition)
+    definition = re.sub(r'DEFAULT FALSE', 'DEFAULT 0', definition, flags=re.IGNORECASE)
+    definition = re.sub(r'DEFAULT TRUE', 'DEFAULT 1', definition, flags=re.IGNORECASE)
+    return f'"{name}" {definition}'
+
+
+class SQLiteBackend(StorageBackend):
+    """A local SQLite table with the schema.sql shape, for offline runs and benchmarks.
+
+    The table is created from schema.sql plus HOSTED_COLUMNS. Array and JSONB
+    values (lists, dicts or Postgres array literals) are stored as JSON and
+    read back as lists or dicts; booleans read back as bools.
+    """
+
+    def __init__(self, path: str = ':memory:', schema_path: Path = SCHEMA_PATH):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+
+        columns = table_columns(schema_path)
+        self.json_columns = {name for name, d in columns.items() if re.match(r'(TEXT|JSONB)\[\]|JSONB', d)}
+        self.jsonb_array_columns = {name for name, d in columns.items() if d.startswith('JSONB[]')}
+        self.bool_columns = {name for name, d in columns.items() if d.startswith('BOOLEAN')}
+        self.columns = list(columns)
+        body = ',\n    '.join(sqlite_column(name, d) for name, d in columns.items())
+        with self._lock:
+            self.conn.execute(f'CREATE TABLE IF NOT EXISTS {TABLE} (\n    {body}\n)')
+            self.conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{TABLE}_scraped ON {TABLE}(scraped)')
+
+    def _encode(self, column: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if column in self.json_columns:
+            if isinstance(value, str):
+                # Arrays sent as Postgres literals (see update_supabase.format_array_for_supabase)
+                value = parse_pg_array(value)
+                if column in self.jsonb_array_columns:
+                    value = [None if item is None else json.loads(item) for item in value]
+            return json.dumps(value)
+        if isinstance(value, bool):
+            return int(value)
+        return value
+
+    def _decode(self, row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        for column, value in record.items():
+            if value is None:
+                continue
+            if column in self.json_columns:
+                record[column] = json.loads(value)
+            elif column in self.bool_columns:
+                record[column] = bool(value)
+        return record
+
+    def _encode_row(self, columns: Iterable[str], values: Dict[str, Any]) -> List[Any]:
+        try:
+            return [self._encode(c, values[c]) for c in columns]
+        except ValueError as e:
+            # Postgres: invalid_text_representation
+            raise StorageError(f"invalid array or JSON value: {e}", '22P02') from e
+
+    def _execute(self, statements: List[Tuple[str, List[List[Any]]]]) -> None:
+        """Run (sql, rows) statements in one transaction, as one request would."""
+        with self._lock:
+            try:
+                self.conn.execute('BEGIN')
+                for sql, rows in statements:
+                    self.conn.executemany(sql, rows)
+                self.conn.execute('COMMIT')
+            except sqlite3.Error as e:
+                self.conn.execute('ROLLBACK')
+                message = str(e)
+                code = next((c for prefix, c in _SQLITE_ERROR_CODES.items() if message.startswith(prefix)), None)
+                raise StorageError(message, code) from e
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._decode(row) for row in self.conn.execute(sql, tuple(params))]
+
+    @staticmethod
+    def _column_list(columns: List[str]) -> str:
+        return ', '.join(f'"{c}"' for c in columns)
+
+    def fetch_page(self, columns, offset, limit):
+        return self._query(f'SELECT {self._column_list(columns)} FROM {TABLE} ORDER BY id LIMIT ? OFFSET ?',
+                           (limit, offset))
+
+    def fetch_unscraped(self, columns, after_id=None, limit=None):
+        sql = (f'SELECT {self._column_list(columns)} FROM {TABLE} '
+               f'WHERE scraped = 0 AND linkedin_url IS NOT NULL')
+        params: List[Any] = []
+        if after_id is not None:
+            sql += ' AND id > ?'
+            params.append(after_id)
+        sql += ' ORDER BY id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return self._query(sql, tuple(params))
+
+    def _write(self, records: List[Dict[str, Any]], upsert: bool) -> None:
+        # Rows are grouped by their set of columns, each group one statement
+        groups: Dict[tuple, List[List[Any]]] = {}
+        for record in records:
+            record = dict(record)
+            record.setdefault('id', str(uuid.uuid4()))
+            columns = tuple(record)
+            groups.setdefault(columns, []).append(self._encode_row(columns, record))
+        statements = []
+        for columns, rows in groups.items():
+            sql = (f'INSERT INTO {TABLE} ({self._column_list(list(columns))}) '
+                   f'VALUES ({", ".join("?" * len(columns))})')
+            if upsert:
+                updates = ', '.join(f'"{c}" = excluded."{c}"' for c in columns if c != 'id')
+                sql += f' ON CONFLICT(id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP'
+            statements.append((sql, rows))
+        self._execute(statements)
+
+    def insert(self, records):
+        self._write(records, upsert=False)
+
+    def upsert(self, records):
+        self._write(records, upsert=True)
+
+    def update(self, row_id, values):
+        columns = list(values)
+        assignments = ', '.join(f'"{c}" = ?' for c in columns)
+        sql = f'UPDATE {TABLE} SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?'
+        self._execute([(sql, [self._encode_row(columns, values) + [row_id]])])
+
+    def delete_ids(self, ids):
+        self._execute([(f'DELETE FROM {TABLE} WHERE id IN ({", ".join("?" * len(ids))})', [list(ids)])])
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute(f'SELECT COUNT(*) FROM {TABLE}').fetchone()[0]
+
+
+def add_backend_arguments(parser) -> None:
+    """Add the --backend and --sqlite-path options shared by the scripts."""
+    parser.add_argument('--backend', choices=['supabase', 'sqlite'], default='supabase',
+                        help='Where to read and write alumni rows (default: supabase)')
+    parser.add_argument('--sqlite-path', default='data/processed/alumni.sqlite',
+                        help='Database file for --backend sqlite (default: data/processed/alumni.sqlite)')
+
+
+def backend_from_args(args) -> StorageBackend:
+    if args.backend == 'sqlite':
+        logger.info(f"Using local SQLite backend at {args.sqlite_path}")
+        return SQLiteBackend(args.sqlite_path)
+    return SupabaseBackend.from_env()
@@ -1,31 +1,27 @@
-import os
+import sys
+import json
+import argparse
+import hashlib
+import time
+from pathlib import Path
 import pandas as pd
-from supabase import create_client, Client
-from dotenv import load_dotenv
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, NamedTuple, Callable, Set, Tuple
 import logging
 import re
-import ast
+
+# Shared pipeline helpers live in data/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data' / 'scripts'))
+
+from snapshot import load_consolidated
+from batch_uploader import ConcurrentUploader, UploadStats
+from storage import StorageBackend, add_backend_arguments, backend_from_args
+from upload_validation import validate_upload_frame, write_validation_quarantine
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load environment variables from .env.local
-load_dotenv('.env.local')
-
-# Debug: Check if environment variables are loaded
-logger.info("Checking environment variables...")
-logger.info(f"NEXT_PUBLIC_SUPABASE_URL exists: {bool(os.getenv('NEXT_PUBLIC_SUPABASE_URL'))}")
-logger.info(f"NEXT_PUBLIC_SUPABASE_ANON_KEY exists: {bool(os.getenv('NEXT_PUBLIC_SUPABASE_ANON_KEY'))}")
-
-# Initialize Supabase client
-supabase: Client = create_client(
-    os.getenv("NEXT_PUBLIC_SUPABASE_URL"),
-    os.getenv("NEXT_PUBLIC_SUPABASE_ANON_KEY")
-)
-
 def clean_value(value: Any) -> Any:
     """Clean a single value for JSON compatibility."""
     if isinstance(value, (list, np.ndarray)):
@@ -61,41 +57,75 @@ def format_array_for_supabase(arr: List[str]) -> str:
     """Format an array for Supabase's text[] type."""
     if not arr:
         return "{}"  # Empty array in PostgreSQL
-    # Escape single quotes and wrap each element in quotes
-    escaped = [f'"{item.replace('"', '\\"')}"' for item in arr]
+    # Escape double quotes and wrap each element in quotes
+    escaped = []
+    for item in arr:
+        quoted = item.replace('"', '\\"')
+        escaped.append(f'"{quoted}"')
     return f"{{{','.join(escaped)}}}"
 
 def convert_to_array(value: Any) -> List[str]:
-    """Convert a value to a proper array format for Supabase."""
-    if pd.isna(value) or value is None:
-        return []
+    """Convert a value to a proper array format for Supabase.
     
+    List columns arrive as real lists from the consolidated snapshot, so no
+    parsing is needed; career_history entries are dicts and become JSON.
+    """
     if isinstance(value, list):
-        return [str(item).strip() for item in value if pd.notna(item)]
+        return [json.dumps(item) if isinstance(item, dict) else str(item).strip()
+                for item in value if item is not None and not (isinstance(item, float) and pd.isna(item))]
     
-    if isinstance(value, str):
-        try:
-            # Try to evaluate as a Python literal
-            evaluated = ast.literal_eval(value)
-            if isinstance(evaluated, list):
-                return [str(item).strip() for item in evaluated if pd.notna(item)]
-            return [str(evaluated).strip()]
-        except (ValueError, SyntaxError):
-            # If evaluation fails, treat as a single value
-            return [value.strip()]
+    if value is None or pd.isna(value):
+        return []
     
     return [str(value).strip()]
 
-def delete_existing_data() -> bool:
-    """Delete all existing data from the alumni table."""
+# Rows fetched per request when paging through the table
+FETCH_PAGE_SIZE = 1000
+
+# Ids per DELETE ... WHERE id IN (...) request; each UUID adds ~40 bytes to the URL
+DELETE_BATCH_SIZE = 200
+
+def with_retries(action: Callable[[], Any], description: str, max_retries: int = 3,
+                 backoff: float = 1.0) -> Any:
+    """Run action, retrying with exponential backoff; re-raises after the last attempt."""
+    for attempt in range(max_retries + 1):
+        try:
+            return action()
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff * 2 ** attempt
+            logger.warning(f"{description} failed ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+def delete_ids(backend: StorageBackend, ids: List[Any], batch_size: int = DELETE_BATCH_SIZE,
+               max_retries: int = 3, backoff: float = 1.0) -> int:
+    """Delete rows by id in in_() batches; returns the number of ids whose batch failed."""
+    total_batches = (len(ids) + batch_size - 1) // batch_size
+    failed = 0
+    for number, i in enumerate(range(0, len(ids), batch_size), start=1):
+        batch = ids[i:i + batch_size]
+        try:
+            with_retries(lambda: backend.delete_ids(batch),
+                         f"Delete batch {number} of {total_batches}", max_retries, backoff)
+        except Exception as e:
+            logger.error(f"Error deleting batch {number} of {total_batches}: {e}")
+            failed += len(batch)
+            continue
+        logger.info(f"Deleted batch {number} of {total_batches} ({min(i + batch_size, len(ids))}/{len(ids)} rows)")
+    return failed
+
+def delete_existing_data(backend: StorageBackend, batch_size: int = DELETE_BATCH_SIZE,
+                         max_retries: int = 3, backoff: float = 1.0) -> bool:
+    """Delete all existing data from the alumni table, batch_size ids per request."""
     try:
-        # First get all records to delete
-        response = supabase.table('alumni').select('id').execute()
-        if response.data:
-            # Delete each record by its ID
-            for record in response.data:
-                supabase.table('alumni').delete().eq('id', record['id']).execute()
-        logger.info("Successfully deleted existing data")
+        # First get all ids to delete; deleting while paging would shift the pages
+        ids = [row['id'] for row in backend.fetch_all(['id'], FETCH_PAGE_SIZE)]
+        failed = delete_ids(backend, ids, batch_size, max_retries, backoff)
+        if failed:
+            logger.error(f"{failed} of {len(ids)} rows could not be deleted")
+            return False
+        logger.info(f"Successfully deleted {len(ids)} existing rows")
         return True
     except Exception as e:
         logger.error(f"Error deleting existing data: {e}")
@@ -106,89 +136,155 @@ def update_table_structure():
     # The table structure is already correct based on the provided columns
     pass
 
-def upload_alumni_data() -> bool:
+# Map our columns to Supabase columns
+COLUMN_MAPPING = {
+    'name': 'name',
+    'current_role': 'role',
+    'current_company': 'companies',
+    'current_industry': 'industry',
+    'current_location': 'location',
+    'family_branch': 'family_branch',
+    'graduation_year': 'graduation_year',
+    'big_brother': 'big_brother',
+    'little_brothers': 'little_brothers',
+    'linkedin_url': 'linkedin_url',
+    'source_sheet': 'source_sheet',
+    'has_linkedin': 'has_linkedin',
+    'scraped': 'scraped',
+    'manually_verified': 'manually_verified',
+    'career_history': 'career_history',
+    'majors': 'majors',
+    'minors': 'minors',
+    'emails': 'emails',
+    'phones': 'phones'
+}
+
+ARRAY_FIELDS = ['companies', 'industry', 'little_brothers', 'emails', 'phones', 'majors', 'minors', 'career_history', 'source_sheet']
+
+# Concurrent requests used to upload records
+UPLOAD_WORKERS = 4
+
+# Rows the database rejected, with the error for each
+QUARANTINE_PATH = Path('data/processed/upload_quarantine.jsonl')
+
+# Rows held back by pre-upload validation, with the reasons for each
+VALIDATION_QUARANTINE_PATH = Path('data/processed/validation_quarantine.jsonl')
+
+# Column holding the hash of the synced content of each row
+HASH_COLUMN = 'content_hash'
+
+class SyncPlan(NamedTuple):
+    """Changes needed to make the alumni table match the local records."""
+    inserts: List[Dict[str, Any]]
+    updates: List[Dict[str, Any]]
+    deletes: List[Dict[str, Any]]
+    unchanged: int
+
+def prepare_upload_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Rename, clean and convert the consolidated table to the alumni table's columns.
+    
+    Array fields hold lists here; they are only formatted for Supabase in
+    frame_to_records, so the frame can be validated first.
+    """
+    # Create a new DataFrame with only the columns we want to upload
+    upload_df = df[COLUMN_MAPPING.keys()].rename(columns=COLUMN_MAPPING)
+    
+    # Clean the data
+    for col in upload_df.columns:
+        upload_df[col] = upload_df[col].apply(clean_value)
+    
+    # Convert array fields
+    for field in ARRAY_FIELDS:
+        if field in upload_df.columns:
+            upload_df[field] = upload_df[field].apply(convert_to_array)
+    
+    # Convert graduation_year to integer
+    if 'graduation_year' in upload_df.columns:
+        upload_df['graduation_year'] = upload_df['graduation_year'].apply(lambda x: extract_year(x) if x is not None else None)
+    return upload_df
+
+def frame_to_records(upload_df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Turn a prepared upload frame into records with arrays formatted for Supabase."""
+    # Convert DataFrame to list of dictionaries and clean each record
+    records = []
+    for _, row in upload_df.iterrows():
+        record = row.to_dict()
+        # Format array fields for Supabase
+        for field in ARRAY_FIELDS:
+            if field in record:
+                if record[field] is None or record[field] == []:
+                    record[field] = '{}'
+                else:
+                    record[field] = format_array_for_supabase(record[field])
+        # Ensure graduation_year is int or None
+        if 'graduation_year' in record:
+            if record['graduation_year'] is not None:
+                try:
+                    record['graduation_year'] = int(record['graduation_year'])
+                except Exception:
+                    record['graduation_year'] = None
+        records.append(clean_record(record))
+    return records
+
+def build_upload_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Turn the consolidated table into records shaped for the alumni table."""
+    return frame_to_records(prepare_upload_frame(df))
+
+def load_upload_records() -> Tuple[List[Dict[str, Any]], Set[str]]:
+    """Load, prepare and validate the consolidated data.
+    
+    Returns the upload-ready records and the names of rows held back by
+    validation; those are written to VALIDATION_QUARANTINE_PATH.
+    """
+    upload_df = prepare_upload_frame(load_consolidated('data/processed'))
+    result = validate_upload_frame(upload_df)
+    if len(result.quarantined):
+        write_validation_quarantine(result.quarantined, VALIDATION_QUARANTINE_PATH)
+        logger.warning(f"{len(result.quarantined)} of {len(upload_df)} rows failed validation; "
+                       f"see {VALIDATION_QUARANTINE_PATH}")
+    held_back = {name for name in result.quarantined['name'] if isinstance(name, str)}
+    return frame_to_records(result.valid), held_back
+
+def upload_records(backend: StorageBackend, records: List[Dict[str, Any]], method: str = 'insert',
+                   workers: int = UPLOAD_WORKERS) -> UploadStats:
+    """Send records with insert or upsert through the concurrent, adaptive-batch uploader."""
+    label = {'insert': 'Inserted', 'upsert': 'Upserted'}[method]
+    stats = ConcurrentUploader(getattr(backend, method), workers=workers, label=label).upload(records)
+    logger.info(f"{label}: {stats.summary()}")
+    return stats
+
+def write_quarantine(results: Dict[str, UploadStats], path: Path = QUARANTINE_PATH) -> None:
+    """Write each rejected row and its database error to a JSON Lines file."""
+    with open(path, 'w') as f:
+        for operation, stats in results.items():
+            for batch, error in stats.failed_batches:
+                for record in batch:
+                    f.write(json.dumps({
+                        'operation': operation,
+                        'error': str(error),
+                        'code': getattr(error, 'code', None),
+                        'details': getattr(error, 'details', None),
+                        'record': record,
+                    }, default=str) + '\n')
+    logger.warning(f"Rejected rows written to {path}")
+
+def upload_alumni_data(backend: StorageBackend, workers: int = UPLOAD_WORKERS) -> bool:
     """Upload the consolidated alumni data to Supabase."""
     try:
-        # Read the consolidated data
-        df = pd.read_csv('data/processed/consolidated_alumni.csv')
-        
-        # Map our columns to Supabase columns
-        column_mapping = {
-            'name': 'name',
-            'current_role': 'role',
-            'current_company': 'companies',
-            'current_industry': 'industry',
-            'current_location': 'location',
-            'family_branch': 'family_branch',
-            'graduation_year': 'graduation_year',
-            'big_brother': 'big_brother',
-            'little_brothers': 'little_brothers',
-            'linkedin_url': 'linkedin_url',
-            'source_sheet': 'source_sheet',
-            'has_linkedin': 'has_linkedin',
-            'scraped': 'scraped',
-            'manually_verified': 'manually_verified',
-            'career_history': 'career_history',
-            'majors': 'majors',
-            'minors': 'minors',
-            'emails': 'emails',
-            'phones': 'phones'
-        }
-        
-        # Create a new DataFrame with only the columns we want to upload
-        upload_df = df[column_mapping.keys()].rename(columns=column_mapping)
-        
-        # Clean the data
-        for col in upload_df.columns:
-            upload_df[col] = upload_df[col].apply(clean_value)
-        
-        # Convert array fields
-        array_fields = ['companies', 'industry', 'little_brothers', 'emails', 'phones', 'majors', 'minors', 'career_history', 'source_sheet']
-        for field in array_fields:
-            if field in upload_df.columns:
-                upload_df[field] = upload_df[field].apply(convert_to_array)
-        
-        # Convert graduation_year to integer
-        if 'graduation_year' in upload_df.columns:
-            upload_df['graduation_year'] = upload_df['graduation_year'].apply(lambda x: extract_year(x) if x is not None else None)
-        
-        # Convert DataFrame to list of dictionaries and clean each record
-        records = []
-        for _, row in upload_df.iterrows():
-            record = row.to_dict()
-            # Format array fields for Supabase
-            for field in array_fields:
-                if field in record:
-                    if record[field] is None or record[field] == []:
-                        record[field] = '{}'
-                    else:
-                        record[field] = format_array_for_supabase(record[field])
-            # Ensure graduation_year is int or None
-            if 'graduation_year' in record:
-                if record['graduation_year'] is not None:
-                    try:
-                        record['graduation_year'] = int(record['graduation_year'])
-                    except Exception:
-                        record['graduation_year'] = None
-            records.append(clean_record(record))
+        # Read and validate the consolidated data; hashed like a sync, so the
+        # next --sync only touches rows that change after this upload
+        records, _ = load_upload_records()
+        records = [with_content_hash(record) for record in records]
         
         # Debug: Print a sample record before upload
         if records:
             logger.info(f"Sample record to upload: {records[0]}")
         
-        # Upload in batches of 100
-        batch_size = 100
-        total_batches = (len(records) + batch_size - 1) // batch_size
-        
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-            try:
-                response = supabase.table('alumni').insert(batch).execute()
-                logger.info(f"Uploaded batch {i//batch_size + 1} of {total_batches}")
-            except Exception as e:
-                logger.error(f"Error uploading batch {i//batch_size + 1}: {e}")
-                # Continue with next batch instead of failing completely
-                continue
+        stats = upload_records(backend, records, 'insert', workers)
+        if stats.rows_failed:
+            write_quarantine({'insert': stats})
+            logger.error(f"{stats.rows_failed} of {len(records)} rows were not uploaded")
+            return False
         
         logger.info("Successfully uploaded all alumni data")
         return True
@@ -196,16 +292,153 @@ def upload_alumni_data() -> bool:
         logger.error(f"Error uploading alumni data: {e}")
         return False
 
+def content_hash(record: Dict[str, Any]) -> str:
+    """Stable hash of a record's synced content (every field but id and the hash)."""
+    content = {k: v for k, v in record.items() if k not in ('id', HASH_COLUMN)}
+    payload = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def with_content_hash(record: Dict[str, Any]) -> Dict[str, Any]:
+    """A copy of record carrying its content hash."""
+    return dict(record, **{HASH_COLUMN: content_hash(record)})
+
+def check_hash_column(backend: StorageBackend) -> bool:
+    """Whether the alumni table has the content hash column uploads and syncs write."""
+    try:
+        backend.fetch_page(['id', HASH_COLUMN], 0, 1)
+        return True
+    except Exception as e:
+        logger.error(f"Could not read {HASH_COLUMN} ({e}). Add it with: "
+                     f"ALTER TABLE alumni ADD COLUMN IF NOT EXISTS {HASH_COLUMN} TEXT;")
+        return False
+
+def fetch_manifest(backend: StorageBackend, page_size: int = FETCH_PAGE_SIZE) -> List[Dict[str, Any]]:
+    """Fetch (id, name, content_hash) for every row of the alumni table."""
+    try:
+        return backend.fetch_all(['id', 'name', HASH_COLUMN], page_size)
+    except Exception as e:
+        raise RuntimeError(
+            f"Could not read the alumni manifest ({e}). Sync needs a {HASH_COLUMN} column: "
+            f"ALTER TABLE alumni ADD COLUMN IF NOT EXISTS {HASH_COLUMN} TEXT;"
+        ) from e
+
+def plan_sync(records: List[Dict[str, Any]], manifest: List[Dict[str, Any]],
+              keep_names: Set[str] = frozenset()) -> SyncPlan:
+    """Compare local records with the remote manifest by name and content hash.
+    
+    Remote rows named in keep_names are left alone even though no local record
+    matches them (rows held back by validation should not be deleted).
+    """
+    remote = {}
+    deletes = []
+    for row in manifest:
+        if row['name'] in remote:
+            # Only one row per name can survive
+            deletes.append(row)
+        else:
+            remote[row['name']] = row
+    
+    inserts, updates = [], []
+    unchanged = 0
+    seen = set()
+    for record in records:
+        name = record.get('name')
+        if name is None or name in seen:
+            logger.warning(f"Skipping record with a missing or repeated name: {name!r}")
+            continue
+        seen.add(name)
+        record = with_content_hash(record)
+        existing = remote.get(name)
+        if existing is None:
+            inserts.append(record)
+        elif existing.get(HASH_COLUMN) != record[HASH_COLUMN]:
+            updates.append(dict(record, id=existing['id']))
+        else:
+            unchanged += 1
+    
+    deletes.extend(row for name, row in remote.items() if name not in seen and name not in keep_names)
+    return SyncPlan(inserts, updates, deletes, unchanged)
+
+def print_sync_summary(plan: SyncPlan, sample_size: int = 5):
+    """Print how many rows each kind of change touches, with a few example names."""
+    print("\nSync plan:")
+    for label, rows in (('insert', plan.inserts), ('update', plan.updates), ('delete', plan.deletes)):
+        sample = ', '.join(str(row['name']) for row in rows[:sample_size])
+        more = f" and {len(rows) - sample_size} more" if len(rows) > sample_size else ''
+        print(f"  {label:<8}{len(rows):>8}" + (f"  ({sample}{more})" if rows else ''))
+    print(f"  {'unchanged':<8}{plan.unchanged:>7}")
+
+def apply_sync(backend: StorageBackend, plan: SyncPlan, workers: int = UPLOAD_WORKERS,
+               delete_batch_size: int = DELETE_BATCH_SIZE) -> bool:
+    """Send the planned inserts, updates and deletes in batches."""
+    ok = True
+    results = {}
+    if plan.inserts:
+        results['insert'] = upload_records(backend, plan.inserts, 'insert', workers)
+    # Updates carry their id, so an upsert on the primary key rewrites them in place
+    if plan.updates:
+        results['upsert'] = upload_records(backend, plan.updates, 'upsert', workers)
+    if any(stats.rows_failed for stats in results.values()):
+        write_quarantine(results)
+        ok = False
+    if delete_ids(backend, [row['id'] for row in plan.deletes], delete_batch_size):
+        ok = False
+    logger.info(f"Sync sent {len(plan.inserts)} inserts, {len(plan.updates)} updates "
+                f"and {len(plan.deletes)} deletes")
+    return ok
+
+def sync_alumni_data(backend: StorageBackend, dry_run: bool = False, workers: int = UPLOAD_WORKERS,
+                     delete_batch_size: int = DELETE_BATCH_SIZE) -> bool:
+    """Bring the alumni table in line with the consolidated data, touching only changed rows."""
+    try:
+        records, held_back = load_upload_records()
+        plan = plan_sync(records, fetch_manifest(backend), keep_names=held_back)
+    except Exception as e:
+        logger.error(f"Error planning sync: {e}")
+        return False
+    
+    print_sync_summary(plan)
+    if dry_run:
+        logger.info("Dry run: no changes sent")
+        return True
+    return apply_sync(backend, plan, workers, delete_batch_size)
+
 def main():
+    parser = argparse.ArgumentParser(description='Load the consolidated alumni data into Supabase.')
+    parser.add_argument('--sync', action='store_true',
+                        help='Only send inserts, updates and deletes for rows that changed')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='With --sync, print the planned changes without sending them')
+    parser.add_argument('--workers', type=int, default=UPLOAD_WORKERS,
+                        help=f'Concurrent upload requests (default: {UPLOAD_WORKERS})')
+    parser.add_argument('--delete-batch-size', type=int, default=DELETE_BATCH_SIZE,
+                        help=f'Ids per bulk delete request (default: {DELETE_BATCH_SIZE})')
+    add_backend_arguments(parser)
+    args = parser.parse_args()
+    backend = backend_from_args(args)
+    
+    if args.sync or args.dry_run:
+        logger.info("Starting Supabase sync...")
+        if not sync_alumni_data(backend, dry_run=args.dry_run, workers=args.workers,
+                                delete_batch_size=args.delete_batch_size):
+            logger.error("Failed to sync alumni data.")
+            return
+        logger.info("Supabase sync completed successfully!")
+        return
+    
     logger.info("Starting Supabase update process...")
     
+    # Uploaded rows carry their content hash; check before anything is deleted
+    if not check_hash_column(backend):
+        return
+    
     # Step 1: Delete existing data
-    if not delete_existing_data():
+    if not delete_existing_data(backend, batch_size=args.delete_batch_size):
         logger.error("Failed to delete existing data.")
         return
     
     # Step 2: Upload new data
-    if not upload_alumni_data():
+    if not upload_alumni_data(backend, workers=args.workers):
         logger.error("Failed to upload new data.")
         return
     
@@ -0,0 +1,137 @@
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from storage import SCHEMA_PATH, table_columns
+
+logger = logging.getLogger(__name__)
+
+# CHECK (col >= low AND col <= high), the only CHECK form schema.sql uses
+_RANGE_CHECK_RE = re.compile(r'CHECK \((\w+) >= (\d+) AND \1 <= (\d+)\)', re.IGNORECASE)
+
+_BOOLEAN_TEXT = {'true', 'false', 't', 'f', 'yes', 'no', 'y', 'n', 'on', 'off', '1', '0'}
+
+
+class ValidationResult(NamedTuple):
+    """Rows that can be uploaded and rows held back, the latter with a 'reasons' column."""
+    valid: pd.DataFrame
+    quarantined: pd.DataFrame
+
+
+def _column_type(definition: str) -> str:
+    return definition.split()[0].upper()
+
+
+def _is_blank(series: pd.Series) -> pd.Series:
+    return series.isna() | series.astype(str).str.strip().eq('')
+
+
+def _has_nul(series: pd.Series) -> pd.Series:
+    """Postgres TEXT cannot hold NUL characters."""
+    return series.map(lambda v: isinstance(v, str) and '\x00' in v).astype(bool)
+
+
+def _is_json_object(item: Any) -> bool:
+    if isinstance(item, dict):
+        return True
+    if not isinstance(item, str):
+        return False
+    try:
+        return isinstance(json.loads(item), dict)
+    except ValueError:
+        return False
+
+
+def _is_boolean(value: Any) -> bool:
+    if value is None or value is pd.NA or isinstance(value, (bool, np.bool_)):
+        return True
+    if isinstance(value, float):
+        return np.isnan(value)
+    # Postgres also accepts the usual text spellings
+    return isinstance(value, str) and value.strip().lower() in _BOOLEAN_TEXT
+
+
+def _bad_array_cells(series: pd.Series, element_ok) -> pd.Series:
+    """True where a cell is not a list or holds an element that fails element_ok."""
+    not_list = ~series.map(lambda v: v is None or isinstance(v, list)).astype(bool)
+    items = series[~not_list].explode().dropna()
+    if items.empty:
+        return not_list
+    bad_items = ~items.map(element_ok).astype(bool)
+    bad_cells = bad_items.groupby(level=0).any()
+    return not_list | bad_cells.reindex(series.index, fill_value=False)
+
+
+def column_checks(df: pd.DataFrame, columns: Dict[str, str]) -> Dict[str, pd.Series]:
+    """One boolean mask per failed rule, named by the reason it gives.
+
+    Rules come from the table definition: NOT NULL and UNIQUE constraints,
+    CHECK ranges, and element types for TEXT[] and JSONB[] columns.
+    """
+    checks = {}
+    for column, definition in columns.items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+        upper = definition.upper()
+        kind = _column_type(definition)
+        if 'NOT NULL' in upper or 'PRIMARY KEY' in upper:
+            checks[f'{column} is missing'] = _is_blank(series)
+        if 'UNIQUE' in upper:
+            # The first row with a value keeps it; later ones are duplicates
+            present = ~_is_blank(series)
+            checks[f'duplicate {column}'] = present & series.where(present).duplicated(keep='first')
+        match = _RANGE_CHECK_RE.search(definition)
+        if match:
+            low, high = int(match.group(2)), int(match.group(3))
+            numbers = pd.to_numeric(series, errors='coerce')
+            checks[f'{column} outside {low}-{high}'] = numbers.notna() & ~numbers.between(low, high)
+            checks[f'{column} is not a number'] = series.notna() & numbers.isna()
+        if kind == 'TEXT':
+            checks[f'{column} contains NUL'] = _has_nul(series)
+        elif kind == 'TEXT[]':
+            checks[f'{column} has a non-text element'] = _bad_array_cells(
+                series, lambda item: isinstance(item, str) and '\x00' not in item)
+        elif kind == 'JSONB[]':
+            checks[f'{column} has an element that is not a JSON object'] = _bad_array_cells(
+                series, _is_json_object)
+        elif kind == 'BOOLEAN':
+            checks[f'{column} is not a boolean'] = ~series.map(_is_boolean).astype(bool)
+    return {reason: mask.fillna(False).astype(bool) for reason, mask in checks.items()}
+
+
+def validate_upload_frame(df: pd.DataFrame, schema_path: Path = SCHEMA_PATH) -> ValidationResult:
+    """Split a prepared upload frame into upload-ready and quarantined rows.
+
+    Every check runs over whole columns, so a bad row is found before it
+    costs a failed request (and a bisection) in the uploader.
+    """
+    checks = column_checks(df, table_columns(schema_path))
+    if not checks:
+        return ValidationResult(df, df.iloc[0:0].assign(reasons=[]))
+    failures = pd.DataFrame(checks, index=df.index)
+    failed = failures.any(axis=1)
+    reasons = [
+        [reason for reason, bad in zip(failures.columns, row) if bad]
+        for row in failures[failed].itertuples(index=False)
+    ]
+    quarantined = df[failed].copy()
+    quarantined['reasons'] = reasons
+    counts = failures.sum()
+    for reason, count in counts[counts > 0].items():
+        logger.warning(f"Validation: {count} rows with {reason}")
+    return ValidationResult(df[~failed], quarantined)
+
+
+def write_validation_quarantine(quarantined: pd.DataFrame, path: Path) -> None:
+    """Write each quarantined row and its reasons to a JSON Lines file."""
+    with open(path, 'w') as f:
+        for row in quarantined.to_dict('records'):
+            reasons: List[str] = row.pop('reasons')
+            record = {k: (None if not isinstance(v, list) and pd.isna(v) else v) for k, v in row.items()}
+            f.write(json.dumps({'reasons': reasons, 'record': record}, default=str) + '\n')
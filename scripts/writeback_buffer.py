@@ -0,0 +1,155 @@
+"""Buffered, bulk write-back of scraped profiles.
+
+The scraper hands each profile's update to a WriteBackBuffer instead of
+sending it. Buffered rows are sent as bulk upserts every flush_every profiles
+or flush_interval seconds, and once more when the buffer is closed, so
+database latency is paid once per batch rather than once per profile.
+
+Every buffered row is also appended to a spool file (fsynced), and the spool
+is only emptied once a flush has written its rows. Rows that could not be
+sent because the database was down stay in the spool and are loaded again
+by the next WriteBackBuffer, so an outage or a crash does not lose results.
+"""
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from batch_uploader import ConcurrentUploader, is_transient
+from storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+SPOOL_PATH = Path('data/scrape_writeback.jsonl')
+
+# Rows the database rejected outright, with the error for each
+REJECTED_PATH = Path('data/scrape_writeback_rejected.jsonl')
+
+FLUSH_EVERY = 25
+FLUSH_INTERVAL = 60.0
+
+
+def group_by_columns(records: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Split records into runs that share a column set.
+
+    A bulk upsert fills columns missing from some records with NULL, so
+    records that update different columns must go in separate requests.
+    """
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(tuple(sorted(record)), []).append(record)
+    return list(groups.values())
+
+
+class WriteBackBuffer:
+    """Collects row updates and upserts them in bulk."""
+
+    def __init__(self, backend: StorageBackend, spool_path: Path = SPOOL_PATH,
+                 flush_every: int = FLUSH_EVERY, flush_interval: float = FLUSH_INTERVAL,
+                 rejected_path: Path = REJECTED_PATH):
+        self.backend = backend
+        self.spool_path = Path(spool_path)
+        self.rejected_path = Path(rejected_path)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.pending: List[Dict[str, Any]] = []
+        self.written = 0
+        self._last_flush = time.monotonic()
+        self._retry_at = 0.0
+
+        # Rows left over from a run that crashed or lost the database
+        if self.spool_path.exists():
+            with open(self.spool_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self.pending.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+            if self.pending:
+                logger.info(f"Loaded {len(self.pending)} unsent profile updates from {self.spool_path}")
+            # Rewrite so a torn last line cannot swallow the next append
+            self._rewrite_spool()
+        self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+        self._spool = open(self.spool_path, 'a', encoding='utf-8')
+
+    def _rewrite_spool(self) -> None:
+        tmp_path = self.spool_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in self.pending:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(self.spool_path)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Buffer one row update (it must include id) and flush if one is due."""
+        self._spool.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._spool.flush()
+        os.fsync(self._spool.fileno())
+        self.pending.append(record)
+        self.maybe_flush()
+
+    def maybe_flush(self) -> None:
+        """Flush if enough rows are buffered or the interval has passed."""
+        if not self.pending or time.monotonic() < self._retry_at:
+            return
+        if (len(self.pending) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def _send(self, batch: List[Dict[str, Any]]) -> None:
+        for group in group_by_columns(batch):
+            self.backend.upsert(group)
+
+    def flush(self) -> bool:
+        """Upsert everything buffered; returns True if nothing is left pending."""
+        self._last_flush = time.monotonic()
+        if not self.pending:
+            return True
+        # One quick retry: during an outage the rows wait for the next flush
+        # rather than stalling the scraper
+        uploader = ConcurrentUploader(self._send, workers=1, max_retries=1, backoff=1.0,
+                                      label='Wrote back')
+        stats = uploader.upload(self.pending)
+        self.written += stats.rows_written
+        kept, rejected = [], []
+        for batch, error in stats.failed_batches:
+            if is_transient(error):
+                kept.extend(batch)
+            else:
+                rejected.extend((record, error) for record in batch)
+        if rejected:
+            with open(self.rejected_path, 'a', encoding='utf-8') as f:
+                for record, error in rejected:
+                    f.write(json.dumps({'error': str(error), 'record': record},
+                                       ensure_ascii=False, default=str) + '\n')
+            logger.error(f"{len(rejected)} profile updates were rejected; see {self.rejected_path}")
+        if kept:
+            # Back off for a full interval before trying the database again
+            self._retry_at = time.monotonic() + self.flush_interval
+            logger.warning(f"Database unavailable; {len(kept)} profile updates kept for the next flush")
+        elif stats.rows_written:
+            logger.info(f"Wrote {stats.rows_written} profiles to database")
+
+        self.pending = kept
+        self._spool.close()
+        self._rewrite_spool()
+        self._spool = open(self.spool_path, 'a', encoding='utf-8')
+        return not kept
+
+    def close(self) -> None:
+        """Final flush; anything still unsent stays in the spool for the next run."""
+        if self._spool.closed:
+            return
+        if not self.flush():
+            logger.warning(f"{len(self.pending)} profile updates saved in {self.spool_path}; "
+                           "they will be sent on the next run")
+        self._spool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
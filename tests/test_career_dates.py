@@ -0,0 +1,62 @@
+"""Duration parsing and current-role selection in data/scripts/career_dates.py.
+
+    python -m unittest discover tests
+"""
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data' / 'scripts'))
+
+from career_dates import MISSING, annotate_experiences, month_index, parse_duration, sort_histories  # noqa: E402
+
+TODAY = date(2026, 10, 17)
+
+
+class ParseDurationTest(unittest.TestCase):
+    def test_formats(self):
+        cases = {
+            'Apr 2025 to Present': (month_index(2025, 4), MISSING, True),
+            'Sep 2024 - Nov 2024 · 3 mos': (month_index(2024, 9), month_index(2024, 11), False),
+            'Sep – Nov 2024': (month_index(2024, 9), month_index(2024, 11), False),
+            '2016 – 2019': (month_index(2016, 1), month_index(2019, 12), False),
+            'May 2021': (month_index(2021, 5), month_index(2021, 5), False),
+            'May 2021 to May 2021': (month_index(2021, 5), month_index(2021, 5), False),
+            '2019': (month_index(2019, 1), month_index(2019, 12), False),
+            'not a date': (MISSING, MISSING, False),
+            ' - Present': (MISSING, MISSING, False),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(tuple(parse_duration(text)), expected)
+
+
+class AnnotateExperiencesTest(unittest.TestCase):
+    def test_dates_and_current_role(self):
+        histories = [
+            [{'duration': 'Jan 2020 to Mar 2022'}, {'duration': 'Apr 2025 to Present'}, {'duration': 'May 2021'}],
+            [{'duration': '2016 – 2019'}, {'duration': 'Jun 2018 - Dec 2019'}],
+            [{'duration': None}],
+            [],
+        ]
+        # A current role wins; equal ends go to the later start
+        self.assertEqual(annotate_experiences(histories, TODAY), [1, 1, None, None])
+        self.assertEqual(histories[0][1], {'duration': 'Apr 2025 to Present', 'start': '2025-04', 'end': None,
+                                           'current': True, 'tenure_months': 19})
+        self.assertEqual(histories[0][2]['tenure_months'], 1)
+        self.assertEqual((histories[1][0]['start'], histories[1][0]['end']), ('2016-01', '2019-12'))
+        self.assertIsNone(histories[2][0]['tenure_months'])
+
+
+class SortHistoriesTest(unittest.TestCase):
+    def test_most_recent_first_with_undated_last(self):
+        history = [{'role': 'a', 'date': '2019-05-01'}, {'role': 'b', 'date': None},
+                   {'role': 'c', 'date': '2023-01-01'}, {'role': 'd', 'date': ''}]
+        latest = sort_histories([history, []], TODAY)
+        self.assertEqual([entry['role'] for entry in history], ['c', 'a', 'b', 'd'])
+        self.assertEqual(latest, [history[0], None])
+
+
+if __name__ == '__main__':
+    unittest.main()
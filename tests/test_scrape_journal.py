@@ -0,0 +1,58 @@
+"""Folding scraper journals and saved pages into a snapshot written before ids were kept.
+
+    python -m unittest discover tests
+"""
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from profile_html import apply_to_snapshot, extract_all, save_profile_html  # noqa: E402
+from scrape_journal import ScrapeJournal, compact  # noqa: E402
+
+LEGACY_SNAPSHOT = [
+    {'name': 'Roy Lee', 'linkedin_url': 'https://www.linkedin.com/in/roy-lee-goat/', 'bio': 'old'},
+    {'name': 'Bill Gates', 'linkedin_url': 'https://www.linkedin.com/in/williamhgates', 'bio': 'old'},
+    {'name': 'Cameron Byrne', 'linkedin_url': 'https://www.linkedin.com/in/cameronbyrne00', 'bio': 'old'},
+]
+
+
+class LegacySnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.snapshot = self.tmp / 'alumni_mega.json'
+        self.snapshot.write_text(json.dumps(LEGACY_SNAPSHOT), encoding='utf-8')
+
+    def read_snapshot(self):
+        return json.loads(self.snapshot.read_text(encoding='utf-8'))
+
+    def test_compact_replaces_legacy_record_by_url(self):
+        with ScrapeJournal(self.tmp / 'journal' / 'scrape_1.jsonl') as journal:
+            journal.append({'id': 'a1', 'name': 'Roy Lee',
+                            'linkedin_url': 'https://www.linkedin.com/in/roy-lee-goat', 'bio': 'new'})
+            journal.append({'id': 'a2', 'name': 'New Alum',
+                            'linkedin_url': 'https://www.linkedin.com/in/new-alum', 'bio': 'new'})
+
+        self.assertEqual(compact(self.tmp / 'journal', self.snapshot), 4)
+        roy = [p for p in self.read_snapshot() if 'roy-lee-goat' in p['linkedin_url']]
+        self.assertEqual(len(roy), 1)
+        self.assertEqual((roy[0]['id'], roy[0]['bio']), ('a1', 'new'))
+
+    def test_saved_page_updates_legacy_record_by_url(self):
+        save_profile_html('a3', '<html><body></body></html>', self.tmp / 'html',
+                          linkedin_url='https://linkedin.com/in/WilliamHGates/')
+
+        self.assertEqual(apply_to_snapshot(extract_all(self.tmp / 'html', workers=1), self.snapshot), 1)
+        profiles = self.read_snapshot()
+        self.assertEqual(len(profiles), 3)
+        self.assertIsNone(profiles[1]['bio'])
+        self.assertNotIn('id', profiles[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
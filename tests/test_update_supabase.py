@@ -0,0 +1,121 @@
+"""Round-trip counts of the bulk deletes in scripts/update_supabase.py, and
+how a full upload and the incremental sync agree on content hashes.
+
+Runs against the local SQLite backend, so no Supabase project is needed:
+
+    python -m unittest discover tests
+"""
+import math
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+sys.path.insert(0, str(ROOT / 'data' / 'scripts'))
+
+from consolidation import CONSOLIDATED_COLUMNS, LIST_COLUMNS  # noqa: E402
+from snapshot import write_consolidated  # noqa: E402
+from storage import SQLiteBackend  # noqa: E402
+from update_supabase import (  # noqa: E402
+    HASH_COLUMN, SyncPlan, apply_sync, delete_existing_data, delete_ids, fetch_manifest,
+    load_upload_records, plan_sync, upload_alumni_data
+)
+
+
+class CountingBackend(SQLiteBackend):
+    """SQLiteBackend that records every delete request it receives."""
+
+    def __init__(self, rows: int = 0, fail_batches=()):
+        super().__init__(':memory:')
+        self.delete_requests = []
+        self.fail_batches = set(fail_batches)
+        if rows:
+            self.insert([{'name': f"Alum {i}"} for i in range(rows)])
+
+    def delete_ids(self, ids):
+        self.delete_requests.append(list(ids))
+        if len(self.delete_requests) in self.fail_batches:
+            raise RuntimeError('simulated delete failure')
+        super().delete_ids(ids)
+
+
+class DeleteIdsTest(unittest.TestCase):
+    def test_one_request_per_batch(self):
+        for rows, batch_size in [(0, 10), (1, 10), (10, 10), (11, 10), (250, 100), (1001, 500)]:
+            with self.subTest(rows=rows, batch_size=batch_size):
+                backend = CountingBackend(rows)
+                ids = [row['id'] for row in backend.fetch_all(['id'])]
+                self.assertEqual(delete_ids(backend, ids, batch_size), 0)
+                self.assertEqual(len(backend.delete_requests), math.ceil(rows / batch_size))
+                self.assertTrue(all(len(batch) <= batch_size for batch in backend.delete_requests))
+                self.assertEqual(backend.count(), 0)
+
+    def test_failed_batch_is_counted_and_others_still_sent(self):
+        # Every attempt at the second request fails; max_retries=0 means one attempt
+        backend = CountingBackend(30, fail_batches={2})
+        ids = [row['id'] for row in backend.fetch_all(['id'])]
+        self.assertEqual(delete_ids(backend, ids, 10, max_retries=0), 10)
+        self.assertEqual(len(backend.delete_requests), 3)
+        self.assertEqual(backend.count(), 10)
+
+
+class DeleteExistingDataTest(unittest.TestCase):
+    def test_deletes_every_row_in_batches(self):
+        backend = CountingBackend(45)
+        self.assertTrue(delete_existing_data(backend, batch_size=20))
+        self.assertEqual(len(backend.delete_requests), 3)
+        self.assertEqual(backend.count(), 0)
+
+
+class ApplySyncTest(unittest.TestCase):
+    def test_deletes_use_the_given_batch_size(self):
+        backend = CountingBackend(25)
+        deletes = [{'id': row['id'], 'name': row['name']} for row in backend.fetch_all(['id', 'name'])]
+        plan = SyncPlan(inserts=[], updates=[], deletes=deletes, unchanged=0)
+        self.assertTrue(apply_sync(backend, plan, delete_batch_size=10))
+        self.assertEqual(len(backend.delete_requests), 3)
+        self.assertEqual(backend.count(), 0)
+
+
+class FullUploadTest(unittest.TestCase):
+    def setUp(self):
+        # load_upload_records reads data/processed under the working directory
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.addCleanup(os.chdir, cwd)
+        processed = self.tmp / 'data' / 'processed'
+        processed.mkdir(parents=True)
+        df = pd.DataFrame({
+            'name': ['Ada Lovelace', 'Alan Turing', 'Grace Hopper'],
+            'current_company': ['Analytical Engines', None, 'US Navy'],
+            'graduation_year': [2019.0, None, 2021.0],
+            'has_linkedin': [True, False, True],
+            'emails': [['ada@example.com'], [], ['grace@example.com']],
+            'career_history': [[{'role': 'Engineer', 'company': 'Analytical Engines', 'date': '2020-01-01'}],
+                               [], []],
+        }).reindex(columns=CONSOLIDATED_COLUMNS)
+        for column in LIST_COLUMNS:
+            df[column] = [value if isinstance(value, list) else [] for value in df[column]]
+        write_consolidated(df, processed)
+
+    def test_sync_after_full_upload_changes_nothing(self):
+        backend = SQLiteBackend()
+        self.assertTrue(upload_alumni_data(backend, workers=1))
+        self.assertTrue(all(row[HASH_COLUMN] for row in backend.fetch_all(['id', HASH_COLUMN])))
+
+        records, held_back = load_upload_records()
+        plan = plan_sync(records, fetch_manifest(backend), keep_names=held_back)
+        self.assertEqual((len(plan.inserts), len(plan.updates), len(plan.deletes), plan.unchanged),
+                         (0, 0, 0, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()